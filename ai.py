@@ -0,0 +1,280 @@
+"""Computer opponent for TRON Lightcycles game."""
+import math
+import pygame
+
+from bike import get_trail_margin
+from constants import *
+
+# Lookahead steps are the distance a bike covers in 1 / AI_STEP_RATE seconds
+AI_STEP_RATE = 60
+
+
+def ai_control(state, bike, current_game_time):
+	"""AI for a bike that avoids collisions and seeks power-ups.
+
+	Args:
+		state: GameState the bike is playing in
+		bike: The Bike to steer (either player)
+		current_game_time: Current game time in milliseconds
+	"""
+	opponent = state.player1 if bike is state.player2 else state.player2
+
+	# Check turn cooldown
+	if not bike.can_turn(current_game_time, turn_cooldown):
+		return
+
+	# Emergency wall avoidance - check if AI is dangerously close to any wall
+	WALL_DANGER_ZONE = 60  # Distance from wall that triggers emergency turn (reduced to make AI more aggressive)
+	pos_x, pos_y = bike.pos
+	dir_x, dir_y = bike.dir
+
+	# Check if heading toward a wall and too close
+	if dir_x > 0 and pos_x > state.width - WALL_DANGER_ZONE:  # Heading right toward right wall
+		# Turn up or down
+		new_dir = dirs["DOWN"] if pos_y < state.height // 2 else dirs["UP"]
+		if not bike.is_zigzag(new_dir, dirs, current_game_time):
+			bike.last_turn_direction = bike.dir
+			bike.dir = new_dir
+			bike.last_turn_time = current_game_time
+		return
+	elif dir_x < 0 and pos_x < WALL_DANGER_ZONE:  # Heading left toward left wall
+		# Turn up or down
+		new_dir = dirs["DOWN"] if pos_y < state.height // 2 else dirs["UP"]
+		if not bike.is_zigzag(new_dir, dirs, current_game_time):
+			bike.last_turn_direction = bike.dir
+			bike.dir = new_dir
+			bike.last_turn_time = current_game_time
+		return
+	elif dir_y > 0 and pos_y > state.height - WALL_DANGER_ZONE:  # Heading down toward bottom wall
+		# Turn left or right
+		new_dir = dirs["RIGHT"] if pos_x < state.width // 2 else dirs["LEFT"]
+		if not bike.is_zigzag(new_dir, dirs, current_game_time):
+			bike.last_turn_direction = bike.dir
+			bike.dir = new_dir
+			bike.last_turn_time = current_game_time
+		return
+	elif dir_y < 0 and pos_y < WALL_DANGER_ZONE:  # Heading up toward top wall
+		# Turn left or right
+		new_dir = dirs["RIGHT"] if pos_x < state.width // 2 else dirs["LEFT"]
+		if not bike.is_zigzag(new_dir, dirs, current_game_time):
+			bike.last_turn_direction = bike.dir
+			bike.dir = new_dir
+			bike.last_turn_time = current_game_time
+		return
+
+	possible_dirs = [dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]]
+
+	def will_collide(pos, dir_vec, steps=20):
+		"""Predict if moving forward will cause a collision using simplified hitbox detection."""
+		# Both bikes share the theme's sprite size
+		sprite_w = bike.sprite.get_width()
+
+		back_margin = 4
+		# Calculate rotation angle for the test direction
+		mag = math.hypot(dir_vec[0], dir_vec[1])
+		if mag == 0:
+			return True
+
+		# Use a simplified rectangular hitbox check instead of full rotated rectangle
+		# This is much faster and still reasonably accurate for AI purposes
+		front_length = sprite_w - back_margin
+		nx_norm, ny_norm = dir_vec[0] / mag, dir_vec[1] / mag
+
+		# Define a safety margin around the bike
+		# Increased from 0.15 to 0.25, and adding extra margin for walls
+		safety_margin = sprite_w * 0.25
+		wall_margin = 100  # Large fixed margin for wall detection to ensure AI turns away from edges early
+		# Only skip the last 5 blocks of own trail to avoid immediate tail collision
+		trail_skip = get_trail_margin(5, state.speed, BLOCK_SIZE)
+
+		# Look ahead specified steps with larger step size for performance
+		# A step is the distance covered in one 60 Hz frame, whatever the tick rate
+		step_increment = max(1, round(state.speed / AI_STEP_RATE))
+		for i in range(step_increment, steps * step_increment + 1, step_increment):
+			# Calculate test position
+			test_pos_x = pos[0] + nx_norm * i
+			test_pos_y = pos[1] + ny_norm * i
+
+			# Check wall collisions with margin
+			fx = test_pos_x + nx_norm * front_length
+			fy = test_pos_y + ny_norm * front_length
+			if fx < wall_margin or fx >= state.width - wall_margin or fy < wall_margin or fy >= state.height - wall_margin:
+				return True
+
+			# Check for head-on collision with opponent
+			# Calculate opponent's position and direction
+			opp_x, opp_y = opponent.pos
+			opp_dx, opp_dy = opponent.dir
+			opp_mag = math.hypot(opp_dx, opp_dy)
+
+			if opp_mag > 0:
+				# Normalize opponent's direction
+				opp_nx, opp_ny = opp_dx / opp_mag, opp_dy / opp_mag
+
+				# Check if opponent is moving toward us (opposite directions)
+				# Dot product of normalized directions: -1 means exactly opposite, < -0.7 means roughly opposite
+				dot_product = nx_norm * opp_nx + ny_norm * opp_ny
+
+				if dot_product < -0.7:  # Bikes are moving toward each other
+					# Check if opponent is in front of us
+					dist_to_opponent = math.hypot(test_pos_x - opp_x, test_pos_y - opp_y)
+					if dist_to_opponent < sprite_w * 3:  # Within 3 bike lengths
+						return True
+
+			# Check trail collisions using a simple radius check (much faster)
+			# Only trail runs found by the segment index around the test point are considered
+			# Skip only the very recent trail to avoid false positives with the tail
+			near_rect = pygame.Rect(int(test_pos_x - safety_margin) - 1, int(test_pos_y - safety_margin) - 1,
+			                        int(2 * safety_margin) + 3, int(2 * safety_margin) + 3)
+
+			distance = opponent.segments.get_distance(test_pos_x, test_pos_y, near_rect)  # Manhattan distance
+			if distance is not None and distance < safety_margin:
+				return True
+
+			# Check own trail with safety margin
+			distance = bike.segments.get_distance(test_pos_x, test_pos_y, near_rect, trail_skip)
+			if distance is not None and distance < safety_margin:
+				return True
+
+			# Check obstacle collisions with margin
+			for obs in state.obstacles:
+				# Simple AABB check with margin
+				if (test_pos_x - safety_margin < obs.x + obs.size and
+					test_pos_x + safety_margin > obs.x and
+					test_pos_y - safety_margin < obs.y + obs.size and
+					test_pos_y + safety_margin > obs.y):
+					return True
+
+		return False
+
+	def get_direction_to_powerup(bike_pos, powerup):
+		"""Calculate which direction moves toward a power-up."""
+		bx, by = bike_pos
+		px, py = powerup.x + powerup.size // 2, powerup.y + powerup.size // 2
+
+		dx = px - bx
+		dy = py - by
+
+		# Determine primary and secondary directions
+		directions = []
+		if abs(dx) > abs(dy):
+			# Horizontal movement is more important
+			if dx > 0:
+				directions.append(dirs["RIGHT"])
+			else:
+				directions.append(dirs["LEFT"])
+			if dy > 0:
+				directions.append(dirs["DOWN"])
+			elif dy < 0:
+				directions.append(dirs["UP"])
+		else:
+			# Vertical movement is more important
+			if dy > 0:
+				directions.append(dirs["DOWN"])
+			else:
+				directions.append(dirs["UP"])
+			if dx > 0:
+				directions.append(dirs["RIGHT"])
+			elif dx < 0:
+				directions.append(dirs["LEFT"])
+
+		return directions
+
+	def is_powerup_reachable(bike_pos, powerup):
+		"""Check if power-up is reachable by testing if we can get closer to it."""
+		target_dirs = get_direction_to_powerup(bike_pos, powerup)
+
+		# Check if ANY of the directions toward the power-up are safe
+		for target_dir in target_dirs:
+			# Don't turn 180 degrees from current direction
+			if (bike.dir == dirs["UP"] and target_dir == dirs["DOWN"]) or \
+			   (bike.dir == dirs["DOWN"] and target_dir == dirs["UP"]) or \
+			   (bike.dir == dirs["LEFT"] and target_dir == dirs["RIGHT"]) or \
+			   (bike.dir == dirs["RIGHT"] and target_dir == dirs["LEFT"]):
+				continue
+
+			# If this direction is safe, power-up is potentially reachable
+			if not will_collide(bike_pos, target_dir, steps=15):
+				return True
+
+		# No safe route found toward the power-up
+		return False
+
+	# Find nearest power-up
+	nearest_powerup = None
+	min_distance = float('inf')
+	if state.powerups:
+		for powerup in state.powerups:
+			px, py = powerup.x + powerup.size // 2, powerup.y + powerup.size // 2
+			distance = math.hypot(px - bike.pos[0], py - bike.pos[1])
+			if distance < min_distance:
+				min_distance = distance
+				nearest_powerup = powerup
+
+	# Try to move toward power-up if one exists, is reasonably close, AND is reachable
+	if nearest_powerup and min_distance < 300 and is_powerup_reachable(bike.pos, nearest_powerup):
+		target_dirs = get_direction_to_powerup(bike.pos, nearest_powerup)
+
+		# Check if we can safely move toward the power-up
+		for target_dir in target_dirs:
+			# Don't turn 180 degrees
+			if (bike.dir == dirs["UP"] and target_dir == dirs["DOWN"]) or \
+			   (bike.dir == dirs["DOWN"] and target_dir == dirs["UP"]) or \
+			   (bike.dir == dirs["LEFT"] and target_dir == dirs["RIGHT"]) or \
+			   (bike.dir == dirs["RIGHT"] and target_dir == dirs["LEFT"]):
+				continue
+
+			# Check if this direction is safe and not a zigzag
+			if not will_collide(bike.pos, target_dir, steps=15):# and not bike.is_zigzag(target_dir, dirs, current_game_time):
+				bike.last_turn_direction = bike.dir
+				bike.dir = target_dir
+				bike.last_turn_time = current_game_time
+				return
+
+	# If current direction is safe, keep going
+	if not will_collide(bike.pos, bike.dir):
+		return
+
+	# Otherwise, pick the safest turn (evaluate all safe directions)
+	def evaluate_direction_safety(direction, max_steps=50):
+		"""Calculate how many steps the AI can safely move in a direction."""
+		# Use the will_collide function to test different lookahead distances
+		# Binary search to find the maximum safe distance
+		low, high = 0, max_steps
+		safe_steps = 0
+
+		while low <= high:
+			mid = (low + high) // 2
+			if not will_collide(bike.pos, direction, steps=mid):
+				safe_steps = mid
+				low = mid + 1
+			else:
+				high = mid - 1
+
+		return safe_steps
+
+	safe_dirs = [d for d in possible_dirs if not will_collide(bike.pos, d)]
+
+	# Filter out 180-degree turns
+	safe_dirs = [d for d in safe_dirs if not (
+		(bike.dir == dirs["UP"] and d == dirs["DOWN"]) or
+		(bike.dir == dirs["DOWN"] and d == dirs["UP"]) or
+		(bike.dir == dirs["LEFT"] and d == dirs["RIGHT"]) or
+		(bike.dir == dirs["RIGHT"] and d == dirs["LEFT"])
+	)]
+
+	if safe_dirs:
+		# Evaluate safety of each direction and pick the safest
+		best_dir = None
+		best_safety = -1
+
+		for direction in safe_dirs:
+			safety = evaluate_direction_safety(direction)
+			if safety > best_safety:
+				best_safety = safety
+				best_dir = direction
+
+		if best_dir:# and not bike.is_zigzag(best_dir, dirs, current_game_time):
+			bike.last_turn_direction = bike.dir
+			bike.dir = best_dir
+			bike.last_turn_time = current_game_time
@@ -0,0 +1,144 @@
+"""Arena class for TRON Lightcycles game."""
+import math
+import pygame
+from masks import solid_mask
+
+
+class Arena:
+	"""Arena-sized occupancy masks used for pixel-perfect collision queries."""
+
+	def __init__(self, width, height):
+		self.size = (width, height)
+		self.obstacle_mask = pygame.mask.Mask(self.size)  # Every obstacle pixel on the grid
+
+	def clear_obstacles(self):
+		"""Remove all obstacles from the occupancy mask."""
+		self.obstacle_mask.clear()
+
+	def add_obstacle(self, obstacle):
+		"""Stamp an obstacle into the occupancy mask."""
+		self.obstacle_mask.draw(obstacle.mask, (obstacle.x, obstacle.y))
+
+	def cast(self, bike, pos, distance, other_bike, window_size, check_bike=True):
+		"""Sweep a bike's mask forward from pos and find where it first makes contact.
+
+		The sweep is sampled at most one pixel apart. The wall is found from the bike's
+		opaque extents directly. Whether anything else is hit between the start and a
+		sample only grows with the sample, so the first contact is found with a binary
+		search over whole-sweep tests instead of testing every pixel.
+
+		Args:
+			bike: Bike object being moved (its current direction is used)
+			pos: (x, y) back position to start the sweep from
+			distance: How far the bike wants to move
+			other_bike: The opponent Bike
+			window_size: (width, height) of the broad-phase window around the bike
+			check_bike: Whether contact with the other bike is possible and must be tested
+
+		Returns:
+			(safe_distance, hit) where safe_distance is how far the bike can move without
+			contact and hit is None, "wall", "obstacle", "trail" or "bike"
+		"""
+		orientation = bike.get_orientation()
+		if orientation is None or distance <= 0:
+			return 0, None
+
+		steps = max(1, math.ceil(distance))
+		step_size = distance / steps
+		ux, uy = orientation.direction
+
+		def sample(count):
+			"""Back position after count samples of the sweep."""
+			return (pos[0] + ux * step_size * count, pos[1] + uy * step_size * count)
+
+		def sweep_hit(count):
+			"""What the bike hits over the first count samples of the sweep, if anything."""
+			return self.sweep_hit(bike, orientation, sample(1), sample(count), other_bike, window_size, check_bike)
+
+		# Number of samples before the wall, in closed form and then confirmed exactly
+		wall_distance = orientation.get_wall_distance(pos, self.size)
+		clear = min(steps, max(0, math.floor(wall_distance / step_size)))
+		while clear > 0 and orientation.leaves_arena(sample(clear), self.size):
+			clear -= 1
+		while clear < steps and not orientation.leaves_arena(sample(clear + 1), self.size):
+			clear += 1
+
+		hit = sweep_hit(clear) if clear > 0 else None
+		if hit is None:
+			if clear < steps:
+				return step_size * clear, "wall"
+			return distance, None
+
+		# Binary search for the first sample that makes contact
+		low, high = 1, clear
+		while low < high:
+			mid = (low + high) // 2
+			mid_hit = sweep_hit(mid)
+			if mid_hit is not None:
+				high = mid
+				hit = mid_hit
+			else:
+				low = mid + 1
+
+		return step_size * (low - 1), hit
+
+	def sweep_hit(self, bike, orientation, first, last, other_bike, window_size, check_bike=True):
+		"""Check what a bike hits while moving in a straight line from back position first to last.
+
+		Walls are not checked here; cast() limits the sweep to positions inside the arena.
+
+		Returns:
+			None, "obstacle", "trail" or "bike"
+		"""
+		first_rect = orientation.get_rect(first)
+		last_rect = orientation.get_rect(last)
+
+		# Union of the bike mask (plain and dilated for contact) over every position of the sweep
+		swept_rect = first_rect.union(last_rect)
+		length = abs(last_rect.left - first_rect.left) + abs(last_rect.top - first_rect.top) + 1
+		if orientation.direction[0] != 0:
+			line = solid_mask(length, 1)
+		else:
+			line = solid_mask(1, length)
+		swept_contact_mask = orientation.contact_mask.convolve(line)
+
+		# Broad-phase window covering the window at both ends of the sweep
+		window = pygame.Rect(0, 0, *window_size)
+		window.center = orientation.get_center(first)
+		last_window = pygame.Rect(0, 0, *window_size)
+		last_window.center = orientation.get_center(last)
+		window.union_ip(last_window)
+		# A bike facing up or down is taller than window_size, so also take in its whole contact mask
+		window.union_ip(swept_rect.inflate(2 * orientation.contact_margin, 2 * orientation.contact_margin))
+
+		# Copy everything solid under the window into one small mask
+		layers = [("obstacle", self.obstacle_mask),
+		          ("trail", other_bike.trail_mask),
+		          ("trail", bike.settled_trail_mask)]
+		window_offset = (-window.left, -window.top)
+		occupancy = pygame.mask.Mask(window.size)
+		for name, layer in layers:
+			occupancy.draw(layer, window_offset)
+
+		# Test the swept dilated mask against everything at once
+		contact_offset = (swept_rect.left - orientation.contact_margin - window.left,
+		                  swept_rect.top - orientation.contact_margin - window.top)
+		if occupancy.overlap(swept_contact_mask, contact_offset) is not None:
+			# Work out which layer was hit
+			for name, layer in layers:
+				occupancy.clear()
+				occupancy.draw(layer, window_offset)
+				if occupancy.overlap(swept_contact_mask, contact_offset) is not None:
+					return name
+
+		# Bike-to-bike contact uses the plain masks
+		other_orientation = other_bike.get_orientation()
+		if check_bike and other_bike.mask is not None and other_orientation is not None:
+			other_rect = other_orientation.get_rect(other_bike.pos)
+			if other_rect.colliderect(swept_rect):
+				swept_mask = orientation.mask.convolve(line)
+				offset = (other_rect.left - swept_rect.left, other_rect.top - swept_rect.top)
+				if swept_mask.overlap(other_orientation.mask, offset) is not None:
+					return "bike"
+
+		return None
@@ -0,0 +1,147 @@
+"""Headless batch runner for TRON Lightcycles game.
+
+Plays many AI-vs-AI (or scripted-vs-AI) matches across all CPU cores and streams one
+CSV line per round to a results file as soon as its match finishes.
+
+Example:
+	python batch.py --matches 100000 --theme LEGACY --difficulty CHALLENGE --output results.csv
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from ai import ai_control
+from constants import *
+from simulation import BIKE_IMAGES, GameState, load_bikes
+
+# Ways player 1 can be driven; player 2 is always the AI
+PLAYER1_CONTROLLERS = ["ai", "straight", "random"]
+
+# How often the "random" controller turns on average, per second
+RANDOM_TURN_RATE = 3
+
+# Columns of the results file, one row per round
+RESULT_FIELDS = ["seed", "round", "winner", "cause", "ticks", "duration_ms",
+                 "p1_trail", "p2_trail", "p1_powerups", "p2_powerups", "p1_wins", "p2_wins"]
+
+# Bikes loaded once per worker process and reused by every match it plays
+worker_bikes = None
+
+
+def init_worker(theme):
+	"""Load the theme's bikes in a worker process."""
+	global worker_bikes
+	worker_bikes = load_bikes(theme)
+
+
+def scripted_direction(bike, controller, rng, tick_rate):
+	"""Pick player 1's turn for a tick when it is not driven by the AI.
+
+	Returns:
+		A direction from dirs, or None to keep going straight
+	"""
+	if controller != "random" or rng.random() >= RANDOM_TURN_RATE / tick_rate:
+		return None
+	if bike.dir[0] != 0:
+		return dirs[rng.choice(["UP", "DOWN"])]
+	return dirs[rng.choice(["LEFT", "RIGHT"])]
+
+
+def trail_length(bike):
+	"""Get the length of a bike's trail in pixels."""
+	return sum(abs(segment.end[0] - segment.start[0]) + abs(segment.end[1] - segment.start[1])
+	           for segment in bike.segments)
+
+
+def play_match(job):
+	"""Play one match to the maximum score and collect a result row for each round.
+
+	Args:
+		job: (seed, theme, speed, tick_rate, controller, max_score, max_seconds) tuple
+
+	Returns:
+		List of result rows (lists in RESULT_FIELDS order)
+	"""
+	seed, theme, speed, tick_rate, controller, max_score, max_seconds = job
+	player1, player2 = worker_bikes
+
+	rng = random.Random(f"{seed}-player1")  # Scripted turns have their own stream
+	state = GameState(player1, player2, theme, speed, max_score=max_score, seed=seed, tick_rate=tick_rate)
+	max_ticks = max_seconds * tick_rate
+
+	rows = []
+	while not state.match_over:
+		state.reset_round()
+		while not state.game_over and state.ticks < max_ticks:
+			current_time = state.next_tick_time()
+
+			p1_dir = None
+			if controller == "ai":
+				if not player1.is_frozen(current_time):
+					ai_control(state, player1, current_time)
+			else:
+				p1_dir = scripted_direction(player1, controller, rng, tick_rate)
+			if not player2.is_frozen(current_time):
+				ai_control(state, player2, current_time)
+
+			state.step((p1_dir, None))
+
+		# A round still going after max_seconds is recorded with an empty winner
+		rows.append([seed, state.round_number, state.winner if state.game_over else "", state.crash_cause or "",
+		             state.ticks, round(state.time), trail_length(player1), trail_length(player2),
+		             player1.powerups_collected, player2.powerups_collected, state.p1_wins, state.p2_wins])
+		if not state.game_over:
+			break
+
+	return rows
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Play headless AI matches on every CPU core.")
+	parser.add_argument("--matches", type=int, default=1000, help="number of matches to play")
+	parser.add_argument("--theme", choices=sorted(BIKE_IMAGES), default="LEGACY",
+	                    help="theme whose bike sprites (and so hitboxes) are used")
+	parser.add_argument("--difficulty", choices=sorted(DIFFICULTY_SPEEDS), default="NORMAL")
+	parser.add_argument("--speed", type=float, help="bike speed in pixels per second, overrides --difficulty")
+	parser.add_argument("--tick-rate", type=int, choices=TICK_RATES, default=TICK_RATE,
+	                    help="simulation ticks per second")
+	parser.add_argument("--seed", type=int, default=0, help="seed of the first match; match i uses seed + i")
+	parser.add_argument("--player1", choices=PLAYER1_CONTROLLERS, default="ai",
+	                    help="how player 1 is driven (player 2 is always the AI)")
+	parser.add_argument("--max-score", type=int, default=1, help="round wins needed to win a match")
+	parser.add_argument("--max-seconds", type=int, default=600,
+	                    help="game time after which a round is abandoned")
+	parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+	parser.add_argument("--output", default="results.csv", help="results file ('-' for stdout)")
+	args = parser.parse_args()
+
+	speed = args.speed if args.speed is not None else DIFFICULTY_SPEEDS[args.difficulty]
+	jobs = ((args.seed + i, args.theme, speed, args.tick_rate, args.player1, args.max_score, args.max_seconds)
+	        for i in range(args.matches))
+
+	output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+	writer = csv.writer(output)
+	writer.writerow(RESULT_FIELDS)
+
+	wins = {1: 0, 2: 0, 0: 0}  # Matches won by each player, 0 for unfinished
+	start = time.perf_counter()
+	with multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(args.theme,)) as pool:
+		for rows in pool.imap_unordered(play_match, jobs, chunksize=16):
+			writer.writerows(rows)
+			# Drawn rounds are replayed, so a finished match ends on a round its winner won
+			winner = rows[-1][2]
+			wins[winner if winner in (1, 2) else 0] += 1
+	if output is not sys.stdout:
+		output.close()
+
+	elapsed = time.perf_counter() - start
+	print(f"{args.matches} matches in {elapsed:.1f}s: player 1 won {wins[1]}, player 2 won {wins[2]}, "
+	      f"{wins[0]} unfinished", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,29 +1,71 @@
 """Bike class for TRON Lightcycles game."""
 import math
+import pygame
+
+from masks import solid_mask
+from orientation import Orientation
+from trail import SegmentTrail
+
+# Trail margins were tuned as block counts at this tick rate
+TRAIL_MARGIN_RATE = 60
+
+
+def get_trail_margin(blocks, speed, block_size=5):
+	"""Get the length of trail that a number of blocks covered at TRAIL_MARGIN_RATE and a speed.
+
+	A block is laid every block_size pixels within a tick and at the end of every tick, so the
+	spacing of the blocks depends on how far a bike moves per tick. The length is the same at
+	every tick rate.
+	"""
+	tick_distance = speed / TRAIL_MARGIN_RATE
+	return blocks * tick_distance / math.ceil(tick_distance / block_size)
 
 
 class Bike:
 	"""Represents a lightcycle with position, direction, trail, and status effects."""
 
-	def __init__(self, sprite, color, name, mask=None):
-		self.sprite = sprite
+	# Number of newest trail blocks that never count as a collision with the bike's own trail
+	# The bike sprite is ~40-50 pixels long, so this clears its entire length plus turning radius
+	TRAIL_SAFETY_BLOCKS = 50
+
+	def __init__(self, sprite, color, name, mask=None, arena_size=(900, 900), block_size=5):
+		self.set_sprite(sprite)
 		self.mask = mask  # Mask for pixel-perfect collision detection
 		self.color = color
 		self.name = name
 		self.pos = [0, 0]  # Back position of bike
+		self.prev_pos = [0, 0]  # Back position before the last tick, for interpolated rendering
 		self.dir = (0, 0)  # Direction vector
-		self.trail = []  # List for rendering (ordered)
-		self.trail_set = set()  # Set for fast collision detection
+		self.segments = SegmentTrail(block_size)  # The trail as axis-aligned runs of blocks
+		self.settled_length = -1  # Trail length stamped into settled_trail_mask (-1 before the first block)
+		self.trail_safety_margin = self.TRAIL_SAFETY_BLOCKS * block_size  # In pixels; GameState sets it for its speed
+		self.trail_mask = pygame.mask.Mask(arena_size)  # Every trail block, for the other bike
+		self.settled_trail_mask = pygame.mask.Mask(arena_size)  # Trail further back than trail_safety_margin
 		self.frozen_until = 0
 		self.slow_until = 0
 		self.fast_until = 0
 		self.last_turn_time = 0
 		self.last_turn_direction = None  # Track the last turn made (LEFT, RIGHT, UP, DOWN)
+		self.powerups_collected = 0  # Power-ups picked up this round
+
+	def set_sprite(self, sprite, back_margin=4):
+		"""Assign the sprite and precompute its rotated surface and mask for each direction."""
+		self.sprite = sprite
+		self.orientations = {direction: Orientation(sprite, direction, back_margin) for direction in Orientation.DIRECTIONS}
+
+	def get_orientation(self, direction=None):
+		"""Get the precomputed orientation for a direction (defaults to the current one)."""
+		dx, dy = self.dir if direction is None else direction
+		if dx == 0 and dy == 0:
+			return None
+		return self.orientations[((dx > 0) - (dx < 0), (dy > 0) - (dy < 0))]
 
 	def reset_trail(self):
 		"""Clear the bike's trail."""
-		self.trail = []
-		self.trail_set = set()
+		self.segments.clear()
+		self.settled_length = -1
+		self.trail_mask.clear()
+		self.settled_trail_mask.clear()
 
 	def reset_status(self):
 		"""Clear all status effects."""
@@ -31,6 +73,7 @@ class Bike:
 		self.slow_until = 0
 		self.last_turn_time = 0
 		self.last_turn_direction = None
+		self.powerups_collected = 0
 
 	def get_front_pos(self, sprite_width, back_margin=4):
 		"""Calculate the front position of the bike."""
@@ -45,10 +88,18 @@ class Bike:
 		return [front_x, front_y]
 
 	def add_trail_point(self, pos):
-		"""Add a position to the trail (only if different from last)."""
-		if len(self.trail) == 0 or self.trail[-1] != pos:
-			self.trail.append(pos)
-			self.trail_set.add(pos)
+		"""Add a position to the trail and stamp the run up to it into the trail masks."""
+		length = self.segments.length if self.segments else -1
+		self.segments.add_point(pos)
+		for rect in self.segments.get_rects_between(length, self.segments.length):
+			self.trail_mask.draw(solid_mask(rect.width, rect.height), rect.topleft)
+
+		# Trail that just fell out of the safety margin now counts for the bike itself
+		settled_length = self.segments.length - self.trail_safety_margin
+		if settled_length > self.settled_length:
+			for rect in self.segments.get_rects_between(self.settled_length, settled_length):
+				self.settled_trail_mask.draw(solid_mask(rect.width, rect.height), rect.topleft)
+			self.settled_length = settled_length
 
 	def is_frozen(self, current_time):
 		"""Check if bike is currently frozen."""
@@ -67,7 +118,7 @@ class Bike:
 		if self.is_frozen(current_time):
 			return 0
 		if self.is_slowed(current_time):
-			return base_speed // 2
+			return base_speed / 2
 		return base_speed
 
 	def can_turn(self, current_time, cooldown):
@@ -109,6 +160,12 @@ class Bike:
 
 		return False
 
-	def render(self, screen, blit_func, back_margin=4):
-		"""Render the bike sprite on the screen."""
-		blit_func(screen, self.sprite, self.pos, self.dir, back_margin)
+	def get_render_pos(self, interpolation=1.0):
+		"""Get the back position to draw the bike at, interpolation of the way from prev_pos to pos."""
+		return [self.prev_pos[0] + (self.pos[0] - self.prev_pos[0]) * interpolation,
+		        self.prev_pos[1] + (self.pos[1] - self.prev_pos[1]) * interpolation]
+
+	def render(self, screen, interpolation=1.0):
+		"""Blit the bike's precomputed rotated sprite on the screen, placed like blit_bike_with_front_at()."""
+		orientation = self.get_orientation() or self.orientations[(1, 0)]  # Face right before moving
+		screen.blit(orientation.surface, orientation.get_rect(self.get_render_pos(interpolation)))
@@ -0,0 +1,53 @@
+"""Shared pytest setup for TRON Lightcycles game."""
+import os
+
+# The headless modules never open a window, but pygame still needs drivers when it initializes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Interactive collision demos that open a window and wait for input when imported or run
+collect_ignore = [
+	"test_bike_collision_simple.py",
+	"test_bike_side_collision.py",
+	"test_collision.py",
+	"test_side_collision.py",
+]
+
+
+@pytest.fixture(autouse=True)
+def game_directory(monkeypatch):
+	"""Run each test from the game directory, where the image paths are relative to."""
+	monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture
+def play_ai():
+	"""Function that plays a GameState's current round with both bikes on the AI."""
+	from ai import ai_control
+
+	def play(state, ticks, on_tick=None):
+		"""Play up to ticks ticks, stopping when the round is over.
+
+		Args:
+			on_tick: Called with the state after every tick
+
+		Returns:
+			List of what on_tick returned after every tick
+		"""
+		results = []
+		for _ in range(ticks):
+			if state.game_over:
+				break
+			current_time = state.next_tick_time()
+			ai_control(state, state.player1, current_time)
+			ai_control(state, state.player2, current_time)
+			state.step()
+			if on_tick is not None:
+				results.append(on_tick(state))
+		return results
+
+	return play
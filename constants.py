@@ -0,0 +1,58 @@
+"""Game constants for TRON Lightcycles game.
+
+Kept free of display, mixer and font setup so the simulation can be imported headless.
+"""
+
+WIDTH, HEIGHT = 900, 900
+
+# Colors
+BLACK = (0, 0, 0)
+GRID_COLOR = (20, 20, 30)
+BLUE = (0, 255, 255)
+DARKER_BLUE = (0, 200, 200)
+ORANGE = (255, 150, 0)
+RED = (255, 0, 0)
+DARKER_RED = (200, 0, 0)
+DARKEST_RED = (190, 0, 0)
+LIGHT_RED = (255, 50, 50)
+TEAL = (0, 180, 150)
+DARKER_TEAL = (0, 10, 20)
+LIGHTER_TEAL = (0, 225, 188)
+WHITE = (255, 255, 255)
+LIGHT_GRAY = (200, 200, 200)
+YELLOW = (255, 255, 0)
+GREEN = (22, 247, 21)
+DARKER_GREEN = (0, 165, 0)
+
+MAX_SCORE = 5
+
+OBSTACLE_SIZE = 20
+
+# --- POWER-UP SYSTEM ---
+POWERUP_SIZE = 20
+POWERUP_SPAWN_INTERVAL = 2000
+
+# Player settings
+SPEED = 300  # Pixels per second
+BLOCK_SIZE = 5
+TRAIL_WIDTH = 5  # Visual width of trails (always 5px regardless of difficulty)
+
+# Bike speed for each difficulty, in pixels per second
+DIFFICULTY_SPEEDS = {
+	"NORMAL": 360,
+	"CHALLENGE": 480
+}
+
+# Simulation ticks per second (times and speeds are per second, so any rate plays the same)
+TICK_RATE = 60
+TICK_RATES = [60, 120, 240]
+
+# Direction vectors (bikes move at their speed along them)
+dirs = {
+	"UP": (0, -1),
+	"DOWN": (0, 1),
+	"LEFT": (-1, 0),
+	"RIGHT": (1, 0)
+}
+
+turn_cooldown = 5  # Milliseconds between turns
@@ -1,11 +1,12 @@
 import math
 import pygame
-import random
 import sys
 from main import *
 
-from obstacle import Obstacle
-from powerup import PowerUp
+from ai import ai_control
+from replay import ReplayPlayer, ReplayRecorder
+from simulation import load_bikes
+from snapshot import get_snapshot_theme, load_state, save_state
 
 
 def blit_bike_with_front_at(screen, sprite, pos_back, dir_vector, back_margin=0):
@@ -33,13 +34,50 @@ def blit_bike_with_front_at(screen, sprite, pos_back, dir_vector, back_margin=0)
 	center_x = back_center_x + rotated_center.x
 	center_y = back_center_y + rotated_center.y
 
-	# Rotate the sprite
 	rotated_sprite = pygame.transform.rotate(sprite, angle_deg)
 	bike_rect = rotated_sprite.get_rect(center=(center_x, center_y))
 
 	# Draw the rotated sprite
 	screen.blit(rotated_sprite, bike_rect)
 
+def get_glow_surface(color, width, height, alpha):
+	"""Get a bike glow of the given half width and height (drawing it only the first time)."""
+	glow_surface = glow_surfaces.get((color, width, height, alpha))
+	if glow_surface is None:
+		# Create a surface for the glow with per-pixel alpha
+		glow_surface = pygame.Surface((width * 2, height * 2), pygame.SRCALPHA)
+
+		# Draw multiple ellipses with decreasing alpha for a gradient effect
+		for i in range(3):
+			current_width = width - (i * 3)
+			current_height = height - (i * 3)
+			current_alpha = alpha - (i * 15)
+			if current_alpha < 0:
+				current_alpha = 0
+			if current_width > 0 and current_height > 0:
+				rect = pygame.Rect(width - current_width, height - current_height,
+				                   current_width * 2, current_height * 2)
+				pygame.draw.ellipse(glow_surface, (*color, current_alpha), rect)
+		glow_surfaces[(color, width, height, alpha)] = glow_surface
+	return glow_surface
+
+def warm_render_caches(state):
+	"""Build everything the round's first frames will draw (glows for every direction, obstacle
+	and power-up images, and the cleared trail layer) before the round starts.
+
+	The bikes' rotated sprites are built with them (see Bike.set_sprite).
+	"""
+	for bike in (state.player1, state.player2):
+		get_glow_surface(bike.color, 27, 12, 80)
+		get_glow_surface(bike.color, 12, 27, 80)
+	for item in state.obstacles + state.powerups:
+		item.get_image(theme)
+	update_trail_layer(state)
+
+def clear_render_caches():
+	"""Forget the glows drawn for the previous theme."""
+	glow_surfaces.clear()
+
 def get_front_pos(pos_back, dir_vector, sprite_width=None, back_margin=4):
 	# Compute front point automatically from sprite width.
 	dx, dy = dir_vector
@@ -55,87 +93,9 @@ def get_front_pos(pos_back, dir_vector, sprite_width=None, back_margin=4):
 	front_y = pos_back[1] + ny * length
 	return [front_x, front_y]
 
-def reset_sprites():
-	"""Reset bike positions and trails for a new round."""
-	top_left = [dirs["DOWN"], [WIDTH // 4, 35]]
-	top_right = [dirs["DOWN"], [3 * WIDTH // 4, 35]]
-	bottom_left = [dirs["UP"], [WIDTH // 4, HEIGHT - 35]]
-	bottom_right = [dirs["UP"], [3 * WIDTH // 4, HEIGHT - 35]]
-	left_top = [dirs["RIGHT"], [35, HEIGHT // 4]]
-	left_bottom = [dirs["RIGHT"], [35, 3 * HEIGHT // 4]]
-	right_top = [dirs["LEFT"], [WIDTH - 35, HEIGHT // 4]]
-	right_bottom = [dirs["LEFT"], [WIDTH - 35, 3 * HEIGHT // 4]]
-
-	pos = [
-		top_left,
-		top_right,
-		bottom_left,
-		bottom_right,
-		right_top,
-		right_bottom,
-		left_top,
-		left_bottom
-	]
-
-	p1_start = random.choice(pos)
-	pos.remove(p1_start)
-
-	# Ensure bikes don't start in adjacent corners
-	if p1_start == top_left:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != left_top:
-				break
-	elif p1_start == top_right:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != right_top:
-				break
-	elif p1_start == bottom_left:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != left_bottom:
-				break
-	elif p1_start == bottom_right:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != right_bottom:
-				break
-	elif p1_start == right_top:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != top_right:
-				break
-	elif p1_start == right_bottom:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != bottom_right:
-				break
-	elif p1_start == left_top:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != top_left:
-				break
-	elif p1_start == left_bottom:
-		while True:
-			p2_start = random.choice(pos)
-			if p2_start != bottom_left:
-				break
-
-	# Set player 1 position and direction
-	player1.dir = p1_start[0]
-	player1.pos = p1_start[1]
-	player1.reset_trail()
-	player1.reset_status()
-
-	# Set player 2 position and direction
-	player2.dir = p2_start[0]
-	player2.pos = p2_start[1]
-	player2.reset_trail()
-	player2.reset_status()
-
-def main_menu():
-	global p1_wins, p2_wins, match_over, single_player, font, small_font, message_color, current_track
+def set_theme_fonts():
+	"""Load the current theme's fonts and message color."""
+	global font, small_font, message_color
 
 	if theme == "82":
 		font = pygame.font.Font(tron_font, 50)
@@ -158,6 +118,18 @@ def main_menu():
 		small_font = pygame.font.Font(orbitron_regular, 20)
 		message_color = (0, 255, 255)
 
+def wait_for_events(timeout=0):
+	"""Sleep until an event arrives (or timeout milliseconds pass, if given), then get every pending event."""
+	event = pygame.event.wait(timeout)
+	if event.type == pygame.NOEVENT:
+		return []
+	return [event] + pygame.event.get()
+
+def main_menu():
+	global single_player, current_track
+
+	set_theme_fonts()
+
 	menu_running = True
 	# Flag to track if menu music has been initialized
 
@@ -173,7 +145,7 @@ def main_menu():
 		elif theme == "LEGACY":
 			WIN.blit(legacy_background, (0, 0))
 			if current_track not in [str(song) for song in menu_music_legacy]:
-				menu_song = random.choice(menu_music_legacy)
+				menu_song = ui_rng.choice(menu_music_legacy)
 				selected_song = str(menu_song)
 				pygame.mixer.music.stop()
 				pygame.mixer.music.load(selected_song)
@@ -183,7 +155,7 @@ def main_menu():
 		elif theme == "ARES":
 			WIN.blit(ares_background, (0, 0))
 			if current_track not in [str(song) for song in menu_music_ares]:
-				menu_song = random.choice(menu_music_ares)
+				menu_song = ui_rng.choice(menu_music_ares)
 				selected_song = str(menu_song)
 				pygame.mixer.music.stop()
 				pygame.mixer.music.load(selected_song)
@@ -193,7 +165,7 @@ def main_menu():
 		elif theme == "RECONFIGURED":
 			WIN.blit(reconfigured_background, (0, 0))
 			if current_track not in [str(song) for song in menu_music_reconfigured]:
-				menu_song = random.choice(menu_music_reconfigured)
+				menu_song = ui_rng.choice(menu_music_reconfigured)
 				selected_song = str(menu_song)
 				pygame.mixer.music.stop()
 				pygame.mixer.music.load(selected_song)
@@ -203,7 +175,7 @@ def main_menu():
 		elif theme == "UPRISING":
 			WIN.blit(legacy_background, (0, 0))
 			if current_track not in [str(song) for song in menu_music_uprising]:
-				menu_song = random.choice(menu_music_uprising)
+				menu_song = ui_rng.choice(menu_music_uprising)
 				selected_song = str(menu_song)
 				pygame.mixer.music.stop()
 				pygame.mixer.music.load(selected_song)
@@ -249,26 +221,26 @@ def main_menu():
 			else:
 				# Fallback to text if image doesn't exist
 				large_font = pygame.font.Font(tron_font, 100)
-				tron_title = large_font.render("TRON", True, message_color)
+				tron_title = render_text(large_font, "TRON", message_color)
 		elif theme == "LEGACY":
 			large_font = pygame.font.Font(tr2n, 200)
-			tron_title = large_font.render("TRON", True, message_color)
+			tron_title = render_text(large_font, "TRON", message_color)
 			lightcycle_img = pygame.image.load("images/lightcycle_text_legacy.png")
 			subtitle_width = 550
 			subtitle_height = int(lightcycle_img.get_height() * (subtitle_width / lightcycle_img.get_width()))
 			lightcycles_title = pygame.transform.scale(lightcycle_img, (subtitle_width, subtitle_height))
 		elif theme == "ARES":
 			large_font = pygame.font.Font(tron_ares, 150)
-			tron_title = large_font.render("TRON", True, message_color)
+			tron_title = render_text(large_font, "TRON", message_color)
 
 		# Render other title components
 		if theme == "RECONFIGURED":
 			title_font = pygame.font.Font(pixel_font, 25)
-			lightcycles_title = font.render("L1GHTCYCL3S", True, message_color)
+			lightcycles_title = render_text(font, "L1GHTCYCL3S", message_color)
 		elif theme != "82" and theme != "UPRISING" and theme != "LEGACY":
-			lightcycles_title = font.render("LIGHTCYCLES", True, message_color)
+			lightcycles_title = render_text(font, "LIGHTCYCLES", message_color)
 
-		instruction_text = small_font.render("Press \"1\" for 1 Player or \"2\" for 2 Players", True, (180, 180, 180))
+		instruction_text = render_text(small_font, "Press \"1\" for 1 Player or \"2\" for 2 Players", (180, 180, 180))
 
 		# Calculate positions (centered)
 		tron_x = (WIDTH - tron_title.get_width()) // 2
@@ -307,26 +279,30 @@ def main_menu():
 		WIN.blit(lightcycles_title, (lightcycles_x, lightcycles_y))
 		WIN.blit(instruction_text, (instruction_x, instruction_y))
 		pygame.display.flip()
+		menu_frame = WIN.copy()
 		waiting = True
 		while waiting:
-			for event in pygame.event.get():
+			for event in wait_for_events():
 				if event.type == pygame.QUIT:
 					pygame.quit()
 					sys.exit()
+				if event.type == pygame.WINDOWEXPOSED:
+					WIN.blit(menu_frame, (0, 0))
+					pygame.display.update()
 				if event.type == pygame.KEYDOWN:
 					if event.key == pygame.K_1:
 						single_player = True
-						p1_wins = 0
-						p2_wins = 0
-						match_over = False
+						if replay_recorder is not None:
+							replay_recorder.close()  # The previous match's replay is complete
+						game_state.new_match()
 						menu_running = False
 						waiting = False
 						difficulty_menu()
 					elif event.key == pygame.K_2:
 						single_player = False
-						p1_wins = 0
-						p2_wins = 0
-						match_over = False
+						if replay_recorder is not None:
+							replay_recorder.close()  # The previous match's replay is complete
+						game_state.new_match()
 						menu_running = False
 						waiting = False
 						difficulty_menu()
@@ -351,23 +327,28 @@ def difficulty_menu():
 		elif theme == "UPRISING":
 			WIN.blit(legacy_background, (0, 0))
 		show_message("CHOOSE DIFFICULTY", "Press \"1\" for \"NORMAL\" or \"2\" for \"CHALLENGE\"", message_color)
+		pygame.display.update()
+		menu_frame = WIN.copy()
 		waiting = True
 		while waiting:
-			for event in pygame.event.get():
+			for event in wait_for_events():
 				if event.type == pygame.QUIT:
 					pygame.quit()
 					sys.exit()
+				if event.type == pygame.WINDOWEXPOSED:
+					WIN.blit(menu_frame, (0, 0))
+					pygame.display.update()
 				if event.type == pygame.KEYDOWN:
 					if event.key == pygame.K_1:
 						difficulty = "NORMAL"
-						SPEED = 6
+						SPEED = DIFFICULTY_SPEEDS[difficulty]
 						BLOCK_SIZE = 5
 						difficulty_menu_running = False
 						waiting = False
 						theme_menu()
 					elif event.key == pygame.K_2:
 						difficulty = "CHALLENGE"
-						SPEED = 8
+						SPEED = DIFFICULTY_SPEEDS[difficulty]
 						BLOCK_SIZE = 5
 						difficulty_menu_running = False
 						waiting = False
@@ -397,12 +378,17 @@ def theme_menu():
 			show_message("SELECT A THEME", "Press \"1\" for \"82\", \"2\" for \"LEGACY\", \"3\" for \"ARES\", or \"U\" for UPRISING", message_color)
 		else:
 			show_message("SELECT A THEME", "Press \"1\" for \"82\", \"2\" for \"LEGACY\", or \"3\" for \"ARES\"", message_color)
+		pygame.display.update()
+		menu_frame = WIN.copy()
 		waiting = True
 		while waiting:
-			for event in pygame.event.get():
+			for event in wait_for_events():
 				if event.type == pygame.QUIT:
 					pygame.quit()
 					sys.exit()
+				if event.type == pygame.WINDOWEXPOSED:
+					WIN.blit(menu_frame, (0, 0))
+					pygame.display.update()
 				if event.type == pygame.KEYDOWN:
 					if event.key == pygame.K_1:
 						theme = "82"
@@ -413,7 +399,7 @@ def theme_menu():
 						small_font = pygame.font.Font(transrobotics, 20)
 						theme_menu_running = False
 						waiting = False
-						reset_game()
+						reset_game(game_state)
 					elif event.key == pygame.K_2:
 						theme = "LEGACY"
 						BLUE = (2, 255, 255)
@@ -423,7 +409,7 @@ def theme_menu():
 						small_font = pygame.font.Font(orbitron_regular, 20)
 						theme_menu_running = False
 						waiting = False
-						reset_game()
+						reset_game(game_state)
 					elif event.key == pygame.K_3:
 						theme = "ARES"
 						BLUE = (0, 255, 255)
@@ -432,7 +418,7 @@ def theme_menu():
 						small_font = pygame.font.Font(orbitron_regular, 20)
 						theme_menu_running = False
 						waiting = False
-						reset_game()
+						reset_game(game_state)
 					elif event.key == pygame.K_r:
 						theme = "RECONFIGURED"
 						WHITE = (255, 255, 255)
@@ -440,7 +426,7 @@ def theme_menu():
 						small_font = pygame.font.Font(pixel_font, 15)
 						theme_menu_running = False
 						waiting = False
-						reset_game()
+						reset_game(game_state)
 					elif event.key == pygame.K_u:
 						theme = "UPRISING"
 						BLUE = (2, 255, 255)
@@ -450,7 +436,7 @@ def theme_menu():
 						small_font = pygame.font.Font(orbitron_regular, 20)
 						theme_menu_running = False
 						waiting = False
-						reset_game()
+						reset_game(game_state)
 					elif event.key == pygame.K_ESCAPE:
 						theme_menu_running = False
 						waiting = False
@@ -539,8 +525,19 @@ def draw_rotated_rect_debug(surface, color, center_x, center_y, width, height, a
 	pygame.draw.polygon(surface, color, rotated_corners, line_width)
 
 def draw_tron_grid(surface, desired_spacing=40):
+	"""Draw the current theme's background, rendering it only the first time it is needed."""
+	key = (theme, surface.get_size(), desired_spacing)
+	background = grid_backgrounds.get(key)
+	if background is None:
+		background = pygame.Surface(surface.get_size()).convert()
+		render_tron_grid(background, desired_spacing)
+		grid_backgrounds[key] = background
+	surface.blit(background, (0, 0))
+
+def render_tron_grid(surface, desired_spacing=40):
+	"""Render the current theme's background grid onto surface."""
 	if theme == "LEGACY" or theme == "ARES" or theme == "UPRISING":
-		draw_squircle_grid(WIN, 90, 120, .2)
+		draw_squircle_grid(surface, 90, 120, .2)
 	elif theme == "RECONFIGURED":
 		# 8-bit style pixelated grid
 		surface.fill((0, 10, 0))  # Dark green background
@@ -625,7 +622,38 @@ def draw_tron_grid(surface, desired_spacing=40):
 
 		surface.blit(glow, (0, 0))
 
-def show_message(text, subtext="", color=WHITE):
+def render_text(text_font, text, color):
+	"""Render antialiased text, reusing the surface if the same text was rendered recently."""
+	color = tuple(color)
+	return text_cache.get((text_font, text, color), lambda: text_font.render(text, True, color))
+
+def split_text(text_font, text, max_width):
+	"""Split text into two lines at a word boundary if it is wider than max_width.
+
+	Returns:
+		List of one or two lines
+	"""
+	if text_font.size(text)[0] <= max_width:
+		return [text]
+	words = text.split()
+
+	# Find the longest line1 that fits, ensuring line2 also fits
+	best_split = 1
+	for i in range(1, len(words)):
+		line1_width = text_font.size(" ".join(words[:i]))[0]
+		line2_width = text_font.size(" ".join(words[i:]))[0]
+
+		# Both lines must fit within max_width
+		if line1_width <= max_width and line2_width <= max_width:
+			best_split = i
+		elif line1_width > max_width:
+			# If line1 is too wide, we've gone too far
+			break
+
+	return [" ".join(words[:best_split]), " ".join(words[best_split:])]
+
+def render_message_box(text, subtext, color):
+	"""Render the box show_message() draws: the text over a filled, outlined rectangle."""
 	# Add padding around the text
 	padding_x = 20
 	padding_y = 15
@@ -634,72 +662,11 @@ def show_message(text, subtext="", color=WHITE):
 	# Maximum width for text (screen width minus padding and some margin)
 	max_text_width = WIDTH - 2 * padding_x - 40
 
-	# Check if text needs to be split into two lines
-	title = font.render(text, True, color)
-	text_lines = []
-
-	if title.get_width() > max_text_width:
-		# Split text into two lines at a word boundary
-		words = text.split()
-
-		# Find the longest line1 that fits, ensuring line2 also fits
-		best_split = 1
-		for i in range(1, len(words)):
-			line1 = " ".join(words[:i])
-			line2 = " ".join(words[i:])
-
-			line1_render = font.render(line1, True, color)
-			line2_render = font.render(line2, True, color)
-
-			# Both lines must fit within max_text_width
-			if line1_render.get_width() <= max_text_width and line2_render.get_width() <= max_text_width:
-				best_split = i
-			else:
-				# If line1 is too wide, we've gone too far
-				if line1_render.get_width() > max_text_width:
-					break
-
-		line1 = " ".join(words[:best_split])
-		line2 = " ".join(words[best_split:])
-		text_lines = [line1, line2]
-	else:
-		text_lines = [text]
-
-	# Render text surfaces
-	title_surfaces = [font.render(line, True, color) for line in text_lines]
-
+	title_surfaces = [render_text(font, line, color) for line in split_text(font, text, max_text_width)]
+	subtitle_surfaces = []
 	if subtext != "":
-		subtitle = small_font.render(subtext, True, (180, 180, 180))
-		subtext_lines = []
-
-		if subtitle.get_width() > max_text_width:
-			# Split text into two lines at a word boundary
-			words = subtext.split()
-
-			# Find the longest line1 that fits, ensuring line2 also fits
-			best_split = 1
-			for i in range(1, len(words)):
-				line1 = " ".join(words[:i])
-				line2 = " ".join(words[i:])
-
-				line1_render = small_font.render(line1, True, color)
-				line2_render = small_font.render(line2, True, color)
-
-				# Both lines must fit within max_text_width
-				if line1_render.get_width() <= max_text_width and line2_render.get_width() <= max_text_width:
-					best_split = i
-				else:
-					# If line1 is too wide, we've gone too far
-					if line1_render.get_width() > max_text_width:
-						break
-
-			line1 = " ".join(words[:best_split])
-			line2 = " ".join(words[best_split:])
-			subtext_lines = [line1, line2]
-		else:
-			subtext_lines = [subtext]
-
-		subtitle_surfaces = [small_font.render(line, True, (180, 180, 180)) for line in subtext_lines]
+		subtitle_surfaces = [render_text(small_font, line, (180, 180, 180))
+		                     for line in split_text(small_font, subtext, max_text_width)]
 
 	# Determine box width & height based on text sizes
 	max_title_width = max(surf.get_width() for surf in title_surfaces)
@@ -714,100 +681,38 @@ def show_message(text, subtext="", color=WHITE):
 		box_width = max_title_width + 2 * padding_x
 		box_height = total_title_height + 2 * padding_y
 
-	# Position box centered on screen
-	box_x = WIDTH // 2 - box_width // 2
-	box_y = HEIGHT // 2 - box_height // 2
+	box = pygame.Surface((box_width, box_height)).convert()
 
 	# Draw black background rectangle
 	if theme == "82":
-		pygame.draw.rect(WIN, (9, 35, 51), (box_x, box_y, box_width, box_height))
+		box.fill((9, 35, 51))
 	elif theme == "UPRISING":
-		pygame.draw.rect(WIN, (0, 0, 30), (box_x, box_y, box_width, box_height))
+		box.fill((0, 0, 30))
 	else:
-		pygame.draw.rect(WIN, BLACK, (box_x, box_y, box_width, box_height))
+		box.fill(BLACK)
 
 	# Draw outline rectangle
 	if theme == "82":
-		pygame.draw.rect(WIN, (128, 0, 128), (box_x, box_y, box_width, box_height), 3)
+		pygame.draw.rect(box, (128, 0, 128), (0, 0, box_width, box_height), 3)
 	else:
-		pygame.draw.rect(WIN, color, (box_x, box_y, box_width, box_height), 3)
-
-	# Draw the text centered inside the box
-	current_y = box_y + padding_y
-	for title_surf in title_surfaces:
-		title_x = WIDTH // 2 - title_surf.get_width() // 2
-		WIN.blit(title_surf, (title_x, current_y))
-		current_y += title_surf.get_height() + spacing
-
-	if subtext != "":
-		# subtitle_x = WIDTH // 2 - subtitle.get_width() // 2
-		# subtitle_y = current_y
-		# WIN.blit(subtitle, (subtitle_x, subtitle_y))
-		for subtitle_surf in subtitle_surfaces:
-			subtitle_x = WIDTH // 2 - subtitle_surf.get_width() // 2
-			WIN.blit(subtitle_surf, (subtitle_x, current_y))
-			current_y += subtitle_surf.get_height() + spacing
-
-	pygame.display.update()
-
-def segments_intersect(p1, p2, p3, p4):
-	# Check if line segment p1->p2 intersects with line segment p3->p4
-	def ccw(A, B, C):
-		# Check if three points are in counter-clockwise order
-		return (C[1] - A[1]) * (B[0] - A[0]) > (B[1] - A[1]) * (C[0] - A[0])
-
-	# Two segments intersect if the endpoints of one segment are on opposite sides of the other segment
-	return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
-
-def check_trail_crossing(new_p1, new_p2, trail):
-	# Check if a new trail segment (new_p1 -> new_p2) crosses any existing trail segments
-	if len(trail) < 2:
-		return False
-
-	# Check against all consecutive segments in the trail
-	for i in range(len(trail) - 1):
-		trail_p1 = trail[i]
-		trail_p2 = trail[i + 1]
-
-		# Skip if checking against the immediate previous segment (would always intersect at endpoint)
-		if trail_p2 == new_p1:
-			continue
-
-		if segments_intersect(new_p1, new_p2, trail_p1, trail_p2):
-			return True
-
-	return False
-
-def check_collision(pos, trail1_set, trail2_set):
-	x, y = pos
-	if x < 0 or x >= WIDTH or y < 0 or y >= HEIGHT:
-		return True
-	if pos in trail1_set or pos in trail2_set:
-		return True
-	return False
-
-def check_rect_collision_with_trails(bike_rect, trail1, trail2):
-	"""Check if a bike's hitbox rectangle collides with any trail blocks.
+		pygame.draw.rect(box, color, (0, 0, box_width, box_height), 3)
 
-	Args:
-		bike_rect: pygame.Rect representing the bike's axis-aligned bounding box
-		trail1: list of (x, y) tuples representing trail blocks
-		trail2: list of (x, y) tuples representing trail blocks
+	# Draw the text centered inside the box (where it would be centered on the screen)
+	box_x = WIDTH // 2 - box_width // 2
+	current_y = padding_y
+	for surf in title_surfaces + subtitle_surfaces:
+		box.blit(surf, (WIDTH // 2 - surf.get_width() // 2 - box_x, current_y))
+		current_y += surf.get_height() + spacing
 
-	Returns:
-		True if collision detected, False otherwise
-	"""
-	# Check all trail blocks from both trails
-	for trail in [trail1, trail2]:
-		for trail_pos in trail:
-			# Create a rectangle for the trail block (BLOCK_SIZE x BLOCK_SIZE)
-			trail_rect = pygame.Rect(trail_pos[0], trail_pos[1], BLOCK_SIZE, BLOCK_SIZE)
+	return box
 
-			# Check if the bike's bounding box intersects the trail block
-			if bike_rect.colliderect(trail_rect):
-				return True
+def show_message(text, subtext="", color=WHITE):
+	# The box is only laid out and rendered again when something in it changes
+	key = (font, small_font, theme, text, subtext, tuple(color))
+	box = message_cache.get(key, lambda: render_message_box(text, subtext, color))
 
-	return False
+	# Position box centered on screen
+	WIN.blit(box, (WIDTH // 2 - box.get_width() // 2, HEIGHT // 2 - box.get_height() // 2))
 
 def rotated_rect_intersects_rect(center_x, center_y, width, height, angle_deg, rect):
 	"""Check if a rotated rectangle intersects an axis-aligned rectangle.
@@ -961,184 +866,8 @@ def rotated_rects_intersect(center1_x, center1_y, width1, height1, angle1_deg,
 
 	return True  # No separating axis found, rectangles intersect
 
-def check_mask_collision(bike1, bike2, sprite_w, back_margin=4):
-	"""Check if two bikes collide using pixel-perfect mask collision detection.
-
-	Args:
-		bike1: First Bike object
-		bike2: Second Bike object
-		sprite_w: Width of the sprite
-		back_margin: Margin from the back of the sprite (default 4)
-
-	Returns:
-		True if masks overlap, False otherwise
-	"""
-	import math
-
-	# Get direction vectors and magnitudes
-	dx1, dy1 = bike1.dir
-	mag1 = math.hypot(dx1, dy1)
-	dx2, dy2 = bike2.dir
-	mag2 = math.hypot(dx2, dy2)
-
-	if mag1 == 0 or mag2 == 0:
-		return False  # One or both bikes not moving
-
-	# Calculate rotation angles
-	rad1 = math.atan2(-dy1, dx1)
-	angle1_deg = math.degrees(rad1)
-	rad2 = math.atan2(-dy2, dx2)
-	angle2_deg = math.degrees(rad2)
-
-	# Calculate sprite centers for both bikes (matching blit_bike_with_front_at logic)
-	back_center_x1 = bike1.pos[0] + 2  # Center of 5x5 block
-	back_center_y1 = bike1.pos[1] + 2
-	back_center_x2 = bike2.pos[0] + 2
-	back_center_y2 = bike2.pos[1] + 2
-
-	# Calculate sprite center using rotated vector approach - same as blit function
-	# Bike 1
-	local_center1 = pygame.math.Vector2((sprite_w/2 - back_margin, 0))
-	rotated_center1 = local_center1.rotate(-angle1_deg)
-	center_x1 = back_center_x1 + rotated_center1.x
-	center_y1 = back_center_y1 + rotated_center1.y
-
-	# Bike 2
-	local_center2 = pygame.math.Vector2((sprite_w/2 - back_margin, 0))
-	rotated_center2 = local_center2.rotate(-angle2_deg)
-	center_x2 = back_center_x2 + rotated_center2.x
-	center_y2 = back_center_y2 + rotated_center2.y
-
-	# Rotate the masks
-	rotated_mask1 = pygame.mask.from_surface(pygame.transform.rotate(bike1.sprite, angle1_deg))
-	rotated_mask2 = pygame.mask.from_surface(pygame.transform.rotate(bike2.sprite, angle2_deg))
-
-	# Get the rotated sprite rectangles to calculate top-left positions
-	rotated_sprite1 = pygame.transform.rotate(bike1.sprite, angle1_deg)
-	rotated_sprite2 = pygame.transform.rotate(bike2.sprite, angle2_deg)
-
-	rect1 = rotated_sprite1.get_rect(center=(center_x1, center_y1))
-	rect2 = rotated_sprite2.get_rect(center=(center_x2, center_y2))
-
-	# Calculate offset between the two masks
-	offset = (int(rect2.left - rect1.left), int(rect2.top - rect1.top))
-
-	# Check if masks overlap
-	overlap = rotated_mask1.overlap(rotated_mask2, offset)
-
-	return overlap is not None
-
-def check_mask_collision_with_rect(bike, rect_x, rect_y, rect_width, rect_height, sprite_w, back_margin=4, test_pos=None):
-	"""Check if a bike's mask collides with a rectangular area (trail block or obstacle).
-
-	Args:
-		bike: Bike object with mask and position
-		rect_x, rect_y: Top-left position of the rectangle
-		rect_width, rect_height: Dimensions of the rectangle
-		sprite_w: Width of the bike sprite
-		back_margin: Margin from the back of the sprite (default 4)
-		test_pos: Optional (x, y) tuple for testing collision at a different position
-
-	Returns:
-		True if mask overlaps with rectangle, False otherwise
-	"""
-	import math
-
-	if bike.mask is None:
-		return False
-
-	# Get direction vectors and magnitudes
-	dx, dy = bike.dir
-	mag = math.hypot(dx, dy)
-
-	if mag == 0:
-		return False
-
-	# Calculate rotation angle
-	rad = math.atan2(-dy, dx)
-	angle_deg = math.degrees(rad)
-
-	# Use test position if provided, otherwise use bike's current position
-	if test_pos is not None:
-		pos_x, pos_y = test_pos
-	else:
-		pos_x, pos_y = bike.pos
-
-	# Calculate sprite center (matching blit_bike_with_front_at logic)
-	back_center_x = pos_x + 2  # Center of 5x5 block
-	back_center_y = pos_y + 2
-
-	# Vector from back to center (unrotated) - same as blit function
-	local_center = pygame.math.Vector2((sprite_w/2 - back_margin, 0))
-
-	# Rotate that vector - same as blit function
-	rotated_center = local_center.rotate(-angle_deg)
-
-	# Compute where the sprite's center should be - same as blit function
-	center_x = back_center_x + rotated_center.x
-	center_y = back_center_y + rotated_center.y
-
-	# Rotate the bike sprite and get its mask
-	rotated_sprite = pygame.transform.rotate(bike.sprite, angle_deg)
-	rotated_mask = pygame.mask.from_surface(rotated_sprite)
-
-	# Get the rotated sprite rectangle
-	bike_rect = rotated_sprite.get_rect(center=(center_x, center_y))
-
-	# Create a mask for the rectangle (solid filled mask)
-	rect_surface = pygame.Surface((rect_width, rect_height))
-	rect_surface.fill((255, 255, 255))  # Fill with white (opaque)
-	rect_mask = pygame.mask.from_surface(rect_surface)
-
-	# Calculate offset between the bike mask and rectangle mask
-	offset = (int(rect_x - bike_rect.left), int(rect_y - bike_rect.top))
-
-	# Normalize direction vector to determine bike orientation
-	nx, ny = dx / mag, dy / mag
-
-	# Check if bike is facing up or down (moving vertically)
-	if abs(ny) > abs(nx):
-		# The problem: when bikes face up/down and hit the SIDE of a trail,
-		# mask.overlap() only detects collision when the bike has penetrated
-		# all the way through to the FAR edge of the trail block (5 pixels).
-		#
-		# Solution: Check multiple offset positions to detect collision earlier.
-		# We check in a grid pattern to catch side collisions before penetration.
-
-		check_radius = 6  # Check within 6 pixels to detect collision at near edge
-
-		for dx_offset in range(-check_radius, check_radius + 1):
-			for dy_offset in range(-check_radius, check_radius + 1):
-				test_offset = (offset[0] + dx_offset, offset[1] + dy_offset)
-				if rotated_mask.overlap(rect_mask, test_offset) is not None:
-					return True
-
-		return False
-	else:
-		# Bike is facing left/right - use normal collision detection
-		# Check if masks overlap OR are adjacent (within 1 pixel)
-		overlap = rotated_mask.overlap(rect_mask, offset)
-		if overlap is not None:
-			return True
-
-		# Also check adjacent positions to prevent tunneling
-		adjacent_checks = [
-			(offset[0] - 1, offset[1]),     # Check 1 pixel left
-			(offset[0] + 1, offset[1]),     # Check 1 pixel right
-			(offset[0], offset[1] - 1),     # Check 1 pixel up
-			(offset[0], offset[1] + 1),     # Check 1 pixel down
-		]
-
-		for adj_offset in adjacent_checks:
-			if rotated_mask.overlap(rect_mask, adj_offset) is not None:
-				return True
-
-		return False
-
-def draw_bike_glow(bike, alpha=80):
-	"""Draw a faint oval glow underneath a bike."""
-	import math
-
+def draw_bike_glow(bike, alpha=80, interpolation=1.0):
+	"""Draw a faint oval glow underneath a bike (see Bike.get_render_pos for interpolation)."""
 	# Determine glow dimensions based on bike direction
 	dx, dy = bike.dir
 	if dx == 0 and dy == 0:
@@ -1151,59 +880,19 @@ def draw_bike_glow(bike, alpha=80):
 		# Moving vertically - elongate vertically
 		width, height = 12, 27
 
-	# Create a surface for the glow with per-pixel alpha
-	glow_surface = pygame.Surface((width * 2, height * 2), pygame.SRCALPHA)
-
-	# Draw multiple ellipses with decreasing alpha for a gradient effect
-	for i in range(3):
-		current_width = width - (i * 3)
-		current_height = height - (i * 3)
-		current_alpha = alpha - (i * 15)
-		if current_alpha < 0:
-			current_alpha = 0
-		if current_width > 0 and current_height > 0:
-			rect = pygame.Rect(width - current_width, height - current_height,
-			                   current_width * 2, current_height * 2)
-			pygame.draw.ellipse(glow_surface, (*bike.color, current_alpha), rect)
-
-	# Calculate the center of the bike sprite
-	if theme == "LEGACY" or theme == "ARES" or theme == "UPRISING":
-		sprite_width = legacy_width
-	elif theme == "82":
-		sprite_width = width_82
-	elif theme == "RECONFIGURED":
-		sprite_width = reconfigured_width
-
-	# Get direction magnitude for centering calculation
-	mag = math.hypot(dx, dy)
-
-	# bike.pos is the top-left of the trail block, so offset to center of 5x5 block
-	# BLOCK_SIZE is 5, so center is at +2 (accounting for 0-indexed pixels: 0,1,2,3,4 -> center at 2)
-	back_center_x = bike.pos[0] + 2
-	back_center_y = bike.pos[1] + 2
+	glow_surface = get_glow_surface(bike.color, width, height, alpha)
 
-	if mag > 0:
-		# Calculate center of sprite - same calculation as blit_bike_with_front_at
-		# This ensures the glow is centered exactly with the bike sprite
-		back_margin = 4
+	# Calculate the center of the bike sprite from the precomputed orientation
+	# This ensures the glow is centered exactly with the bike sprite
+	orientation = bike.get_orientation()
+	pos = bike.get_render_pos(interpolation)
 
-		# Calculate rotation angle
-		rad = math.atan2(-dy, dx)
-		angle_deg = math.degrees(rad)
-
-		# Vector from back to center (unrotated) - same as blit function
-		local_center = pygame.math.Vector2((sprite_width/2 - back_margin, 0))
-
-		# Rotate that vector - same as blit function
-		rotated_center = local_center.rotate(-angle_deg)
-
-		# Compute where the sprite's center should be - same as blit function
-		center_x = back_center_x + rotated_center.x
-		center_y = back_center_y + rotated_center.y
+	if orientation is not None:
+		center_x, center_y = orientation.get_center(pos)
 	else:
-		# Bike not moving, center on position
-		center_x = back_center_x
-		center_y = back_center_y
+		# Bike not moving, center on position (center of 5x5 trail block)
+		center_x = pos[0] + 2
+		center_y = pos[1] + 2
 
 	# Blit the glow centered on the bike's center
 	glow_x = center_x - width
@@ -1247,116 +936,111 @@ def get_bike_rect(bike, sprite_width, sprite_height, back_margin=4):
 
 	return rect
 
-def draw_sprites():
-	"""Render both bikes on the screen."""
-	player1.render(WIN, blit_bike_with_front_at, back_margin=4)
-	player2.render(WIN, blit_bike_with_front_at, back_margin=4)
+def draw_sprites(state, interpolation=1.0):
+	"""Render both bikes on the screen (see Bike.get_render_pos for interpolation)."""
+	state.player1.render(WIN, interpolation)
+	state.player2.render(WIN, interpolation)
 
-def draw_trails():
-	for point in player1.trail:
-		if theme == "RECONFIGURED":
-			pygame.draw.rect(WIN, GREEN, (*point, BLOCK_SIZE, BLOCK_SIZE))
-		else:
-			pygame.draw.rect(WIN, BLUE, (*point, BLOCK_SIZE, BLOCK_SIZE))
-	for point in player2.trail:
-		if theme == "ARES":
-			pygame.draw.rect(WIN, RED, (*point, BLOCK_SIZE, BLOCK_SIZE))
-		elif theme == "RECONFIGURED":
-			pygame.draw.rect(WIN, YELLOW, (*point, BLOCK_SIZE, BLOCK_SIZE))
-		else:
-			pygame.draw.rect(WIN, ORANGE, (*point, BLOCK_SIZE, BLOCK_SIZE))
+def update_trail_layer(state):
+	"""Draw the trail blocks added since the last frame onto the trail layer.
 
-def draw_debug_hitboxes():
+	Returns:
+		List of the rectangles drawn
+	"""
+	if theme == "RECONFIGURED":
+		colors = (GREEN, YELLOW)
+	elif theme == "ARES":
+		colors = (BLUE, RED)
+	else:
+		colors = (BLUE, ORANGE)
+	return trail_layer.update((state.player1, state.player2), colors)
+
+def draw_trails(state):
+	# Only blocks added since the last frame are drawn onto the trail layer
+	update_trail_layer(state)
+	trail_layer.draw(WIN)
+
+def get_bike_bounds(bike, interpolation=1.0):
+	"""Get a rectangle covering everything drawn for a bike (sprite and glow)."""
+	pos = bike.get_render_pos(interpolation)
+	orientation = bike.get_orientation()
+	# The glow is at most 54 pixels across, centered on the sprite (see draw_bike_glow)
+	glow = pygame.Rect(0, 0, 54, 54)
+	if orientation is not None:
+		rect = orientation.get_rect(pos)
+		glow.center = rect.center
+	else:
+		# Bike not moving yet: drawn facing right (see Bike.render) with its glow on its back
+		rect = bike.orientations[(1, 0)].get_rect(pos)
+		glow.center = (pos[0] + 2, pos[1] + 2)
+	# Leave a pixel or two for rounding of the interpolated position
+	return rect.union(glow).inflate(4, 4)
+
+def draw_round(state, interpolation=1.0):
+	"""Draw the arena, trails, obstacles, power-ups and bikes of the current round."""
+	WIN.fill(BLACK)
+	draw_tron_grid(WIN)
+	if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
+		draw_bike_glow(state.player1, interpolation=interpolation)
+		draw_bike_glow(state.player2, interpolation=interpolation)
+	draw_trails(state)
+	draw_obstacles(state)
+	draw_powerups(state)
+	draw_sprites(state, interpolation)
+
+def draw_debug_hitboxes(state):
 	"""Draw debug visualization showing pixel-perfect mask-based hitboxes."""
-	import math
-
-	if theme == "LEGACY" or theme == "ARES" or theme == "UPRISING":
-		sprite_width = legacy_width
-		sprite_height = legacy_height
-	elif theme == "RECONFIGURED":
-		sprite_width = reconfigured_width
-		sprite_height = reconfigured_height
-	elif theme == "82":
-		sprite_width = width_82
-		sprite_height = height_82
-
-	back_margin = 4  # Same as used in blit_bike_with_front_at
-
 	def draw_bike_mask_hitbox(bike, color):
 		"""Draw the actual mask outline for a single bike."""
 		if bike.mask is None:
 			return
 
-		pos_x, pos_y = bike.pos
-		dir_x, dir_y = bike.dir
-
-		# Calculate rotation angle
-		rad = math.atan2(-dir_y, dir_x)
-		angle_deg = math.degrees(rad)
-
-		# Back center (center of 5x5 trail block)
-		back_center_x = pos_x + 2
-		back_center_y = pos_y + 2
-
-		# Calculate sprite center using the SAME logic as blit_bike_with_front_at
-		# Vector from back to center (unrotated) - same as blit function
-		local_center = pygame.math.Vector2((sprite_width/2 - back_margin, 0))
-
-		# Rotate that vector - same as blit function
-		rotated_center = local_center.rotate(-angle_deg)
-
-		# Compute where the sprite's center should be - same as blit function
-		center_x = back_center_x + rotated_center.x
-		center_y = back_center_y + rotated_center.y
-
-		# Rotate the sprite to get the rotated mask
-		rotated_sprite = pygame.transform.rotate(bike.sprite, angle_deg)
-		rotated_mask = pygame.mask.from_surface(rotated_sprite)
-
-		# Get the rotated sprite rectangle
-		rect = rotated_sprite.get_rect(center=(center_x, center_y))
+		# Precomputed rotated mask outline for the bike's direction
+		orientation = bike.get_orientation()
+		if orientation is None:
+			return
 
-		# Get the outline of the mask (list of points)
-		try:
-			outline = rotated_mask.outline()
+		# Get the rotated sprite rectangle (same placement as blit_bike_with_front_at)
+		rect = orientation.get_rect(bike.pos)
 
-			# Draw the outline
-			if len(outline) > 1:
-				# Convert mask-local coordinates to screen coordinates
-				screen_points = [(rect.left + x, rect.top + y) for x, y in outline]
+		# Draw the outline
+		if len(orientation.outline) > 1:
+			# Convert mask-local coordinates to screen coordinates
+			screen_points = [(rect.left + x, rect.top + y) for x, y in orientation.outline]
 
-				# Draw the outline as a polygon
-				pygame.draw.polygon(WIN, color, screen_points, 2)
-		except:
-			# If outline fails (e.g., empty mask), draw a small marker at the center
+			# Draw the outline as a polygon
+			pygame.draw.polygon(WIN, color, screen_points, 2)
+		else:
+			# If the mask is empty, draw a small marker at the center
+			center_x, center_y = orientation.get_center(bike.pos)
 			pygame.draw.circle(WIN, color, (int(center_x), int(center_y)), 3, 1)
 
 	# Player 1 hitboxes
 	if theme == "RECONFIGURED":
-		draw_bike_mask_hitbox(player1, (0, 255, 100))  # Bright green outline
+		draw_bike_mask_hitbox(state.player1, (0, 255, 100))  # Bright green outline
 	else:
-		draw_bike_mask_hitbox(player1, (0, 255, 255))  # Cyan outline
+		draw_bike_mask_hitbox(state.player1, (0, 255, 255))  # Cyan outline
 
 	# Player 2 hitboxes
 	if theme == "ARES":
-		draw_bike_mask_hitbox(player2, (255, 50, 50))  # Bright red outline
+		draw_bike_mask_hitbox(state.player2, (255, 50, 50))  # Bright red outline
 	elif theme == "RECONFIGURED":
-		draw_bike_mask_hitbox(player2, (255, 255, 0))  # Yellow outline
+		draw_bike_mask_hitbox(state.player2, (255, 255, 0))  # Yellow outline
 	else:
-		draw_bike_mask_hitbox(player2, (255, 180, 0))  # Orange outline
+		draw_bike_mask_hitbox(state.player2, (255, 180, 0))  # Orange outline
 
-def draw_scoreboard():
+def draw_scoreboard(state):
 	if theme == "RECONFIGURED":
-		p1_text = small_font.render(f"Green: {p1_wins}", True, GREEN)
+		p1_text = render_text(small_font, f"Green: {state.p1_wins}", GREEN)
 	else:
-		p1_text = small_font.render(f"Blue: {p1_wins}", True, BLUE)
+		p1_text = render_text(small_font, f"Blue: {state.p1_wins}", BLUE)
 
 	if theme == "ARES":
-		p2_text = small_font.render(f"Red: {p2_wins}", True, RED)
+		p2_text = render_text(small_font, f"Red: {state.p2_wins}", RED)
 	elif theme == "RECONFIGURED":
-		p2_text = small_font.render(f"Yellow: {p2_wins}", True, YELLOW)
+		p2_text = render_text(small_font, f"Yellow: {state.p2_wins}", YELLOW)
 	else:
-		p2_text = small_font.render(f"Orange: {p2_wins}", True, ORANGE)
+		p2_text = render_text(small_font, f"Orange: {state.p2_wins}", ORANGE)
 
 	# Space them evenly at the top center
 	total_width = p1_text.get_width() + p2_text.get_width() + 50
@@ -1365,156 +1049,90 @@ def draw_scoreboard():
 	WIN.blit(p1_text, (start_x, 10))
 	WIN.blit(p2_text, (start_x + p1_text.get_width() + 50, 10))
 
-def reset_game():
-	"""Reset the game for a new round."""
-	global game_over, game_time_offset, last_powerup_spawn, player1, player2
-
+def create_bikes(state):
+	"""Build the current theme's bikes for a GameState."""
 	if theme == "LEGACY" or theme == "UPRISING":
-		player1 = Bike(blue_legacy_sprite, BLUE, "Blue", blue_legacy_mask)
-		player2 = Bike(orange_legacy_sprite, ORANGE, "Orange", orange_legacy_mask)
+		state.player1 = Bike(blue_legacy_sprite, BLUE, "Blue", blue_legacy_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
+		state.player2 = Bike(orange_legacy_sprite, ORANGE, "Orange", orange_legacy_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
 	elif theme == "ARES":
-		player1 = Bike(blue_legacy_sprite, BLUE, "Blue", blue_legacy_mask)
-		player2 = Bike(red_ares_sprite, RED, "Red", red_ares_mask)
+		state.player1 = Bike(blue_legacy_sprite, BLUE, "Blue", blue_legacy_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
+		state.player2 = Bike(red_ares_sprite, RED, "Red", red_ares_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
 	elif theme == "82":
-		player1 = Bike(blue_82_sprite, BLUE, "Blue", blue_82_mask)
-		player2 = Bike(orange_82_sprite, ORANGE, "Orange", orange_82_mask)
+		state.player1 = Bike(blue_82_sprite, BLUE, "Blue", blue_82_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
+		state.player2 = Bike(orange_82_sprite, ORANGE, "Orange", orange_82_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
 	elif theme == "RECONFIGURED":
-		player1 = Bike(green_reconfigured_sprite, GREEN, "Green", green_reconfigured_mask)
-		player2 = Bike(yellow_reconfigured_sprite, YELLOW, "Yellow", yellow_reconfigured_mask)
+		state.player1 = Bike(green_reconfigured_sprite, GREEN, "Green", green_reconfigured_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
+		state.player2 = Bike(yellow_reconfigured_sprite, YELLOW, "Yellow", yellow_reconfigured_mask, (WIDTH, HEIGHT), BLOCK_SIZE)
 
-	reset_sprites()
-	clear_powerups()
-	generate_obstacles()
+	state.theme = theme
 
-	game_over = False
+def reset_game(state):
+	"""Reset the game for a new round."""
+	if state.theme != theme:
+		clear_render_caches()
+	create_bikes(state)
+	state.speed = SPEED
+	state.reset_round()
+	if replay_recorder is not None:
+		replay_recorder.start_round(state)
 
 	# Redraw background clean
 	WIN.fill(BLACK)
 	pygame.display.update()
 
-	countdown()
-	game_time_offset = pygame.time.get_ticks()
-	last_powerup_spawn = 0
-
-def generate_obstacles():
-	"""Generate random obstacles avoiding player positions."""
-	global obstacles
-	obstacles = []
-
-	NUM_OBSTACLES = random.randint(10, 15)
-	MAX_ATTEMPTS = 100  # Avoid infinite loops
+	countdown(state)
 
-	while len(obstacles) < NUM_OBSTACLES:
-		attempt = 0
-		while attempt < MAX_ATTEMPTS:
-			size = random.randint(30, 60)
-			x = random.randrange(0, WIDTH - size, OBSTACLE_SIZE)
-			y = random.randrange(0, HEIGHT - size, OBSTACLE_SIZE)
+def save_match(state, path):
+	"""Save the match in progress so it can be continued with resume_match()."""
+	with open(path, "wb") as file:
+		file.write(bytes([single_player]) + save_state(state))
 
-			# Create temp obstacle to check for collisions
-			temp_obstacle = Obstacle(x, y, size)
+def resume_match(state, path):
+	"""Continue a match saved with save_match()."""
+	global theme, single_player, SPEED
 
-			# Avoid spawning near players (150 pixel margin)
-			if temp_obstacle.is_near_position(player1.pos, 150) or \
-			   temp_obstacle.is_near_position(player2.pos, 150):
-				attempt += 1
-				continue
+	with open(path, "rb") as file:
+		data = file.read()
+	single_player = bool(data[0])
+	snapshot = data[1:]
 
-			# Check for overlap with existing obstacles
-			overlap = any(temp_obstacle.overlaps_with(obs) for obs in obstacles)
+	theme = get_snapshot_theme(snapshot)
+	set_theme_fonts()
+	clear_render_caches()
+	create_bikes(state)
+	load_state(state, snapshot)
+	SPEED = state.speed
 
-			if not overlap:
-				obstacles.append(temp_obstacle)
-				break
+	# Redraw background clean
+	WIN.fill(BLACK)
+	pygame.display.update()
 
-			attempt += 1
+	countdown(state)
 
-		# If we exceeded attempts, just skip this obstacle
-		if attempt >= MAX_ATTEMPTS:
-			break
-
-def draw_obstacles():
+def draw_obstacles(state):
 	"""Render all obstacles on the screen."""
-	for obstacle in obstacles:
+	for obstacle in state.obstacles:
 		obstacle.render(WIN, theme)
 
-def spawn_powerup():
-	"""Spawn a new random power-up not overlapping obstacles or trails."""
-	global powerups
-	ptype = random.choice(PowerUp.TYPES)
-	size = POWERUP_SIZE
-
-	for _ in range(30):  # try 30 times
-		x = random.randrange(0, WIDTH - size, POWERUP_SIZE)
-		y = random.randrange(0, HEIGHT - size, POWERUP_SIZE)
-
-		# Avoid obstacles
-		overlap = any(obs.contains_point(x, y) for obs in obstacles)
-
-		# Avoid trails - check if powerup overlaps with any trail positions
-		if not overlap:
-			for trail_pos in player1.trail + player2.trail:
-				tx, ty = trail_pos
-				# Check if powerup rectangle overlaps with trail block
-				if (x < tx + BLOCK_SIZE and x + size > tx and
-				    y < ty + BLOCK_SIZE and y + size > ty):
-					overlap = True
-					break
-
-		if not overlap:
-			powerups.append(PowerUp(x, y, size, ptype, theme))
-			break
-
-def draw_powerups():
+def draw_powerups(state):
 	"""Render all power-ups on the screen."""
-	for powerup in powerups:
+	for powerup in state.powerups:
 		powerup.render(WIN, theme)
 
-def clear_powerups():
-	"""Remove all power-ups from the board."""
-	global powerups
-	powerups.clear()
-
-def check_powerup_collision(pos, bike, current_time):
-	"""Check if a bike hits a power-up and apply effect."""
-	global powerups
-
-	for pu in powerups[:]:
-		if pu.contains_point(pos[0], pos[1]):
-			pu.apply_effect(bike, current_time)
-			powerups.remove(pu)
-
-def check_trail_powerup_collisions(current_time):
-	"""Check if any trails cross over power-ups."""
-	global powerups
-
-	for pu in powerups[:]:
-		# Check if player1's trail crosses this power-up
-		for trail_pos in player1.trail:
-			tx, ty = trail_pos
-			# Check if trail block overlaps with power-up
-			if (tx < pu.x + pu.size and tx + BLOCK_SIZE > pu.x and
-			    ty < pu.y + pu.size and ty + BLOCK_SIZE > pu.y):
-				pu.apply_effect(player1, current_time)
-				powerups.remove(pu)
-				break
-
-		# Check if still exists (might have been removed by player1)
-		if pu not in powerups:
-			continue
+def start_phase(phase, duration=0):
+	"""Switch run_game to another screen (see round_phase), lasting duration milliseconds if it is timed."""
+	global round_phase, phase_start, phase_end
+	round_phase = phase
+	phase_start = pygame.time.get_ticks()
+	phase_end = phase_start + duration
 
-		# Check if player2's trail crosses this power-up
-		for trail_pos in player2.trail:
-			tx, ty = trail_pos
-			# Check if trail block overlaps with power-up
-			if (tx < pu.x + pu.size and tx + BLOCK_SIZE > pu.x and
-			    ty < pu.y + pu.size and ty + BLOCK_SIZE > pu.y):
-				pu.apply_effect(player2, current_time)
-				powerups.remove(pu)
-				break
-
-def countdown():
-	global current_track
+def phase_time_left():
+	"""Get the milliseconds left before a timed screen ends."""
+	return phase_end - pygame.time.get_ticks()
+
+def countdown(state):
+	"""Start the countdown to a round, which run_game shows before starting the round."""
+	global current_track, countdown_shown
 
 	if theme == "ARES":
 		if init.exists():
@@ -1551,57 +1169,63 @@ def countdown():
 			pygame.mixer.music.play(-1)
 			pygame.mixer.music.set_volume(1)
 			current_track = str(tesler_throwdown)
-	for i in range(3, 0, -1):
-		WIN.fill(BLACK)
-		draw_tron_grid(WIN)
-		if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-			draw_bike_glow(player1)
-			draw_bike_glow(player2)
-		draw_obstacles()
-		draw_powerups()
-		draw_sprites()
-		if show_debug_hitboxes:
-			draw_debug_hitboxes()
-		draw_scoreboard()
-		if theme == "ARES":
-			show_message(str(i), "", DARKER_RED)
-		elif theme == "LEGACY":
-			show_message(str(i), "", DARKER_BLUE)
-		elif theme == "82":
-			show_message(str(i), "", LIGHT_GRAY)
-		elif theme == "RECONFIGURED":
-			show_message(str(i), "", GREEN)
-		elif theme == "UPRISING":
-			show_message(str(i), "", DARKER_BLUE)
-		pygame.display.update()
-		pygame.time.delay(1000)
+	start_phase("countdown", 3 * COUNTDOWN_STEP + COUNTDOWN_GO_TIME)
+	countdown_shown = None
 
-	# Flash "GO!"
-	WIN.fill(BLACK)
-	draw_tron_grid(WIN)
-	if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-		draw_bike_glow(player1)
-		draw_bike_glow(player2)
-	draw_obstacles()
-	draw_powerups()
-	draw_sprites()
+def draw_countdown(state, label):
+	"""Draw the arena before a round with the countdown's label over it."""
+	# The trails are drawn too, since a resumed match starts its countdown with them laid
+	draw_round(state)
 	if show_debug_hitboxes:
-		draw_debug_hitboxes()
-	draw_scoreboard()
+		draw_debug_hitboxes(state)
+	draw_scoreboard(state)
 	if theme == "ARES":
-		show_message("GO!", "", DARKER_RED)
+		show_message(label, "", DARKER_RED)
 	elif theme == "LEGACY":
-		show_message("GO!", "", DARKER_BLUE)
+		show_message(label, "", DARKER_BLUE)
 	elif theme == "82":
-		show_message("GO!", "", LIGHT_GRAY)
+		show_message(label, "", LIGHT_GRAY)
 	elif theme == "RECONFIGURED":
-		show_message("GO!", "", GREEN)
+		show_message(label, "", GREEN)
 	elif theme == "UPRISING":
-		show_message("GO!", "", DARKER_BLUE)
+		show_message(label, "", DARKER_BLUE)
 	pygame.display.update()
-	pygame.time.delay(800)
+
+def update_countdown(state):
+	"""Show the countdown's current label ("3", "2", "1", then "GO!") and start the round when it ends.
+
+	Returns:
+		Milliseconds until the countdown next changes
+	"""
+	global countdown_shown
+
+	time_left = phase_time_left()
+	if time_left <= 0:
+		start_round_music()
+		start_phase("round")
+		return 0
+
+	elapsed = pygame.time.get_ticks() - phase_start
+	if elapsed < 3 * COUNTDOWN_STEP:
+		label = str(3 - elapsed // COUNTDOWN_STEP)
+		next_change = COUNTDOWN_STEP - elapsed % COUNTDOWN_STEP
+	else:
+		label = "GO!"
+		next_change = time_left
+
+	if label != countdown_shown:
+		draw_countdown(state, label)
+		if countdown_shown is None:
+			# The first number is up, so use the wait to get the round's first frame ready
+			warm_render_caches(state)
+		countdown_shown = label
+	return next_change
+
+def start_round_music():
+	"""Switch from the countdown music to a track for the round."""
+	global current_track
 	if theme == "ARES":
-		game_song = random.choice(game_music_ares)
+		game_song = ui_rng.choice(game_music_ares)
 		selected_song = str(game_song)
 		pygame.mixer.music.stop()
 		pygame.mixer.music.load(selected_song)
@@ -1616,7 +1240,7 @@ def countdown():
 			pygame.mixer.music.set_volume(1)
 			current_track = str(ring_game_and_escape2)
 	elif theme == "LEGACY":
-		game_song = random.choice(game_music_legacy)
+		game_song = ui_rng.choice(game_music_legacy)
 		selected_song = str(game_song)
 		pygame.mixer.music.stop()
 		pygame.mixer.music.load(selected_song)
@@ -1624,7 +1248,7 @@ def countdown():
 		pygame.mixer.music.set_volume(1)
 		current_track = selected_song
 	elif theme == "RECONFIGURED":
-		game_song = random.choice(game_music_reconfigured)
+		game_song = ui_rng.choice(game_music_reconfigured)
 		selected_song = str(game_song)
 		pygame.mixer.music.stop()
 		pygame.mixer.music.load(selected_song)
@@ -1632,7 +1256,7 @@ def countdown():
 		pygame.mixer.music.set_volume(1)
 		current_track = selected_song
 	elif theme == "UPRISING":
-		game_song = random.choice(game_music_uprising)
+		game_song = ui_rng.choice(game_music_uprising)
 		selected_song = str(game_song)
 		pygame.mixer.music.stop()
 		pygame.mixer.music.load(selected_song)
@@ -1640,8 +1264,8 @@ def countdown():
 		pygame.mixer.music.set_volume(1)
 		current_track = selected_song
 
-def p1_win():
-	global game_over, match_over, win_color, win_text, p1_wins, current_track
+def derezz(state):
+	"""Play the derezz sound and start the pause on the crash before the round's result is shown."""
 	if theme == "82":
 		if derezzed_sound_82_file.exists():
 			pygame.mixer.music.stop()
@@ -1652,37 +1276,20 @@ def p1_win():
 			pygame.mixer.music.stop()
 			derezz_channel.play(derezzed_sound)
 
-	game_over = True
-
-	# --- Draw final collision frame before pausing ---
-	WIN.fill(BLACK)
-	draw_tron_grid(WIN)
-	if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-		draw_bike_glow(player1)
-		draw_bike_glow(player2)
-	draw_trails()
-	draw_obstacles()
-	draw_powerups()
-	draw_sprites()
-	if show_debug_hitboxes:
-		draw_debug_hitboxes()
-	draw_scoreboard()
-	pygame.display.update()
-
 	# Small pause to show the collision frame
 	if theme == "82":
-		pygame.time.delay(2600)
+		start_phase("derezz", 2600)
 	else:
-		pygame.time.delay(1800)
+		start_phase("derezz", 1800)
 
-	p1_wins += 1
+def p1_win(state):
+	global win_color, win_text, current_track
 	if theme == "RECONFIGURED":
 		win_color = GREEN
 	else:
 		win_color = BLUE
 	# Check for match victory
-	if p1_wins >= MAX_SCORE:
-		match_over = True
+	if state.match_over:
 		if theme == "RECONFIGURED":
 			win_text = "TEAM GREEN WINS THE MATCH!"
 		else:
@@ -1753,42 +1360,8 @@ def p1_win():
 				pygame.mixer.music.set_volume(1)
 				current_track = str(renegades_pledge)
 
-def p2_win():
-	global game_over, match_over, win_color, win_text, p2_wins, current_track
-	if theme == "82":
-		if derezzed_sound_82_file.exists():
-			pygame.mixer.music.stop()
-			turn_channel.stop()
-			derezz_channel.play(derezzed_sound_82)
-	else:
-		if derezzed_sound_file.exists():
-			pygame.mixer.music.stop()
-			derezz_channel.play(derezzed_sound)
-
-	game_over = True
-
-	# --- Draw final collision frame before pausing ---
-	WIN.fill(BLACK)
-	draw_tron_grid(WIN)
-	if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-		draw_bike_glow(player1)
-		draw_bike_glow(player2)
-	draw_trails()
-	draw_obstacles()
-	draw_powerups()
-	draw_sprites()
-	if show_debug_hitboxes:
-		draw_debug_hitboxes()
-	draw_scoreboard()
-	pygame.display.update()
-
-	# Small pause to show the collision frame
-	if theme == "82":
-		pygame.time.delay(2600)
-	else:
-		pygame.time.delay(1800)
-
-	p2_wins += 1
+def p2_win(state):
+	global win_color, win_text, current_track
 	if theme == "ARES":
 		win_color = RED
 	elif theme == "RECONFIGURED":
@@ -1796,8 +1369,7 @@ def p2_win():
 	else:
 		win_color = ORANGE
 	# Check for match victory
-	if p2_wins >= MAX_SCORE:
-		match_over = True
+	if state.match_over:
 		if theme == "ARES":
 			win_text = "TEAM RED WINS THE MATCH!"
 		elif theme == "RECONFIGURED":
@@ -1936,820 +1508,302 @@ def p2_win():
 					pygame.mixer.music.set_volume(1)
 					current_track = str(renegades_pledge)
 
-def ai_control(current_game_time):
-	"""AI for p2 bike that avoids collisions and seeks power-ups."""
-	# Check turn cooldown
-	if not player2.can_turn(current_game_time, turn_cooldown):
-		return
-
-	# Emergency wall avoidance - check if AI is dangerously close to any wall
-	WALL_DANGER_ZONE = 60  # Distance from wall that triggers emergency turn (reduced to make AI more aggressive)
-	pos_x, pos_y = player2.pos
-	dir_x, dir_y = player2.dir
-
-	# Check if heading toward a wall and too close
-	if dir_x > 0 and pos_x > 900 - WALL_DANGER_ZONE:  # Heading right toward right wall
-		# Turn up or down
-		new_dir = dirs["DOWN"] if pos_y < 450 else dirs["UP"]
-		if not player2.is_zigzag(new_dir, dirs, current_game_time):
-			player2.last_turn_direction = player2.dir
-			player2.dir = new_dir
-			player2.last_turn_time = current_game_time
-		return
-	elif dir_x < 0 and pos_x < WALL_DANGER_ZONE:  # Heading left toward left wall
-		# Turn up or down
-		new_dir = dirs["DOWN"] if pos_y < 450 else dirs["UP"]
-		if not player2.is_zigzag(new_dir, dirs, current_game_time):
-			player2.last_turn_direction = player2.dir
-			player2.dir = new_dir
-			player2.last_turn_time = current_game_time
-		return
-	elif dir_y > 0 and pos_y > 900 - WALL_DANGER_ZONE:  # Heading down toward bottom wall
-		# Turn left or right
-		new_dir = dirs["RIGHT"] if pos_x < 450 else dirs["LEFT"]
-		if not player2.is_zigzag(new_dir, dirs, current_game_time):
-			player2.last_turn_direction = player2.dir
-			player2.dir = new_dir
-			player2.last_turn_time = current_game_time
-		return
-	elif dir_y < 0 and pos_y < WALL_DANGER_ZONE:  # Heading up toward top wall
-		# Turn left or right
-		new_dir = dirs["RIGHT"] if pos_x < 450 else dirs["LEFT"]
-		if not player2.is_zigzag(new_dir, dirs, current_game_time):
-			player2.last_turn_direction = player2.dir
-			player2.dir = new_dir
-			player2.last_turn_time = current_game_time
-		return
-
-	possible_dirs = [dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]]
-
-	def will_collide(pos, dir_vec, steps=20):
-		"""Predict if moving forward will cause a collision using simplified hitbox detection."""
-		# Get sprite dimensions based on theme
-		if theme == "LEGACY" or theme == "ARES" or theme == "UPRISING":
-			sprite_w = legacy_width
-			sprite_h = legacy_height
-		elif theme == "RECONFIGURED":
-			sprite_w = reconfigured_width
-			sprite_h = reconfigured_height
-		elif theme == "82":
-			sprite_w = width_82
-			sprite_h = height_82
-
-		back_margin = 4
-		# Calculate rotation angle for the test direction
-		mag = math.hypot(dir_vec[0], dir_vec[1])
-		if mag == 0:
-			return True
-
-		# Use a simplified rectangular hitbox check instead of full rotated rectangle
-		# This is much faster and still reasonably accurate for AI purposes
-		front_length = sprite_w - back_margin
-		nx_norm, ny_norm = dir_vec[0] / mag, dir_vec[1] / mag
-
-		# Define a safety margin around the bike
-		# Increased from 0.15 to 0.25, and adding extra margin for walls
-		safety_margin = sprite_w * 0.25
-		wall_margin = 100  # Large fixed margin for wall detection to ensure AI turns away from edges early
-
-		# Look ahead specified steps with larger step size for performance
-		step_increment = max(1, SPEED)  # Check every SPEED pixels instead of every pixel
-		for i in range(step_increment, steps * SPEED + 1, step_increment):
-			# Calculate test position
-			test_pos_x = pos[0] + nx_norm * i
-			test_pos_y = pos[1] + ny_norm * i
-
-			# Check wall collisions with margin
-			fx = test_pos_x + nx_norm * front_length
-			fy = test_pos_y + ny_norm * front_length
-			if fx < wall_margin or fx >= WIDTH - wall_margin or fy < wall_margin or fy >= HEIGHT - wall_margin:
-				return True
-
-			# Check for head-on collision with player1
-			# Calculate player1's position and direction
-			p1_x, p1_y = player1.pos
-			p1_dx, p1_dy = player1.dir
-			p1_mag = math.hypot(p1_dx, p1_dy)
-
-			if p1_mag > 0:
-				# Normalize player1's direction
-				p1_nx, p1_ny = p1_dx / p1_mag, p1_dy / p1_mag
-
-				# Check if player1 is moving toward us (opposite directions)
-				# Dot product of normalized directions: -1 means exactly opposite, < -0.7 means roughly opposite
-				dot_product = nx_norm * p1_nx + ny_norm * p1_ny
-
-				if dot_product < -0.7:  # Bikes are moving toward each other
-					# Check if player1 is in front of us
-					dist_to_p1 = math.hypot(test_pos_x - p1_x, test_pos_y - p1_y)
-					if dist_to_p1 < sprite_w * 3:  # Within 3 bike lengths
-						return True
-
-			# Check trail collisions using a simple radius check (much faster)
-			# Skip only the very recent trail to avoid false positives with the tail
-			TRAIL_SAFETY_MARGIN = 5  # Only skip the last 5 positions to avoid immediate tail collision
-			test_point = (int(test_pos_x), int(test_pos_y))
-
-			# Quick check: is the test point near any trail?
-			for trail_pos in player1.trail:
-				distance = abs(test_pos_x - trail_pos[0]) + abs(test_pos_y - trail_pos[1])  # Manhattan distance
-				if distance < safety_margin:
-					return True
-
-			# Check own trail with safety margin
-			own_trail_to_check = player2.trail[:-TRAIL_SAFETY_MARGIN] if len(player2.trail) > TRAIL_SAFETY_MARGIN else []
-			for trail_pos in own_trail_to_check:
-				distance = abs(test_pos_x - trail_pos[0]) + abs(test_pos_y - trail_pos[1])
-				if distance < safety_margin:
-					return True
-
-			# Check obstacle collisions with margin
-			for obs in obstacles:
-				# Simple AABB check with margin
-				if (test_pos_x - safety_margin < obs.x + obs.size and
-					test_pos_x + safety_margin > obs.x and
-					test_pos_y - safety_margin < obs.y + obs.size and
-					test_pos_y + safety_margin > obs.y):
-					return True
-
-		return False
-
-	def get_direction_to_powerup(bike_pos, powerup):
-		"""Calculate which direction moves toward a power-up."""
-		bx, by = bike_pos
-		px, py = powerup.x + powerup.size // 2, powerup.y + powerup.size // 2
-
-		dx = px - bx
-		dy = py - by
-
-		# Determine primary and secondary directions
-		directions = []
-		if abs(dx) > abs(dy):
-			# Horizontal movement is more important
-			if dx > 0:
-				directions.append(dirs["RIGHT"])
-			else:
-				directions.append(dirs["LEFT"])
-			if dy > 0:
-				directions.append(dirs["DOWN"])
-			elif dy < 0:
-				directions.append(dirs["UP"])
-		else:
-			# Vertical movement is more important
-			if dy > 0:
-				directions.append(dirs["DOWN"])
-			else:
-				directions.append(dirs["UP"])
-			if dx > 0:
-				directions.append(dirs["RIGHT"])
-			elif dx < 0:
-				directions.append(dirs["LEFT"])
-
-		return directions
-
-	def is_powerup_reachable(bike_pos, powerup):
-		"""Check if power-up is reachable by testing if we can get closer to it."""
-		target_dirs = get_direction_to_powerup(bike_pos, powerup)
-
-		# Check if ANY of the directions toward the power-up are safe
-		for target_dir in target_dirs:
-			# Don't turn 180 degrees from current direction
-			if (player2.dir == dirs["UP"] and target_dir == dirs["DOWN"]) or \
-			   (player2.dir == dirs["DOWN"] and target_dir == dirs["UP"]) or \
-			   (player2.dir == dirs["LEFT"] and target_dir == dirs["RIGHT"]) or \
-			   (player2.dir == dirs["RIGHT"] and target_dir == dirs["LEFT"]):
-				continue
-
-			# If this direction is safe, power-up is potentially reachable
-			if not will_collide(bike_pos, target_dir, steps=15):
-				return True
-
-		# No safe route found toward the power-up
-		return False
-
-	# Find nearest power-up
-	nearest_powerup = None
-	min_distance = float('inf')
-	if powerups:
-		for powerup in powerups:
-			px, py = powerup.x + powerup.size // 2, powerup.y + powerup.size // 2
-			distance = math.hypot(px - player2.pos[0], py - player2.pos[1])
-			if distance < min_distance:
-				min_distance = distance
-				nearest_powerup = powerup
-
-	# Try to move toward power-up if one exists, is reasonably close, AND is reachable
-	if nearest_powerup and min_distance < 300 and is_powerup_reachable(player2.pos, nearest_powerup):
-		target_dirs = get_direction_to_powerup(player2.pos, nearest_powerup)
-
-		# Check if we can safely move toward the power-up
-		for target_dir in target_dirs:
-			# Don't turn 180 degrees
-			if (player2.dir == dirs["UP"] and target_dir == dirs["DOWN"]) or \
-			   (player2.dir == dirs["DOWN"] and target_dir == dirs["UP"]) or \
-			   (player2.dir == dirs["LEFT"] and target_dir == dirs["RIGHT"]) or \
-			   (player2.dir == dirs["RIGHT"] and target_dir == dirs["LEFT"]):
-				continue
-
-			# Check if this direction is safe and not a zigzag
-			if not will_collide(player2.pos, target_dir, steps=15):# and not player2.is_zigzag(target_dir, dirs, current_game_time):
-				player2.last_turn_direction = player2.dir
-				player2.dir = target_dir
-				player2.last_turn_time = current_game_time
-				return
-
-	# If current direction is safe, keep going
-	if not will_collide(player2.pos, player2.dir):
-		return
-
-	# Otherwise, pick the safest turn (evaluate all safe directions)
-	def evaluate_direction_safety(direction, max_steps=50):
-		"""Calculate how many steps the AI can safely move in a direction."""
-		# Use the will_collide function to test different lookahead distances
-		# Binary search to find the maximum safe distance
-		low, high = 0, max_steps
-		safe_steps = 0
-
-		while low <= high:
-			mid = (low + high) // 2
-			if not will_collide(player2.pos, direction, steps=mid):
-				safe_steps = mid
-				low = mid + 1
-			else:
-				high = mid - 1
-
-		return safe_steps
-
-	safe_dirs = [d for d in possible_dirs if not will_collide(player2.pos, d)]
-
-	# Filter out 180-degree turns
-	safe_dirs = [d for d in safe_dirs if not (
-		(player2.dir == dirs["UP"] and d == dirs["DOWN"]) or
-		(player2.dir == dirs["DOWN"] and d == dirs["UP"]) or
-		(player2.dir == dirs["LEFT"] and d == dirs["RIGHT"]) or
-		(player2.dir == dirs["RIGHT"] and d == dirs["LEFT"])
-	)]
-
-	if safe_dirs:
-		# Evaluate safety of each direction and pick the safest
-		best_dir = None
-		best_safety = -1
-
-		for direction in safe_dirs:
-			safety = evaluate_direction_safety(direction)
-			if safety > best_safety:
-				best_safety = safety
-				best_dir = direction
-
-		if best_dir:# and not player2.is_zigzag(best_dir, dirs, current_game_time):
-			player2.last_turn_direction = player2.dir
-			player2.dir = best_dir
-			player2.last_turn_time = current_game_time
-
-def step_move_player(bike, other_bike, effective_speed, sprite_width, sprite_height, back_margin=4):
-	"""Move a bike and check for collisions using pixel-perfect mask collision detection."""
-	if effective_speed <= 0:
-		return False
-
-	# Normalize direction vector
-	mag = math.hypot(bike.dir[0], bike.dir[1])
-	if mag == 0:
-		return False
-	nx, ny = bike.dir[0] / mag, bike.dir[1] / mag
-
-	# front offset from back
-	front_length = sprite_width - back_margin
-
-	# Skip the last few trail blocks to avoid self-collision with recent trail
-	# At SPEED=5 and 60 FPS, the bike moves 5 pixels per frame
-	# The bike sprite is ~20-40 pixels long, so we need to skip enough blocks
-	# to clear the bike's entire length plus turning radius
-	TRAIL_SAFETY_MARGIN = 50  # Number of recent trail blocks to skip for own trail
-
-	# Helper function to check if a position would cause collision
-	def would_collide(test_x, test_y):
-		"""Check if moving to position (test_x, test_y) would cause a collision."""
-		# Calculate body center using the SAME logic as blit_bike_with_front_at
-		# This is critical for proper collision detection with rotated sprites
-		back_margin = 4
-
-		# pos_back is the top-left of the trail block, so offset to center of 5x5 block
-		back_center_x = test_x + 2
-		back_center_y = test_y + 2
-
-		# Calculate rotation angle
-		rad = math.atan2(-bike.dir[1], bike.dir[0])
-		angle_deg = math.degrees(rad)
-
-		# Vector from back to center (unrotated) - same as blit function
-		local_center = pygame.math.Vector2((sprite_width/2 - back_margin, 0))
-
-		# Rotate that vector - same as blit function
-		rotated_center = local_center.rotate(-angle_deg)
-
-		# Compute where the sprite's center should be - same as blit function
-		body_center_x = back_center_x + rotated_center.x
-		body_center_y = back_center_y + rotated_center.y
-
-		# Check wall collisions using pixel-perfect mask collision
-		# This ensures the bike stops when the mask (not just a point) hits the wall
-		if bike.mask is not None:
-			# Rotate the sprite to get the rotated mask
-			rotated_sprite = pygame.transform.rotate(bike.sprite, angle_deg)
-			rotated_mask = pygame.mask.from_surface(rotated_sprite)
-
-			# Get the rotated sprite rectangle at test position
-			bike_rect = rotated_sprite.get_rect(center=(body_center_x, body_center_y))
-
-			# Check if any part of the mask would be outside the game boundaries
-			if bike_rect.left < 0 or bike_rect.right > WIDTH or bike_rect.top < 0 or bike_rect.bottom > HEIGHT:
-				# Get the mask outline to check actual pixels
-				try:
-					outline = rotated_mask.outline()
-					# Check each outline point to see if it's outside boundaries
-					for px, py in outline:
-						world_x = bike_rect.left + px
-						world_y = bike_rect.top + py
-						if world_x < 0 or world_x >= WIDTH or world_y < 0 or world_y >= HEIGHT:
-							return True
-				except:
-					# If outline fails, fall back to rectangle check
-					if bike_rect.left < 0 or bike_rect.right > WIDTH or bike_rect.top < 0 or bike_rect.bottom > HEIGHT:
-						return True
-
-		# Create a broad-phase AABB for quick rejection of distant objects
-		# This optimization dramatically improves performance with long trails
-		bike_aabb_broad = pygame.Rect(0, 0, sprite_width + 20, sprite_height + 20)
-		bike_aabb_broad.center = (body_center_x, body_center_y)
-
-		# Check other bike's trail (all positions) using pixel-perfect mask collision
-		for trail_pos in other_bike.trail:
-			trail_rect = pygame.Rect(trail_pos[0], trail_pos[1], BLOCK_SIZE, BLOCK_SIZE)
-			# Quick AABB rejection test - skip expensive mask check if not close
-			if bike_aabb_broad.colliderect(trail_rect):
-				# Use pixel-perfect mask collision detection
-				if check_mask_collision_with_rect(bike, trail_pos[0], trail_pos[1], BLOCK_SIZE, BLOCK_SIZE, sprite_width, test_pos=(test_x, test_y)):
-					return True
-
-		# Check own trail (skip recent positions to avoid false collisions)
-		own_trail_to_check = bike.trail[:-TRAIL_SAFETY_MARGIN] if len(bike.trail) > TRAIL_SAFETY_MARGIN else []
-		for trail_pos in own_trail_to_check:
-			trail_rect = pygame.Rect(trail_pos[0], trail_pos[1], BLOCK_SIZE, BLOCK_SIZE)
-			# Quick AABB rejection test - skip expensive mask check if not close
-			if bike_aabb_broad.colliderect(trail_rect):
-				# Use pixel-perfect mask collision detection
-				if check_mask_collision_with_rect(bike, trail_pos[0], trail_pos[1], BLOCK_SIZE, BLOCK_SIZE, sprite_width, test_pos=(test_x, test_y)):
-					return True
-
-		# Check obstacle collisions using pixel-perfect mask collision
-		for obs in obstacles:
-			obs_rect = pygame.Rect(obs.x, obs.y, obs.size, obs.size)
-			# Quick AABB rejection test - skip expensive mask check if not close
-			if bike_aabb_broad.colliderect(obs_rect):
-				# Use pixel-perfect mask collision detection
-				if check_mask_collision_with_rect(bike, obs.x, obs.y, obs.size, obs.size, sprite_width, test_pos=(test_x, test_y)):
-					return True
-
-		# Check bike-to-bike collision using pixel-perfect mask collision
-		# Note: This is checked during step movement for continuous collision detection
-		# The main game loop also checks bike-to-bike collision after movement completes
-		if other_bike is not None and other_bike.mask is not None and bike.mask is not None:
-			other_mag = math.hypot(other_bike.dir[0], other_bike.dir[1])
-			if other_mag > 0:
-				# Temporarily update bike position for collision check
-				original_pos = bike.pos.copy()
-				bike.pos = [test_x, test_y]
-
-				# Check mask collision between bikes
-				collision = check_mask_collision(bike, other_bike, sprite_width)
-
-				# Restore original position
-				bike.pos = original_pos
-
-				if collision:
-					# Return special value to indicate bike-to-bike collision
-					return "bike_collision"
-
-		return False
-
-	# Move step-by-step, checking BEFORE each move
-	steps = max(1, int(effective_speed))
-	step_size = effective_speed / steps
-	distance_moved = 0.0
-	distance_since_last_trail = 0.0
-	collided_player = 0
-
-	for step in range(steps):
-		# Calculate the next position
-		next_x = bike.pos[0] + nx * step_size
-		next_y = bike.pos[1] + ny * step_size
-
-		# Check if moving to this position would cause collision
-		collision_result = would_collide(next_x, next_y)
-		if collision_result:
-			# Check if it's a bike-to-bike collision
-			if collision_result == "bike_collision":
-				# Bike-to-bike collision should result in a draw
-				# Set special return value to indicate this
-				collided_player = 3  # Special value for bike-to-bike collision
-			else:
-				# Regular collision (wall, trail, or obstacle)
-				# Do a binary search to find the exact tangent position
-				# Start with current position (safe) and next position (collision)
-				safe_x, safe_y = bike.pos[0], bike.pos[1]
-				collide_x, collide_y = next_x, next_y
-
-				# Binary search for the exact tangent point (10 iterations gives sub-pixel precision)
-				for _ in range(10):
-					mid_x = (safe_x + collide_x) / 2
-					mid_y = (safe_y + collide_y) / 2
-
-					if would_collide(mid_x, mid_y):
-						# Mid point collides, search in first half
-						collide_x, collide_y = mid_x, mid_y
-					else:
-						# Mid point is safe, search in second half
-						safe_x, safe_y = mid_x, mid_y
-
-				# Move to the last safe position (not the midpoint!)
-				# The last safe position is where the bike's hitbox is tangent to the obstacle
-				# without any overlap or penetration
-
-				# DEBUG: Verify the safe position truly doesn't collide
-				# If safe position still collides, back off further
-				backup_distance = 0
-				while would_collide(safe_x, safe_y) and backup_distance < 10:
-					# Back up by 1 pixel in the opposite direction of movement
-					safe_x -= nx * 0.5
-					safe_y -= ny * 0.5
-					backup_distance += 0.5
-
-				bike.pos[0] = safe_x
-				bike.pos[1] = safe_y
-
-				if bike == player1:
-					collided_player = 1
-				else:
-					collided_player = 2
-			break
-
-		# Update position (only if no collision)
-		bike.pos[0] = next_x
-		bike.pos[1] = next_y
-		distance_moved += step_size
-		distance_since_last_trail += step_size
-
-		# Add trail point every BLOCK_SIZE pixels to ensure continuous trail
-		if distance_since_last_trail >= BLOCK_SIZE:
-			new_pos = (int(bike.pos[0]), int(bike.pos[1]))
-			bike.add_trail_point(new_pos)
-			distance_since_last_trail = 0.0
+def round_draw(state):
+	"""End the round as a draw after a bike-to-bike collision."""
+	global win_color, win_text, current_track
+	win_text = "DRAW!"
+	if theme == "ARES":
+		win_color = DARKER_RED
+		if this_changes_everything.exists():
+			pygame.mixer.music.load("music/this_changes_everything.mp3")
+			pygame.mixer.music.play(-1)
+			pygame.mixer.music.set_volume(0.75)
+			current_track = str(this_changes_everything)
+	elif theme == "LEGACY":
+		win_color = DARKER_BLUE
+		if arena.exists():
+			pygame.mixer.music.load("music/arena.mp3")
+			pygame.mixer.music.play(-1)
+			pygame.mixer.music.set_volume(1)
+			current_track = str(arena)
+	elif theme == "RECONFIGURED":
+		win_color = GREEN
+		if solar_sailer_reconfigured.exists():
+			pygame.mixer.music.load("music/solar_sailer_reconfigured.mp3")
+			pygame.mixer.music.play(-1)
+			pygame.mixer.music.set_volume(0.75)
+			current_track = str(solar_sailer_reconfigured)
+	elif theme == "82":
+		win_color = LIGHT_GRAY
+		if tower_music.exists():
+			pygame.mixer.music.load("music/tower_music.mp3")
+			pygame.mixer.music.play(-1)
+			pygame.mixer.music.set_volume(1)
+			current_track = str(tower_music)
+	elif theme == "UPRISING":
+		win_color = DARKER_BLUE
+		if rescuing_the_rebellion.exists():
+			pygame.mixer.music.load("music/rescuing_the_rebellion.mp3")
+			pygame.mixer.music.play(-1)
+			pygame.mixer.music.set_volume(1)
+			current_track = str(rescuing_the_rebellion)
 
-	# Add final trail point if we haven't added one recently
-	if distance_since_last_trail > 0:
-		new_pos = (int(bike.pos[0]), int(bike.pos[1]))
-		bike.add_trail_point(new_pos)
+def run_game(record_dir=None, resume_path=None, tick_rate=TICK_RATE, dirty_rects=True):
+	"""Main game loop.
 
-	return collided_player
+	Args:
+		record_dir: Directory to save a replay of every match to (no replays if None)
+		resume_path: Saved match to continue instead of starting at the menu
+		tick_rate: Simulation ticks per second (a resumed match keeps its own)
+		dirty_rects: Redraw and update only the parts of the window that changed during a round
+	"""
+	global win_text, win_color, show_ui_overlay, show_debug_hitboxes, current_track, replay_recorder
 
-def run_game():
-	"""Main game loop."""
-	global game_over, win_text, win_color, game_time_offset, last_powerup_spawn, show_ui_overlay, show_debug_hitboxes, current_track
+	if record_dir is not None:
+		replay_recorder = ReplayRecorder(record_dir)
+	game_state.set_tick_rate(tick_rate)
 
 	# --- Start Screen ---
-	main_menu()
+	if resume_path is None:
+		main_menu()
+	else:
+		resume_match(game_state, resume_path)
 	running = True
-	game_over = False
 	show_ui_overlay = True  # Toggle for showing/hiding win message and scoreboard
 	show_debug_hitboxes = False  # Toggle for debug hitbox visualization
+	accumulator = 0.0  # Game time not yet simulated, in milliseconds
+	drawn_bounds = None  # Bike bounds of the last round frame, None if the window was drawn since
+	drawn_powerups = set()  # (x, y, size) of the power-ups on the last round frame
+	game_over_frame = None  # The score screen as last drawn, None until it is drawn
 	while running:
-		if not game_over:
-			clock.tick(60)
+		if round_phase == "countdown":
+			# Keep handling events while the countdown waits for its next number
+			drawn_bounds = None
+			next_change = update_countdown(game_state)
+			if round_phase == "round":
+				clock.tick()  # Time spent in the menus and countdown is not game time
+				continue
+			for event in wait_for_events(next_change):
+				if event.type == pygame.QUIT:
+					running = False
+
+		elif round_phase == "round":
+			game_over_frame = None
+			# The simulation runs fixed ticks of tick_time, as many per frame as the time
+			# since the last frame covers, so slow frames don't slow the game down
+			elapsed = clock.tick(RENDER_FPS)
+			if game_state.ticks == 0:
+				# A round starts when its countdown ends, not when the last frame was drawn
+				accumulator = game_state.tick_time
+			else:
+				accumulator += min(elapsed, MAX_FRAME_TIME)
 
 			for event in pygame.event.get():
 				if event.type == pygame.QUIT:
-					pygame.quit()
-					sys.exit()
+					running = False
 				elif event.type == pygame.KEYDOWN:
 					if event.key == pygame.K_h:
 						show_debug_hitboxes = not show_debug_hitboxes
+					elif event.key == pygame.K_F5:
+						save_match(game_state, SAVE_FILE)
+				elif event.type == pygame.WINDOWEXPOSED:
+					drawn_bounds = None
+			if not running:
+				break  # The replay is closed below
 
 			keys = pygame.key.get_pressed()
 
-			current_time = pygame.time.get_ticks() - game_time_offset
-
-			if current_time - last_powerup_spawn > POWERUP_SPAWN_INTERVAL:
-				spawn_powerup()
-				last_powerup_spawn = current_time
-
-			# Player 1 (WASD) — Disable turning if frozen
-			if not player1.is_frozen(current_time):
-				if player1.can_turn(current_time, turn_cooldown):
-					# Count how many direction keys are pressed
-					p1_keys_pressed = sum([keys[pygame.K_w], keys[pygame.K_s], keys[pygame.K_a], keys[pygame.K_d]])
-
-					# Only allow input if exactly one key is pressed
-					if p1_keys_pressed == 1:
-						new_dir = None
-						if keys[pygame.K_w] and player1.dir != dirs["DOWN"] and player1.dir != dirs["UP"]:
-							new_dir = dirs["UP"]
-						elif keys[pygame.K_s] and player1.dir != dirs["UP"] and player1.dir != dirs["DOWN"]:
-							new_dir = dirs["DOWN"]
-						elif keys[pygame.K_a] and player1.dir != dirs["RIGHT"] and player1.dir != dirs["LEFT"]:
-							new_dir = dirs["LEFT"]
-						elif keys[pygame.K_d] and player1.dir != dirs["LEFT"] and player1.dir != dirs["RIGHT"]:
-							new_dir = dirs["RIGHT"]
-
-						# Only apply turn if not a zigzag
-						if new_dir is not None: #and not player1.is_zigzag(new_dir, dirs, current_time):
-							player1.last_turn_direction = player1.dir
-							player1.dir = new_dir
-							player1.last_turn_time = current_time
-
-			# Player 2 (Arrows or AI) — Disable turning if frozen
-			if not player2.is_frozen(current_time):
-				if single_player:
-					ai_control(current_time)
-				else:
-					if player2.can_turn(current_time, turn_cooldown):
-						# Count how many direction keys are pressed
-						p2_keys_pressed = sum([keys[pygame.K_UP], keys[pygame.K_DOWN], keys[pygame.K_LEFT], keys[pygame.K_RIGHT]])
-
-						# Only allow input if exactly one key is pressed
-						if p2_keys_pressed == 1:
-							new_dir = None
-							if keys[pygame.K_UP] and player2.dir != dirs["DOWN"] and player2.dir != dirs["UP"]:
-								new_dir = dirs["UP"]
-							elif keys[pygame.K_DOWN] and player2.dir != dirs["UP"] and player2.dir != dirs["DOWN"]:
-								new_dir = dirs["DOWN"]
-							elif keys[pygame.K_LEFT] and player2.dir != dirs["RIGHT"] and player2.dir != dirs["LEFT"]:
-								new_dir = dirs["LEFT"]
-							elif keys[pygame.K_RIGHT] and player2.dir != dirs["LEFT"] and player2.dir != dirs["RIGHT"]:
-								new_dir = dirs["RIGHT"]
-
-							# Only apply turn if not a zigzag
-							if new_dir is not None:# and not player2.is_zigzag(new_dir, dirs, current_time):
-								player2.last_turn_direction = player2.dir
-								player2.dir = new_dir
-								player2.last_turn_time = current_time
-
-			# Get effective speeds considering status effects
-			effective_speed_p1 = player1.get_effective_speed(SPEED, current_time)
-			effective_speed_p2 = player2.get_effective_speed(SPEED, current_time)
-
-			# Get sprite dimensions based on theme
-			if theme == "LEGACY" or theme == "ARES" or theme == "UPRISING":
-				sprite_w = legacy_width
-				sprite_h = legacy_height
-			elif theme == "RECONFIGURED":
-				sprite_w = reconfigured_width
-				sprite_h = reconfigured_height
-			elif theme == "82":
-				sprite_w = width_82
-				sprite_h = height_82
-
-			# Move both bikes
-			collided1 = step_move_player(player1, player2, effective_speed_p1, sprite_w, sprite_h, back_margin=4)
-			collided2 = step_move_player(player2, player1, effective_speed_p2, sprite_w, sprite_h, back_margin=4)
-
-			# Check if either collision was a bike-to-bike collision (should be a draw)
-			if collided1 == 3 or collided2 == 3:
-				# Bike-to-bike collision during movement - it's a draw
-				WIN.fill(BLACK)
-				draw_tron_grid(WIN)
-				if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-					draw_bike_glow(player1)
-					draw_bike_glow(player2)
-				draw_trails()
-				draw_obstacles()
-				draw_powerups()
-				draw_sprites()
+			# Player 1 (WASD)
+			p1_dir = None
+			# Count how many direction keys are pressed
+			p1_keys_pressed = sum([keys[pygame.K_w], keys[pygame.K_s], keys[pygame.K_a], keys[pygame.K_d]])
+
+			# Only allow input if exactly one key is pressed
+			# (the simulation ignores turns while frozen or cooling down)
+			if p1_keys_pressed == 1:
+				if keys[pygame.K_w]:
+					p1_dir = dirs["UP"]
+				elif keys[pygame.K_s]:
+					p1_dir = dirs["DOWN"]
+				elif keys[pygame.K_a]:
+					p1_dir = dirs["LEFT"]
+				elif keys[pygame.K_d]:
+					p1_dir = dirs["RIGHT"]
+
+			# Player 2 (Arrows or AI)
+			p2_dir = None
+			if not single_player:
+				# Count how many direction keys are pressed
+				p2_keys_pressed = sum([keys[pygame.K_UP], keys[pygame.K_DOWN], keys[pygame.K_LEFT], keys[pygame.K_RIGHT]])
+
+				# Only allow input if exactly one key is pressed
+				if p2_keys_pressed == 1:
+					if keys[pygame.K_UP]:
+						p2_dir = dirs["UP"]
+					elif keys[pygame.K_DOWN]:
+						p2_dir = dirs["DOWN"]
+					elif keys[pygame.K_LEFT]:
+						p2_dir = dirs["LEFT"]
+					elif keys[pygame.K_RIGHT]:
+						p2_dir = dirs["RIGHT"]
+
+			while accumulator >= game_state.tick_time and not game_state.game_over:
+				accumulator -= game_state.tick_time
+				current_time = game_state.next_tick_time()
+
+				# The AI steers player 2 every tick (unless frozen)
+				if single_player and not game_state.player2.is_frozen(current_time):
+					ai_control(game_state, game_state.player2, current_time)
+
+				# Move both bikes, resolve collisions and power-ups
+				game_state.step((p1_dir, p2_dir), current_time)
+				if replay_recorder is not None:
+					replay_recorder.record_tick(game_state)
+
+			# Draw the bikes part of the way into the next tick
+			interpolation = 1.0 if game_state.game_over else accumulator / game_state.tick_time
+
+			if game_state.game_over:
+				derezz(game_state)
+
+			bike_bounds = [get_bike_bounds(bike, interpolation) for bike in (game_state.player1, game_state.player2)]
+			powerups = {(pu.x, pu.y, pu.size) for pu in game_state.powerups}
+			trail_rects = update_trail_layer(game_state)
+
+			if not dirty_rects or drawn_bounds is None or game_state.game_over or show_debug_hitboxes:
+				# Render everything
+				draw_round(game_state, interpolation)
 				if show_debug_hitboxes:
-					draw_debug_hitboxes()
-				draw_scoreboard()
+					draw_debug_hitboxes(game_state)
+				draw_scoreboard(game_state)
 				pygame.display.update()
-				if theme == "82":
-					if derezzed_sound_82_file.exists():
-						pygame.mixer.music.stop()
-						turn_channel.stop()
-						derezz_channel.play(derezzed_sound_82)
-				else:
-					if derezzed_sound_file.exists():
-						pygame.mixer.music.stop()
-						derezz_channel.play(derezzed_sound)
-				game_over = True
-				if theme == "82":
-					pygame.time.delay(2600)
-				else:
-					pygame.time.delay(1800)
-				win_text = "DRAW!"
-				if theme == "ARES":
-					win_color = DARKER_RED
-					if this_changes_everything.exists():
-						pygame.mixer.music.load("music/this_changes_everything.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(0.75)
-						current_track = str(this_changes_everything)
-				elif theme == "LEGACY":
-					win_color = DARKER_BLUE
-					if arena.exists():
-						pygame.mixer.music.load("music/arena.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(arena)
-				elif theme == "RECONFIGURED":
-					win_color = GREEN
-					if solar_sailer_reconfigured.exists():
-						pygame.mixer.music.load("music/solar_sailer_reconfigured.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(0.75)
-						current_track = str(solar_sailer_reconfigured)
-				elif theme == "82":
-					win_color = LIGHT_GRAY
-					if tower_music.exists():
-						pygame.mixer.music.load("music/tower_music.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(tower_music)
-				elif theme == "UPRISING":
-					win_color = DARKER_BLUE
-					if rescuing_the_rebellion.exists():
-						pygame.mixer.music.load("music/rescuing_the_rebellion.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(rescuing_the_rebellion)
-			elif collided1 == 1:
-				p2_win()
-			elif collided1 == 2:
-				p1_win()
-			elif collided2 == 1:
-				p2_win()
-			elif collided2 == 2:
-				p1_win()
-
-			p1_front = player1.get_front_pos(sprite_w)
-			p2_front = player2.get_front_pos(sprite_w)
-
-			# Check bike-to-bike collision - simply check if the sprite hitboxes overlap
-			dx1, dy1 = player1.dir
-			mag1 = math.hypot(dx1, dy1)
-			dx2, dy2 = player2.dir
-			mag2 = math.hypot(dx2, dy2)
-
-			bikes_collided = False
-
-			if mag1 > 0 and mag2 > 0:  # Both bikes are moving
-				# Use pixel-perfect mask collision detection
-				bikes_collided = check_mask_collision(player1, player2, sprite_w)
-
-			# Handle bike-to-bike collision ONLY if neither bike crashed into walls/trails
-			# All bike-to-bike collisions count as a draw
-			if bikes_collided and collided1 == 0 and collided2 == 0:
-				WIN.fill(BLACK)
-				draw_tron_grid(WIN)
-				if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-					draw_bike_glow(player1)
-					draw_bike_glow(player2)
-				draw_trails()
-				draw_obstacles()
-				draw_powerups()
-				draw_sprites()
-				if show_debug_hitboxes:
-					draw_debug_hitboxes()
-				draw_scoreboard()
-				pygame.display.update()
-				if theme == "82":
-					if derezzed_sound_82_file.exists():
-						pygame.mixer.music.stop()
-						turn_channel.stop()
-						derezz_channel.play(derezzed_sound_82)
-				else:
-					if derezzed_sound_file.exists():
-						pygame.mixer.music.stop()
-						derezz_channel.play(derezzed_sound)
-				game_over = True
-				if theme == "82":
-					pygame.time.delay(2600)
+			else:
+				# Redraw only where the bikes were and are now, new trail blocks and
+				# power-ups that appeared or were collected
+				rects = [old.union(new) for old, new in zip(drawn_bounds, bike_bounds)]
+				for rect in trail_rects + [pygame.Rect(x, y, size, size) for x, y, size in powerups ^ drawn_powerups]:
+					if not any(dirty.contains(rect) for dirty in rects):
+						rects.append(rect)
+				for rect in rects:
+					WIN.set_clip(rect)
+					draw_round(game_state, interpolation)
+					draw_scoreboard(game_state)
+				WIN.set_clip(None)
+				pygame.display.update(rects)
+			drawn_bounds = bike_bounds
+			drawn_powerups = powerups
+
+		elif round_phase == "derezz":
+			# Hold the crash on screen (drawn by the round's last frame), then show who won
+			time_left = phase_time_left()
+			if time_left <= 0:
+				if game_state.winner == 1:
+					p1_win(game_state)
+				elif game_state.winner == 2:
+					p2_win(game_state)
 				else:
-					pygame.time.delay(1800)
-				win_text = "DRAW!"
-				if theme == "ARES":
-					win_color = DARKER_RED
-					if this_changes_everything.exists():
-						pygame.mixer.music.load("music/this_changes_everything.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(0.75)
-						current_track = str(this_changes_everything)
-				elif theme == "LEGACY":
-					win_color = DARKER_BLUE
-					if arena.exists():
-						pygame.mixer.music.load("music/arena.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(arena)
-				elif theme == "RECONFIGURED":
-					win_color = GREEN
-					if solar_sailer_reconfigured.exists():
-						pygame.mixer.music.load("music/solar_sailer_reconfigured.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(0.75)
-						current_track = str(solar_sailer_reconfigured)
-				elif theme == "82":
-					win_color = LIGHT_GRAY
-					if tower_music.exists():
-						pygame.mixer.music.load("music/tower_music.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(tower_music)
-				elif theme == "UPRISING":
-					win_color = DARKER_BLUE
-					if rescuing_the_rebellion.exists():
-						pygame.mixer.music.load("music/rescuing_the_rebellion.mp3")
-						pygame.mixer.music.play(-1)
-						pygame.mixer.music.set_volume(1)
-						current_track = str(rescuing_the_rebellion)
-
-			# --- Power-up collisions ---
-			check_powerup_collision(p1_front, player1, current_time)
-			check_powerup_collision(p2_front, player2, current_time)
-			check_trail_powerup_collisions(current_time)
-
-			# Render everything
-			WIN.fill(BLACK)
-			draw_tron_grid(WIN)
-			if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-				draw_bike_glow(player1)
-				draw_bike_glow(player2)
-			draw_trails()
-			draw_obstacles()
-			draw_powerups()
-			draw_sprites()
-			if show_debug_hitboxes:
-				draw_debug_hitboxes()
-			draw_scoreboard()
-			pygame.display.update()
+					round_draw(game_state)
+				start_phase("game_over")
+				continue
+			for event in wait_for_events(time_left):
+				if event.type == pygame.QUIT:
+					running = False
 
 		else:
 			# --- GAME OVER STATE ---
-			if match_over:
-				WIN.fill(BLACK)
-				draw_tron_grid(WIN)
-				if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-					draw_bike_glow(player1)
-					draw_bike_glow(player2)
-				draw_trails()
-				draw_obstacles()
-				draw_powerups()
-				draw_sprites()
+			# The score screen is drawn once, then kept until a key changes it
+			drawn_bounds = None
+			if game_over_frame is None:
+				draw_round(game_state)
 				if show_debug_hitboxes:
-					draw_debug_hitboxes()
+					draw_debug_hitboxes(game_state)
 				if show_ui_overlay:
-					draw_scoreboard()
-					show_message(win_text, "Press ESC to quit | SHIFT to hide", win_color)
+					draw_scoreboard(game_state)
+					if game_state.match_over:
+						show_message(win_text, "Press ESC to quit | SHIFT to hide", win_color)
+					else:
+						show_message(win_text, "Press SPACE to continue | SHIFT to hide", win_color)
 				pygame.display.update()
+				game_over_frame = WIN.copy()
 
-				for event in pygame.event.get():
-					if event.type == pygame.QUIT:
-						running = False
-					elif event.type == pygame.KEYDOWN:
-						if event.key == pygame.K_ESCAPE:
-							show_ui_overlay = True
-							main_menu()
-						elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-							show_ui_overlay = not show_ui_overlay
-						elif event.key == pygame.K_h:
-							show_debug_hitboxes = not show_debug_hitboxes
+			# Sleep until something happens instead of redrawing the same screen
+			for event in wait_for_events():
+				if event.type == pygame.QUIT:
+					running = False
+				elif event.type == pygame.WINDOWEXPOSED and game_over_frame is not None:
+					WIN.blit(game_over_frame, (0, 0))
+					pygame.display.update()
+				elif event.type == pygame.KEYDOWN:
+					if event.key == pygame.K_SPACE and not game_state.match_over:
+						reset_game(game_state)
+						show_ui_overlay = True
+						break  # Later keys belong to the next round
+					elif event.key == pygame.K_ESCAPE:
+						show_ui_overlay = True
+						main_menu()
+						break
+					elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
+						show_ui_overlay = not show_ui_overlay
+						game_over_frame = None
+					elif event.key == pygame.K_h:
+						show_debug_hitboxes = not show_debug_hitboxes
+						game_over_frame = None
+
+	if replay_recorder is not None:
+		replay_recorder.close()
+	pygame.quit()
+
+def watch_replay(replay, playback_speed=1):
+	"""Render a recorded match at playback_speed times normal speed until ESC is pressed.
+
+	LEFT and RIGHT jump back and forward REPLAY_SEEK_SECONDS within the round.
 
+	Args:
+		replay: Replay loaded with read_replay()
+		playback_speed: Game time played per unit of real time (fractions slow playback down)
+	"""
+	global theme
+
+	theme = replay.theme
+	player1, player2 = load_bikes(replay.theme)
+	player = ReplayPlayer(replay, player1, player2)
+	state = player.state
+	ticks_due = 0.0
+	started = False
+	seek_ticks = REPLAY_SEEK_SECONDS * replay.tick_rate
+	watching = True
+	while watching:
+		elapsed = clock.tick(RENDER_FPS)
+
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				watching = False
+			elif event.type == pygame.KEYDOWN and started:
+				if event.key == pygame.K_ESCAPE:
+					watching = False
+				elif event.key == pygame.K_LEFT:
+					player.seek(player.round_index, max(0, state.ticks - seek_ticks))
+				elif event.key == pygame.K_RIGHT:
+					player.seek(player.round_index, state.ticks + seek_ticks)
+
+		# Simulate the ticks due this frame, holding the last frame once the replay ends
+		ticks_due += min(elapsed, MAX_FRAME_TIME) * playback_speed / state.tick_time
+		while ticks_due >= 1:
+			ticks_due -= 1
+			if player.round_finished():
+				if not player.next_round():
+					ticks_due = 0
+					break
+				started = True
 			else:
-				WIN.fill(BLACK)
-				draw_tron_grid(WIN)
-				if theme == "LEGACY" or theme == "ARES" or theme == "RECONFIGURED" or theme == "UPRISING":
-					draw_bike_glow(player1)
-					draw_bike_glow(player2)
-				draw_trails()
-				draw_obstacles()
-				draw_powerups()
-				draw_sprites()
-				if show_debug_hitboxes:
-					draw_debug_hitboxes()
-				if show_ui_overlay:
-					draw_scoreboard()
-					show_message(win_text, "Press SPACE to continue | SHIFT to hide", win_color)
-				pygame.display.update()
+				player.step()
+		if not started:
+			continue
 
-				for event in pygame.event.get():
-					if event.type == pygame.QUIT:
-						running = False
-					elif event.type == pygame.KEYDOWN:
-						if event.key == pygame.K_SPACE:
-							reset_game()
-							show_ui_overlay = True
-						elif event.key == pygame.K_ESCAPE:
-							show_ui_overlay = True
-							main_menu()
-						elif event.key == pygame.K_LSHIFT or event.key == pygame.K_RSHIFT:
-							show_ui_overlay = not show_ui_overlay
-						elif event.key == pygame.K_h:
-							show_debug_hitboxes = not show_debug_hitboxes
+		# Slowed down playback draws the bikes part of the way into the next tick
+		interpolation = 1.0 if player.round_finished() else ticks_due
+
+		draw_round(state, interpolation)
+		pygame.display.update()
 
 	pygame.quit()
\ No newline at end of file
@@ -1,9 +1,15 @@
+import argparse
 import pygame
 from pathlib import Path
 import os
 import random
 
 from bike import Bike
+from constants import *
+from replay import read_replay
+from simulation import GameState
+from render_cache import RenderCache
+from trail_layer import TrailLayer
 
 from functions import *
 
@@ -93,50 +99,42 @@ game_music_uprising = [club_infestation, zed_dances, teslers_party]
 
 current_track = ""
 
-WIDTH, HEIGHT = 900, 900
-
 themes = ["82", "LEGACY", "ARES"]
 
-theme = random.choice(themes)
+# Menu and music picks, kept apart from each match's own generator
+ui_rng = random.Random()
 
-message_color = ""
+theme = ui_rng.choice(themes)
 
-# Colors
-BLACK = (0, 0, 0)
-GRID_COLOR = (20, 20, 30)
-BLUE = (0, 255, 255)
-DARKER_BLUE = (0, 200, 200)
-ORANGE = (255, 150, 0)
-RED = (255, 0, 0)
-DARKER_RED = (200, 0, 0)
-DARKEST_RED = (190, 0, 0)
-LIGHT_RED = (255, 50, 50)
-TEAL = (0, 180, 150)
-DARKER_TEAL = (0, 10, 20)
-LIGHTER_TEAL = (0, 225, 188)
-WHITE = (255, 255, 255)
-LIGHT_GRAY = (200, 200, 200)
-YELLOW = (255, 255, 0)
-GREEN = (22, 247, 21)
-DARKER_GREEN = (0, 165, 0)
+message_color = ""
 
 blue_wins = 0
 orange_wins = 0
-MAX_SCORE = 5
-match_over = False
 single_player = False
+replay_recorder = None  # ReplayRecorder while matches are being recorded
+
+# Where F5 saves the match in progress
+SAVE_FILE = "savegame.trs"
 
-obstacles = []
-OBSTACLE_SIZE = 20
+# Frame rate cap for rendering; the simulation ticks at its own fixed rate (see TICK_RATE)
+RENDER_FPS = 60
 
-game_time_offset = 0
+# Longest frame the simulation catches up on, in milliseconds
+MAX_FRAME_TIME = 250
 
-# --- POWER-UP SYSTEM ---
-powerups = []
-POWERUP_SIZE = 20
-last_powerup_spawn = 0
-POWERUP_SPAWN_INTERVAL = 2000
-first_powerup_spawned = False
+# Milliseconds each countdown number and then "GO!" are shown before a round
+COUNTDOWN_STEP = 1000
+COUNTDOWN_GO_TIME = 800
+
+# Screen run_game is showing: "countdown", "round", "derezz" (the pause after a crash) or
+# "game_over"; the timed ones last from phase_start to phase_end (pygame.time.get_ticks())
+round_phase = "countdown"
+phase_start = 0
+phase_end = 0
+countdown_shown = None  # Countdown label on screen, None before the first one
+
+# Game time skipped by LEFT/RIGHT while watching a replay
+REPLAY_SEEK_SECONDS = 5
 
 # Screen setup
 info = pygame.display.Info()
@@ -156,11 +154,6 @@ reconfigured_background = pygame.transform.scale(reconfigured_background, (WIDTH
 
 pygame.display.set_caption("TRON Lightcycles")
 
-# Player settings
-SPEED = 5
-BLOCK_SIZE = 5
-TRAIL_WIDTH = 5  # Visual width of trails (always 5px regardless of difficulty)
-
 difficulty = ""
 
 if derezzed_sound_file.exists():
@@ -172,13 +165,6 @@ if derezzed_sound_82_file.exists():
 if turn_sound_82_file.exists():
 	turn_sound_82 = pygame.mixer.Sound("music/turn_sound_82.mp3")
 
-dirs = {
-	"UP": (0, -SPEED),
-	"DOWN": (0, SPEED),
-	"LEFT": (-SPEED, 0),
-	"RIGHT": (SPEED, 0)
-}
-
 # Load sprites
 
 blue_82_big = pygame.image.load("images/blue_lightcycle_82.png").convert_alpha()
@@ -236,9 +222,22 @@ green_reconfigured_mask = pygame.mask.from_surface(green_reconfigured_sprite)
 yellow_reconfigured_sprite = pygame.transform.scale(yellow_reconfigured_big, (reconfigured_width, reconfigured_height))
 yellow_reconfigured_mask = pygame.mask.from_surface(yellow_reconfigured_sprite)
 
-# Create bike instances
-player1 = ""
-player2 = ""
+# Match being played (bikes are created for the chosen theme by reset_game)
+game_state = GameState(None, None, theme)
+
+# Rendered theme backgrounds by (theme, size, grid spacing), see draw_tron_grid
+grid_backgrounds = {}
+
+# Bike glows by (color, width, height, alpha), built as they are first drawn and cleared
+# when the theme changes (each Bike keeps its own rotated sprites, see Bike.set_sprite)
+glow_surfaces = {}
+
+# Recently rendered text by (font, text, color), and show_message() boxes
+text_cache = RenderCache(256)
+message_cache = RenderCache(16)
+
+# Trails drawn so far this round, updated with new blocks every frame
+trail_layer = TrailLayer((WIDTH, HEIGHT))
 
 clock = pygame.time.Clock()
 
@@ -257,7 +256,20 @@ tron_ares = os.path.join("fonts", "TronAres.ttf")
 
 pixel_font = os.path.join("fonts", "PressStart2P-Regular.ttf")
 
-turn_cooldown = 5
-
 if __name__ == '__main__':
-	run_game()
\ No newline at end of file
+	parser = argparse.ArgumentParser(description="TRON Lightcycles")
+	parser.add_argument("--record", metavar="DIR", help="save a replay of every match to DIR")
+	parser.add_argument("--replay", metavar="FILE", help="watch a recorded match instead of playing")
+	parser.add_argument("--replay-speed", type=float, default=1, help="playback speed for --replay (2 = twice as fast)")
+	parser.add_argument("--resume", metavar="FILE", nargs="?", const=SAVE_FILE,
+	                    help=f"continue a match saved with F5 (default {SAVE_FILE})")
+	parser.add_argument("--tick-rate", type=int, choices=TICK_RATES, default=TICK_RATE,
+	                    help="simulation ticks per second")
+	parser.add_argument("--full-redraw", action="store_true",
+	                    help="redraw the whole window every frame instead of only what changed")
+	args = parser.parse_args()
+
+	if args.replay is not None:
+		watch_replay(read_replay(args.replay), args.replay_speed)
+	else:
+		run_game(args.record, args.resume, args.tick_rate, not args.full_redraw)
\ No newline at end of file
@@ -0,0 +1,12 @@
+"""Shared collision masks for TRON Lightcycles game."""
+import functools
+import pygame
+
+
+@functools.lru_cache(maxsize=None)
+def solid_mask(width, height):
+	"""Get a fully set mask of the given size.
+
+	Masks are shared between callers, so they must never be modified.
+	"""
+	return pygame.mask.Mask((width, height), fill=True)
@@ -1,6 +1,7 @@
 """Obstacle class for TRON Lightcycles game."""
 import pygame
-from main import *
+from constants import *
+from masks import solid_mask
 
 class Obstacle:
 	"""Represents an obstacle on the grid."""
@@ -9,6 +10,9 @@ class Obstacle:
 		self.x = x
 		self.y = y
 		self.size = size
+		self.mask = solid_mask(size, size)  # Shared solid mask for collision checks
+		self.image = None  # Rendered obstacle, drawn for image_theme
+		self.image_theme = None
 
 	def contains_point(self, x, y):
 		"""Check if a point is inside this obstacle."""
@@ -25,21 +29,35 @@ class Obstacle:
 		"""Check if a position is within margin distance of this obstacle."""
 		return (abs(self.x - pos[0]) < margin and abs(self.y - pos[1]) < margin)
 
+	def get_image(self, theme):
+		"""Get the obstacle rendered for theme (drawing it only the first time)."""
+		if self.image is None or self.image_theme != theme:
+			self.image = pygame.Surface((self.size, self.size))
+			self.draw(self.image, theme)
+			self.image_theme = theme
+		return self.image
+
 	def render(self, screen, theme):
 		"""Render the obstacle on the screen."""
-		core = pygame.Rect(self.x, self.y, self.size, self.size)
+		# Blitting a pre-rendered image is cheaper, and unlike drawing the outline it stays
+		# exact when the screen is clipped to a dirty rectangle
+		screen.blit(self.get_image(theme), (self.x, self.y))
+
+	def draw(self, surface, theme):
+		"""Draw the obstacle at the top-left of surface."""
+		core = pygame.Rect(0, 0, self.size, self.size)
 		if theme == "LEGACY":
-			pygame.draw.rect(screen, (0, 0, 0), core)
-			pygame.draw.rect(screen, (150, 255, 255), core, 2)
+			pygame.draw.rect(surface, (0, 0, 0), core)
+			pygame.draw.rect(surface, (150, 255, 255), core, 2)
 		elif theme == "RECONFIGURED":
-			pygame.draw.rect(screen, (0, 20, 0), core)
-			pygame.draw.rect(screen, (100, 255, 100), core, 3)
+			pygame.draw.rect(surface, (0, 20, 0), core)
+			pygame.draw.rect(surface, (100, 255, 100), core, 3)
 		elif theme == "82":
-			pygame.draw.rect(screen, (13, 54, 77), core)
-			pygame.draw.rect(screen, (113, 0, 0), core, 2)
+			pygame.draw.rect(surface, (13, 54, 77), core)
+			pygame.draw.rect(surface, (113, 0, 0), core, 2)
 		elif theme == "ARES":
-			pygame.draw.rect(screen, (0, 0, 0), core)
-			pygame.draw.rect(screen, (255, 180, 180), core, 2)
+			pygame.draw.rect(surface, (0, 0, 0), core)
+			pygame.draw.rect(surface, (255, 180, 180), core, 2)
 		elif theme == "UPRISING":
-			pygame.draw.rect(screen, (0, 30, 50), core)
-			pygame.draw.rect(screen, LIGHTER_TEAL, core, 2)
+			pygame.draw.rect(surface, (0, 30, 50), core)
+			pygame.draw.rect(surface, LIGHTER_TEAL, core, 2)
@@ -0,0 +1,84 @@
+"""Orientation class for TRON Lightcycles game."""
+import math
+import pygame
+
+
+class Orientation:
+	"""Precomputed rotated sprite, mask and placement for one facing direction."""
+
+	# Unit direction vectors a bike can face (right, left, down, up)
+	DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+	def __init__(self, sprite, direction, back_margin=4):
+		dx, dy = direction
+		self.direction = direction
+
+		# Compute angle (right = 0°)
+		self.angle = math.degrees(math.atan2(-dy, dx))
+
+		# Rotated sprite and its pixel-perfect mask
+		self.surface = pygame.transform.rotate(sprite, self.angle)
+		self.mask = pygame.mask.from_surface(self.surface)
+		self.size = self.surface.get_size()
+		self.outline = self.mask.outline()
+
+		# Opaque pixel extents within the rotated sprite, for wall tests without the outline
+		bounding_rects = self.mask.get_bounding_rects()
+		if bounding_rects:
+			self.extents = bounding_rects[0].unionall(bounding_rects[1:])
+		else:
+			self.extents = pygame.Rect(0, 0, *self.size)
+
+		# Vector from the back of the bike to the sprite center (rotated)
+		local_center = pygame.math.Vector2((sprite.get_width()/2 - back_margin, 0))
+		rotated_center = local_center.rotate(-self.angle)
+		self.center_offset = (rotated_center.x, rotated_center.y)
+
+		# Dilated mask so contact is detected before penetration with a single overlap test
+		# Its top-left corner sits contact_margin pixels up and left of the rotated sprite's
+		if dx == 0:
+			# Facing up or down: mask.overlap() only detects a side hit once the bike has
+			# penetrated to the FAR edge of a trail block, so grow the mask by 6 pixels all round
+			self.contact_margin = 6
+			kernel = pygame.mask.Mask((13, 13), fill=True)
+		else:
+			# Facing left or right: overlap or adjacent (within 1 pixel) to prevent tunneling
+			self.contact_margin = 1
+			kernel = pygame.mask.Mask((3, 3))
+			for point in [(1, 0), (0, 1), (1, 1), (2, 1), (1, 2)]:
+				kernel.set_at(point)
+		self.contact_mask = self.mask.convolve(kernel)
+
+	def get_center(self, pos):
+		"""Get the sprite center for a bike whose back is at pos."""
+		# pos is the top-left of the trail block, so offset to center of 5x5 block
+		return (pos[0] + 2 + self.center_offset[0], pos[1] + 2 + self.center_offset[1])
+
+	def get_rect(self, pos):
+		"""Get the rotated sprite rectangle for a bike whose back is at pos."""
+		return self.surface.get_rect(center=self.get_center(pos))
+
+	def leaves_arena(self, pos, arena_size):
+		"""Check if any opaque pixel of a bike whose back is at pos is outside the arena."""
+		rect = self.get_rect(pos)
+		width, height = arena_size
+		return (rect.left + self.extents.left < 0 or rect.left + self.extents.right > width or
+		        rect.top + self.extents.top < 0 or rect.top + self.extents.bottom > height)
+
+	def get_wall_distance(self, pos, arena_size):
+		"""Get how far a bike whose back is at pos can move forward before leaving the arena.
+
+		The sprite rect snaps its center to the nearest pixel, so the result is exact up to
+		that rounding; callers should confirm positions near the limit with leaves_arena().
+		"""
+		dx, dy = self.direction
+		center_x, center_y = self.get_center(pos)
+		half_width, half_height = self.size[0] // 2, self.size[1] // 2
+		width, height = arena_size
+		if dx > 0:
+			return width + half_width - self.extents.right + 0.5 - center_x
+		if dx < 0:
+			return center_x - (half_width - self.extents.left - 0.5)
+		if dy > 0:
+			return height + half_height - self.extents.bottom + 0.5 - center_y
+		return center_y - (half_height - self.extents.top - 0.5)
@@ -1,6 +1,6 @@
 """PowerUp class for TRON Lightcycles game."""
 import pygame
-from main import *
+from constants import *
 
 class PowerUp:
 	"""Represents a power-up on the grid."""
@@ -26,6 +26,8 @@ class PowerUp:
 			self.color = (0, 0, 40)
 		else:
 			self.color = PowerUp.COLORS[ptype]
+		self.image = None  # Rendered power-up, drawn for image_theme
+		self.image_theme = None
 
 	def contains_point(self, x, y):
 		"""Check if a point is inside this power-up."""
@@ -40,31 +42,44 @@ class PowerUp:
 		elif self.type == "fast":
 			bike.fast_until = current_time + 3000
 
+	def get_image(self, theme):
+		"""Get the power-up rendered for theme (drawing it only the first time)."""
+		if self.image is None or self.image_theme != theme:
+			self.image = pygame.Surface((self.size, self.size))
+			self.draw(self.image, theme)
+			self.image_theme = theme
+		return self.image
+
 	def render(self, screen, theme):
 		"""Render the power-up on the screen."""
-		pygame.draw.rect(screen, self.color, (self.x, self.y, self.size, self.size))
+		# Blitted from a pre-rendered image, like Obstacle.render()
+		screen.blit(self.get_image(theme), (self.x, self.y))
+
+	def draw(self, surface, theme):
+		"""Draw the power-up at the top-left of surface."""
+		pygame.draw.rect(surface, self.color, (0, 0, self.size, self.size))
 		if theme == "ARES":
-			pygame.draw.rect(screen, (128, 128, 128), (self.x, self.y, self.size, self.size), 2)
+			pygame.draw.rect(surface, (128, 128, 128), (0, 0, self.size, self.size), 2)
 		elif theme == "82":
-			pygame.draw.rect(screen, (122, 189, 255), (self.x, self.y, self.size, self.size), 2)
+			pygame.draw.rect(surface, (122, 189, 255), (0, 0, self.size, self.size), 2)
 		elif theme == "LEGACY":
-			pygame.draw.rect(screen, (255, 255, 255), (self.x, self.y, self.size, self.size), 2)
+			pygame.draw.rect(surface, (255, 255, 255), (0, 0, self.size, self.size), 2)
 		elif theme == "RECONFIGURED":
 			# 8-bit style power-up with pixelated cross pattern
 			# Main green fill
-			pygame.draw.rect(screen, (100, 255, 100), (self.x, self.y, self.size, self.size), 4)
+			pygame.draw.rect(surface, (100, 255, 100), (0, 0, self.size, self.size), 4)
 
 			# # Create pixel art cross/plus pattern in the center
-			# center_x = self.x + self.size // 2
-			# center_y = self.y + self.size // 2
+			# center_x = self.size // 2
+			# center_y = self.size // 2
 			# pixel = 2
 
 			# # Vertical bar of cross
-			# pygame.draw.rect(screen, (0, 255, 0), (center_x - pixel, self.y + 3, pixel * 2, self.size - 6))
+			# pygame.draw.rect(surface, (0, 255, 0), (center_x - pixel, 3, pixel * 2, self.size - 6))
 			# # Horizontal bar of cross
-			# pygame.draw.rect(screen, (0, 255, 0), (self.x + 3, center_y - pixel, self.size - 6, pixel * 2))
+			# pygame.draw.rect(surface, (0, 255, 0), (3, center_y - pixel, self.size - 6, pixel * 2))
 
 			# # Thick pixelated border
-			# pygame.draw.rect(screen, (128, 255, 128), (self.x, self.y, self.size, self.size), pixel * 2)
+			# pygame.draw.rect(surface, (128, 255, 128), (0, 0, self.size, self.size), pixel * 2)
 		elif theme == "UPRISING":
-			pygame.draw.rect(screen, BLUE, (self.x, self.y, self.size, self.size), 2)
+			pygame.draw.rect(surface, BLUE, (0, 0, self.size, self.size), 2)
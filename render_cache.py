@@ -0,0 +1,26 @@
+"""Rendered surface cache for TRON Lightcycles game."""
+from collections import OrderedDict
+
+
+class RenderCache:
+	"""Keeps the most recently used rendered surfaces, evicting the least recently used."""
+
+	def __init__(self, max_size):
+		self.max_size = max_size
+		self.surfaces = OrderedDict()
+
+	def get(self, key, build):
+		"""Get the surface for key, calling build() to render it if it is not cached."""
+		surface = self.surfaces.get(key)
+		if surface is not None:
+			self.surfaces.move_to_end(key)
+			return surface
+		surface = build()
+		self.surfaces[key] = surface
+		if len(self.surfaces) > self.max_size:
+			self.surfaces.popitem(last=False)
+		return surface
+
+	def clear(self):
+		"""Remove every cached surface."""
+		self.surfaces.clear()
@@ -0,0 +1,336 @@
+"""Match replays for TRON Lightcycles game.
+
+A replay stores a match's seed, theme, speed, tick rate and score limit, then only the ticks on
+which a bike turned, so it costs a few bytes per turn. Since a match's random numbers
+come from its seed and game time from the tick count, re-simulating the turns on a
+GameState reproduces every round exactly.
+
+File layout (integers are unsigned LEB128 varints):
+	b"TRRP", version byte, seed, speed (little-endian double), tick rate, max score, theme length, theme
+	then per round a run of records, each varint((tick delta << 4) | code), where code is
+	(player - 1) << 2 | direction for a turn, END_ROUND + winner when the round is decided,
+	or ABANDONED if the match stopped mid-round. Tick deltas count from the previous record
+	of the round (from tick 0 for the first one).
+
+Usage:
+	python replay.py replays/*.trr
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+
+from constants import *
+from simulation import GameState, load_bikes
+from snapshot import load_state, save_state
+
+MAGIC = b"TRRP"
+VERSION = 2
+
+# Direction codes of turn records
+DIRECTIONS = [dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]]
+
+# Record codes after the eight turn codes: END_ROUND + winner (0 for a draw), or ABANDONED
+END_ROUND = 8
+ABANDONED = 11
+
+
+def write_varint(output, value):
+	"""Write a non-negative integer as a varint."""
+	data = bytearray()
+	while value >= 0x80:
+		data.append((value & 0x7F) | 0x80)
+		value >>= 7
+	data.append(value)
+	output.write(data)
+
+
+def read_varint(data, offset):
+	"""Read a varint from data at offset.
+
+	Returns:
+		(value, offset after the varint)
+	"""
+	value = 0
+	shift = 0
+	while True:
+		if offset >= len(data):
+			raise ValueError("Replay ends in the middle of a number")
+		byte = data[offset]
+		offset += 1
+		value |= (byte & 0x7F) << shift
+		if byte < 0x80:
+			return value, offset
+		shift += 7
+
+
+class ReplayRound:
+	"""The turns of one round and how it ended."""
+
+	def __init__(self):
+		self.turns = []  # (tick, player, direction) in tick order
+		self.end_tick = None  # Tick the round ended on, or None if it was cut short
+		self.winner = None  # 1, 2 or 0 for a draw, as recorded
+
+
+class Replay:
+	"""A recorded match."""
+
+	def __init__(self, seed, theme, speed, tick_rate, max_score):
+		self.seed = seed
+		self.theme = theme
+		self.speed = speed
+		self.tick_rate = tick_rate
+		self.max_score = max_score
+		self.rounds = []
+
+
+def read_replay(path):
+	"""Load a replay file.
+
+	Returns:
+		Replay object
+	"""
+	with open(path, "rb") as file:
+		data = file.read()
+	if data[:len(MAGIC)] != MAGIC:
+		raise ValueError(f"{path} is not a replay")
+	if data[len(MAGIC)] != VERSION:
+		raise ValueError(f"{path} has unsupported replay version {data[len(MAGIC)]}")
+	offset = len(MAGIC) + 1
+	seed, offset = read_varint(data, offset)
+	speed, = struct.unpack_from("<d", data, offset)
+	offset += 8
+	tick_rate, offset = read_varint(data, offset)
+	max_score, offset = read_varint(data, offset)
+	theme_length, offset = read_varint(data, offset)
+	theme = data[offset:offset + theme_length].decode("ascii")
+	offset += theme_length
+
+	replay = Replay(seed, theme, speed, tick_rate, max_score)
+	current = None
+	tick = 0
+	while offset < len(data):
+		record, offset = read_varint(data, offset)
+		if current is None:
+			current = ReplayRound()
+			replay.rounds.append(current)
+			tick = 0
+		tick += record >> 4
+		code = record & 0xF
+		if code < END_ROUND:
+			current.turns.append((tick, (code >> 2) + 1, DIRECTIONS[code & 3]))
+		else:
+			if code != ABANDONED:
+				current.end_tick = tick
+				current.winner = code - END_ROUND
+			current = None
+	return replay
+
+
+class ReplayRecorder:
+	"""Records the matches played on a GameState into a directory, one file per match.
+
+	Turns are found by comparing each bike's direction after every tick with the one
+	before it, so turns made by players and by the AI are recorded the same way.
+	"""
+
+	def __init__(self, directory):
+		self.directory = directory
+		self.file = None
+		self.in_round = False
+		self.directions = None
+		self.last_tick = 0
+
+	def start_round(self, state):
+		"""Begin recording a round that has just been reset (and its match's file if needed).
+
+		A match is only recorded from its first round; rounds of a match resumed from a
+		snapshot are skipped.
+		"""
+		if state.round_number == 1:
+			self.close()
+		if self.file is None:
+			if state.round_number != 1:
+				return
+			os.makedirs(self.directory, exist_ok=True)
+			name = f"{time.strftime('%Y%m%d-%H%M%S')}-{state.seed}.trr"
+			self.file = open(os.path.join(self.directory, name), "wb")
+			self.file.write(MAGIC + bytes([VERSION]))
+			write_varint(self.file, state.seed)
+			self.file.write(struct.pack("<d", state.speed))
+			write_varint(self.file, state.tick_rate)
+			write_varint(self.file, state.max_score)
+			theme = state.theme.encode("ascii")
+			write_varint(self.file, len(theme))
+			self.file.write(theme)
+		elif self.in_round:
+			self.write_record(self.last_tick, ABANDONED)
+
+		self.in_round = True
+		self.directions = [state.player1.dir, state.player2.dir]
+		self.last_tick = 0
+
+	def record_tick(self, state):
+		"""Record the turns made on the tick just stepped, and the result if the round ended."""
+		if not self.in_round:
+			return
+		for player, bike in enumerate((state.player1, state.player2)):
+			if bike.dir != self.directions[player]:
+				self.directions[player] = bike.dir
+				self.write_record(state.ticks, player << 2 | DIRECTIONS.index(bike.dir))
+		if state.game_over:
+			self.write_record(state.ticks, END_ROUND + state.winner)
+			self.in_round = False
+			self.file.flush()
+
+	def write_record(self, tick, code):
+		"""Write one record at tick."""
+		write_varint(self.file, (tick - self.last_tick) << 4 | code)
+		self.last_tick = tick
+
+	def close(self):
+		"""Finish the current match's file (marking an unfinished round as abandoned)."""
+		if self.file is None:
+			return
+		if self.in_round:
+			self.write_record(self.last_tick, ABANDONED)
+			self.in_round = False
+		self.file.close()
+		self.file = None
+
+
+class ReplayPlayer:
+	"""Re-simulates a replay tick by tick, keeping a snapshot of the state every few ticks.
+
+	Seeking restores the nearest snapshot at or before the target and only simulates the
+	ticks after it. Rounds cut short are played up to their last recorded turn.
+	"""
+
+	def __init__(self, replay, player1, player2, snapshot_interval=300):
+		self.replay = replay
+		self.snapshot_interval = snapshot_interval  # Ticks between snapshots (None for no snapshots)
+		self.state = GameState(player1, player2, replay.theme, replay.speed, max_score=replay.max_score,
+		                       seed=replay.seed, tick_rate=replay.tick_rate)
+		self.snapshots = {}  # (round index, tick) -> snapshot bytes
+		self.round_index = -1
+		self.round = None
+		self.turn_index = 0  # Next turn of the round to apply
+		self.last_tick = 0  # Tick the current round stops at
+
+	def position(self):
+		"""Get the (round index, tick) the state is at."""
+		return self.round_index, self.state.ticks
+
+	def round_finished(self):
+		"""Check if the current round has no ticks left to simulate."""
+		return self.round is None or self.state.game_over or self.state.ticks >= self.last_tick
+
+	def enter_round(self, round_index):
+		"""Make round_index the current round (the state must already be in it)."""
+		self.round_index = round_index
+		self.round = self.replay.rounds[round_index]
+		if self.round.end_tick is not None:
+			self.last_tick = self.round.end_tick
+		elif self.round.turns:
+			self.last_tick = self.round.turns[-1][0]
+		else:
+			self.last_tick = 0
+		self.turn_index = sum(1 for tick, _, _ in self.round.turns if tick <= self.state.ticks)
+
+	def next_round(self):
+		"""Reset the state for the next round.
+
+		Returns:
+			False if the replay has no more rounds
+		"""
+		if self.round_index + 1 >= len(self.replay.rounds):
+			return False
+		self.state.reset_round()
+		self.enter_round(self.round_index + 1)
+		self.take_snapshot()
+		return True
+
+	def step(self):
+		"""Simulate the next tick of the current round."""
+		tick = self.state.ticks + 1
+		bikes = (self.state.player1, self.state.player2)
+		while self.turn_index < len(self.round.turns) and self.round.turns[self.turn_index][0] == tick:
+			_, player, direction = self.round.turns[self.turn_index]
+			bike = bikes[player - 1]
+			bike.last_turn_direction = bike.dir
+			bike.dir = direction
+			bike.last_turn_time = self.state.next_tick_time()
+			self.turn_index += 1
+		self.state.step()
+		if self.snapshot_interval and self.state.ticks % self.snapshot_interval == 0:
+			self.take_snapshot()
+
+	def take_snapshot(self):
+		"""Keep a snapshot of the current position (once)."""
+		if self.snapshot_interval and self.position() not in self.snapshots:
+			self.snapshots[self.position()] = save_state(self.state)
+
+	def seek(self, round_index, tick):
+		"""Move to a tick of a round, stopping early if the round ends before it."""
+		target = (round_index, tick)
+		earlier = [position for position in self.snapshots if position <= target]
+		if earlier:
+			nearest = max(earlier)
+			# Restore unless simulating on from the current position is shorter
+			if not nearest <= self.position() <= target:
+				load_state(self.state, self.snapshots[nearest])
+				self.enter_round(nearest[0])
+
+		while self.position() < target:
+			if not self.round_finished():
+				self.step()
+			elif self.round_index >= round_index or not self.next_round():
+				break
+
+
+def play_replay(replay, player1, player2):
+	"""Re-simulate a replay from the start without snapshots, yielding after every tick.
+
+	Yields:
+		(GameState, ReplayRound) after each tick
+	"""
+	player = ReplayPlayer(replay, player1, player2, snapshot_interval=None)
+	while player.next_round():
+		while not player.round_finished():
+			player.step()
+			yield player.state, player.round
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Re-simulate replays headlessly and check their results.")
+	parser.add_argument("replays", nargs="+", help="replay files")
+	args = parser.parse_args()
+
+	diverged = 0
+	for path in args.replays:
+		replay = read_replay(path)
+		player1, player2 = load_bikes(replay.theme)
+		start = time.perf_counter()
+		ticks = 0
+		results = []
+		for state, replay_round in play_replay(replay, player1, player2):
+			ticks += 1
+			if state.game_over or state.ticks == replay_round.end_tick:
+				results.append((replay_round, state.ticks, state.winner if state.game_over else None))
+		elapsed = time.perf_counter() - start
+
+		print(f"{path}: seed {replay.seed}, {replay.theme}, speed {replay.speed:g} at {replay.tick_rate} Hz, "
+		      f"{ticks} ticks in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+		for number, (replay_round, end_tick, winner) in enumerate(results, 1):
+			matches = (end_tick, winner) == (replay_round.end_tick, replay_round.winner)
+			if not matches:
+				diverged += 1
+			print(f"  round {number}: winner {winner} at tick {end_tick}, recorded "
+			      f"{replay_round.winner} at tick {replay_round.end_tick}{'' if matches else '  DIVERGED'}")
+	sys.exit(1 if diverged else 0)
+
+
+if __name__ == "__main__":
+	main()
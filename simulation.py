@@ -0,0 +1,516 @@
+"""Headless game simulation for TRON Lightcycles game.
+
+Runs a round's rules (movement, collisions, power-ups and the outcome) without a window,
+mixer or fonts, so rounds can be simulated as fast as the CPU allows. run_game drives the
+same GameState for rendering.
+"""
+import math
+import random
+import pygame
+
+from arena import Arena
+from bike import Bike, get_trail_margin
+from constants import *
+from obstacle import Obstacle
+from powerup import PowerUp
+
+# Sprite images and scale factor for each theme: (player 1 image, player 2 image, scale factor)
+BIKE_IMAGES = {
+	"82": ("images/blue_lightcycle_82.png", "images/orange_lightcycle_82.png", .05),
+	"LEGACY": ("images/blue_lightcycle_legacy.png", "images/orange_lightcycle_legacy.png", .04),
+	"ARES": ("images/blue_lightcycle_legacy.png", "images/red_lightcycle_ares.png", .04),
+	"RECONFIGURED": ("images/green_lightcycle_reconfigured.png", "images/yellow_lightcycle_reconfigured.png", .045),
+	"UPRISING": ("images/blue_lightcycle_legacy.png", "images/orange_lightcycle_legacy.png", .04),
+}
+
+# Color and name of each theme's bikes: (player 1, player 2)
+BIKE_COLORS = {
+	"82": ((BLUE, "Blue"), (ORANGE, "Orange")),
+	"LEGACY": ((BLUE, "Blue"), (ORANGE, "Orange")),
+	"ARES": ((BLUE, "Blue"), (RED, "Red")),
+	"RECONFIGURED": ((GREEN, "Green"), (YELLOW, "Yellow")),
+	"UPRISING": ((BLUE, "Blue"), (ORANGE, "Orange")),
+}
+
+
+def load_bikes(theme):
+	"""Load a theme's two bikes without a display (sprites are not converted for blitting).
+
+	Returns:
+		(player1, player2) Bike objects sized like the ones run_game uses
+	"""
+	p1_image, p2_image, scale_factor = BIKE_IMAGES[theme]
+	bikes = []
+	size = None
+	for path, (color, name) in zip((p1_image, p2_image), BIKE_COLORS[theme]):
+		image = pygame.transform.flip(pygame.image.load(path), True, False)
+		if size is None:
+			# Both bikes are scaled to player 1's size
+			size = (int(image.get_width() * scale_factor), int(image.get_height() * scale_factor))
+		sprite = pygame.transform.scale(image, size)
+		bikes.append(Bike(sprite, color, name, pygame.mask.from_surface(sprite), (WIDTH, HEIGHT), BLOCK_SIZE))
+	return bikes[0], bikes[1]
+
+
+def time_of_impact(rect1, velocity1, rect2, velocity2):
+	"""Find when two axis-aligned rectangles moving at constant velocities first touch.
+
+	Args:
+		rect1, rect2: pygame.Rect of each mover at time 0
+		velocity1, velocity2: (vx, vy) distance each mover covers by time 1
+
+	Returns:
+		Time in [0, 1] of first contact, or None if they don't touch in that time
+	"""
+	# Move rect1 relative to rect2, which then stands still
+	rel_vx = velocity1[0] - velocity2[0]
+	rel_vy = velocity1[1] - velocity2[1]
+	enter, leave = 0.0, 1.0
+
+	for low1, high1, low2, high2, v in [(rect1.left, rect1.right, rect2.left, rect2.right, rel_vx),
+	                                    (rect1.top, rect1.bottom, rect2.top, rect2.bottom, rel_vy)]:
+		if v == 0:
+			if high1 <= low2 or high2 <= low1:
+				return None  # Never overlap on this axis
+			continue
+		t1 = (low2 - high1) / v
+		t2 = (high2 - low1) / v
+		enter = max(enter, min(t1, t2))
+		leave = min(leave, max(t1, t2))
+		if enter > leave:
+			return None
+
+	return enter
+
+
+def bikes_may_collide(bike1, speed1, bike2, speed2):
+	"""Cheap broad phase: check if two bikes' sprite boxes can touch while they move this frame.
+
+	Args:
+		bike1, bike2: Bike objects about to move in their current directions
+		speed1, speed2: Distance each bike will move this tick
+
+	Returns:
+		True if pixel-perfect bike-to-bike checks are needed this frame
+	"""
+	orientation1 = bike1.get_orientation()
+	orientation2 = bike2.get_orientation()
+	if orientation1 is None or orientation2 is None:
+		return False
+
+	# Grow the boxes a little to cover rounding of sprite positions
+	rect1 = orientation1.get_rect(bike1.pos).inflate(4, 4)
+	rect2 = orientation2.get_rect(bike2.pos).inflate(4, 4)
+	velocity1 = (orientation1.direction[0] * speed1, orientation1.direction[1] * speed1)
+	velocity2 = (orientation2.direction[0] * speed2, orientation2.direction[1] * speed2)
+	return time_of_impact(rect1, velocity1, rect2, velocity2) is not None
+
+
+def check_mask_collision(bike1, bike2, pos1=None, pos2=None):
+	"""Check if two bikes collide using pixel-perfect mask collision detection.
+
+	Args:
+		bike1: First Bike object
+		bike2: Second Bike object
+		pos1, pos2: Optional back positions to test instead of the bikes' current ones
+
+	Returns:
+		True if masks overlap, False otherwise
+	"""
+	# Get the precomputed rotated sprites and masks for each bike's direction
+	orientation1 = bike1.get_orientation()
+	orientation2 = bike2.get_orientation()
+
+	if orientation1 is None or orientation2 is None:
+		return False  # One or both bikes not moving
+
+	# Rotated sprite rectangles (matching blit_bike_with_front_at logic)
+	rect1 = orientation1.get_rect(bike1.pos if pos1 is None else pos1)
+	rect2 = orientation2.get_rect(bike2.pos if pos2 is None else pos2)
+
+	# Masks can't overlap unless their rectangles do
+	if not rect1.colliderect(rect2):
+		return False
+
+	# Calculate offset between the two masks
+	offset = (int(rect2.left - rect1.left), int(rect2.top - rect1.top))
+
+	# Check if masks overlap
+	overlap = orientation1.mask.overlap(orientation2.mask, offset)
+
+	return overlap is not None
+
+
+class GameState:
+	"""A TRON Lightcycles match: the score plus the current round's bikes, obstacles,
+	power-ups, game clock and outcome.
+
+	Nothing here is global, so any number of matches can run side by side. The bikes may be
+	replaced between rounds (e.g. after a theme change) before calling reset_round().
+	"""
+
+	def __init__(self, player1, player2, theme, speed=SPEED, width=WIDTH, height=HEIGHT, max_score=MAX_SCORE,
+	             seed=None, tick_rate=TICK_RATE):
+		self.player1 = player1
+		self.player2 = player2
+		self.theme = theme  # Only affects how power-ups look
+		self.speed = speed  # Pixels per second
+		self.set_tick_rate(tick_rate)
+		self.width = width
+		self.height = height
+		self.arena = Arena(width, height)
+		self.obstacles = []
+		self.powerups = []
+		self.ticks = 0  # Ticks played this round
+		self.time = 0  # Game time of the last tick in milliseconds
+		self.last_powerup_spawn = 0
+		self.game_over = False
+		self.winner = None  # 1 or 2 for the winning player, 0 for a draw
+		self.crash_cause = None  # What ended the round: "wall", "obstacle", "trail" or "bike"
+		self.max_score = max_score
+		self.new_match(seed)
+
+	def set_tick_rate(self, tick_rate):
+		"""Set how many ticks the simulation runs per second of game time."""
+		self.tick_rate = tick_rate
+		self.tick_time = 1000 / tick_rate  # Milliseconds per tick
+
+	def new_match(self, seed=None):
+		"""Clear the score for a new match and reseed its random number generator.
+
+		Starting positions, obstacles and power-ups are only drawn from the match's own
+		generator, so the seed and the inputs of each tick reproduce every round exactly.
+
+		Args:
+			seed: Integer seed for the match (a random one if None)
+		"""
+		if seed is None:
+			seed = random.randrange(2 ** 32)
+		self.seed = seed
+		self.rng = random.Random(seed)
+		self.p1_wins = 0
+		self.p2_wins = 0
+		self.match_over = False
+		self.round_number = 0  # Rounds started this match
+
+	def reset_round(self):
+		"""Place the bikes, clear power-ups and lay out new obstacles for a new round."""
+		self.round_number += 1
+		self.place_bikes()
+		self.powerups.clear()
+		self.generate_obstacles()
+		self.ticks = 0
+		self.time = 0
+		self.last_powerup_spawn = 0
+		self.game_over = False
+		self.winner = None
+		self.crash_cause = None
+
+	def set_trail_margins(self):
+		"""Set how much of each bike's newest trail it can never hit, for the match speed."""
+		for bike in (self.player1, self.player2):
+			bike.trail_safety_margin = get_trail_margin(Bike.TRAIL_SAFETY_BLOCKS, self.speed, BLOCK_SIZE)
+
+	def place_bikes(self):
+		"""Reset bike positions and trails for a new round."""
+		self.set_trail_margins()
+		width, height = self.width, self.height
+		top_left = [dirs["DOWN"], [width // 4, 35]]
+		top_right = [dirs["DOWN"], [3 * width // 4, 35]]
+		bottom_left = [dirs["UP"], [width // 4, height - 35]]
+		bottom_right = [dirs["UP"], [3 * width // 4, height - 35]]
+		left_top = [dirs["RIGHT"], [35, height // 4]]
+		left_bottom = [dirs["RIGHT"], [35, 3 * height // 4]]
+		right_top = [dirs["LEFT"], [width - 35, height // 4]]
+		right_bottom = [dirs["LEFT"], [width - 35, 3 * height // 4]]
+
+		pos = [
+			top_left,
+			top_right,
+			bottom_left,
+			bottom_right,
+			right_top,
+			right_bottom,
+			left_top,
+			left_bottom
+		]
+
+		# Each start and the start in the adjacent corner
+		adjacent = [
+			(top_left, left_top),
+			(top_right, right_top),
+			(bottom_left, left_bottom),
+			(bottom_right, right_bottom),
+			(right_top, top_right),
+			(right_bottom, bottom_right),
+			(left_top, top_left),
+			(left_bottom, bottom_left)
+		]
+
+		p1_start = self.rng.choice(pos)
+		pos.remove(p1_start)
+		too_close = next(other for start, other in adjacent if start is p1_start)
+
+		# Ensure bikes don't start in adjacent corners
+		while True:
+			p2_start = self.rng.choice(pos)
+			if p2_start != too_close:
+				break
+
+		# Set player 1 position and direction
+		self.player1.dir = p1_start[0]
+		self.player1.pos = p1_start[1]
+		self.player1.prev_pos = list(p1_start[1])
+		self.player1.reset_trail()
+		self.player1.reset_status()
+
+		# Set player 2 position and direction
+		self.player2.dir = p2_start[0]
+		self.player2.pos = p2_start[1]
+		self.player2.prev_pos = list(p2_start[1])
+		self.player2.reset_trail()
+		self.player2.reset_status()
+
+	def generate_obstacles(self):
+		"""Generate random obstacles avoiding player positions."""
+		self.obstacles = []
+		self.arena.clear_obstacles()
+
+		NUM_OBSTACLES = self.rng.randint(10, 15)
+		MAX_ATTEMPTS = 100  # Avoid infinite loops
+
+		while len(self.obstacles) < NUM_OBSTACLES:
+			attempt = 0
+			while attempt < MAX_ATTEMPTS:
+				size = self.rng.randint(30, 60)
+				x = self.rng.randrange(0, self.width - size, OBSTACLE_SIZE)
+				y = self.rng.randrange(0, self.height - size, OBSTACLE_SIZE)
+
+				# Create temp obstacle to check for collisions
+				temp_obstacle = Obstacle(x, y, size)
+
+				# Avoid spawning near players (150 pixel margin)
+				if temp_obstacle.is_near_position(self.player1.pos, 150) or \
+				   temp_obstacle.is_near_position(self.player2.pos, 150):
+					attempt += 1
+					continue
+
+				# Check for overlap with existing obstacles
+				overlap = any(temp_obstacle.overlaps_with(obs) for obs in self.obstacles)
+
+				if not overlap:
+					self.obstacles.append(temp_obstacle)
+					self.arena.add_obstacle(temp_obstacle)
+					break
+
+				attempt += 1
+
+			# If we exceeded attempts, just skip this obstacle
+			if attempt >= MAX_ATTEMPTS:
+				break
+
+	def spawn_powerup(self):
+		"""Spawn a new random power-up not overlapping obstacles or trails."""
+		ptype = self.rng.choice(PowerUp.TYPES)
+		size = POWERUP_SIZE
+
+		for _ in range(30):  # try 30 times
+			x = self.rng.randrange(0, self.width - size, POWERUP_SIZE)
+			y = self.rng.randrange(0, self.height - size, POWERUP_SIZE)
+
+			# Avoid obstacles
+			overlap = any(obs.contains_point(x, y) for obs in self.obstacles)
+
+			# Avoid trails - check if powerup overlaps with any trail run
+			if not overlap:
+				powerup_rect = pygame.Rect(x, y, size, size)
+				overlap = self.player1.segments.intersects_rect(powerup_rect) or self.player2.segments.intersects_rect(powerup_rect)
+
+			if not overlap:
+				self.powerups.append(PowerUp(x, y, size, ptype, self.theme))
+				break
+
+	def collect_powerup(self, pu, bike):
+		"""Apply a power-up's effect to the bike that collected it and remove it from the board."""
+		pu.apply_effect(bike, self.time)
+		bike.powerups_collected += 1
+		self.powerups.remove(pu)
+
+	def check_powerup_collision(self, pos, bike):
+		"""Check if a bike hits a power-up and apply effect."""
+		for pu in self.powerups[:]:
+			if pu.contains_point(pos[0], pos[1]):
+				self.collect_powerup(pu, bike)
+
+	def check_trail_powerup_collisions(self):
+		"""Check if any trails cross over power-ups."""
+		for pu in self.powerups[:]:
+			powerup_rect = pygame.Rect(pu.x, pu.y, pu.size, pu.size)
+
+			# Check if player1's trail crosses this power-up
+			if self.player1.segments.intersects_rect(powerup_rect):
+				self.collect_powerup(pu, self.player1)
+				continue
+
+			# Check if player2's trail crosses this power-up
+			if self.player2.segments.intersects_rect(powerup_rect):
+				self.collect_powerup(pu, self.player2)
+
+	def turn(self, bike, direction):
+		"""Turn a bike unless it is frozen, still cooling down, or the turn is straight ahead or back.
+
+		Returns:
+			True if the bike turned
+		"""
+		if bike.is_frozen(self.time) or not bike.can_turn(self.time, turn_cooldown):
+			return False
+		if (direction[0] == 0) == (bike.dir[0] == 0):
+			return False
+		bike.last_turn_direction = bike.dir
+		bike.dir = direction
+		bike.last_turn_time = self.time
+		return True
+
+	def move_bike(self, bike, other_bike, effective_speed, check_bike=True, back_margin=4):
+		"""Move a bike and check for collisions using pixel-perfect mask collision detection.
+
+		Bike-to-bike contact is only tested when check_bike is True (see bikes_may_collide).
+
+		Returns:
+			(collided_player, hit) where collided_player is 0 if nothing was hit, 1 or 2 if that
+			player crashed, or 3 for a bike-to-bike collision, and hit is what was hit (or None)
+		"""
+		if effective_speed <= 0:
+			return 0, None
+
+		# Normalize direction vector
+		mag = math.hypot(bike.dir[0], bike.dir[1])
+		if mag == 0:
+			return 0, None
+		nx, ny = bike.dir[0] / mag, bike.dir[1] / mag
+
+		# Cast the bike's mask along its direction to find how far it can move this frame
+		# and what it hits (wall, obstacle, trail or the other bike)
+		# Only hazards near the bike (broad-phase window) are considered
+		move_distance = effective_speed
+		collided_player = 0
+		hit = None
+		if bike.mask is not None:
+			sprite_width, sprite_height = self.player1.sprite.get_size()
+			move_distance, hit = self.arena.cast(bike, bike.pos, effective_speed, other_bike,
+			                                     (sprite_width + 20, sprite_height + 20), check_bike)
+			if hit == "bike":
+				# Bike-to-bike collision should result in a draw
+				collided_player = 3  # Special value for bike-to-bike collision
+			elif hit is not None:
+				# Regular collision (wall, trail, or obstacle)
+				# The bike stops at the last position where its hitbox doesn't touch anything
+				if bike == self.player1:
+					collided_player = 1
+				else:
+					collided_player = 2
+
+		# Move step-by-step up to the safe distance, laying trail as we go
+		steps = max(1, int(effective_speed))
+		step_size = effective_speed / steps
+		distance_moved = 0.0
+		distance_since_last_trail = 0.0
+
+		while distance_moved + step_size <= move_distance + 1e-9:
+			bike.pos[0] += nx * step_size
+			bike.pos[1] += ny * step_size
+			distance_moved += step_size
+			distance_since_last_trail += step_size
+
+			# Add trail point every BLOCK_SIZE pixels to ensure continuous trail
+			if distance_since_last_trail >= BLOCK_SIZE:
+				new_pos = (int(bike.pos[0]), int(bike.pos[1]))
+				bike.add_trail_point(new_pos)
+				distance_since_last_trail = 0.0
+
+		# Cover the remainder of a partial step up to the contact point
+		if distance_moved < move_distance:
+			bike.pos[0] += nx * (move_distance - distance_moved)
+			bike.pos[1] += ny * (move_distance - distance_moved)
+			distance_since_last_trail += move_distance - distance_moved
+
+		# Add final trail point if we haven't added one recently
+		if distance_since_last_trail > 0 or collided_player:
+			new_pos = (int(bike.pos[0]), int(bike.pos[1]))
+			bike.add_trail_point(new_pos)
+
+		return collided_player, hit
+
+	def end_round(self, winner, crash_cause):
+		"""Finish the round with winner 1 or 2, or 0 for a draw, and update the score."""
+		self.game_over = True
+		self.winner = winner
+		self.crash_cause = crash_cause
+		if winner == 1:
+			self.p1_wins += 1
+		elif winner == 2:
+			self.p2_wins += 1
+		if self.p1_wins >= self.max_score or self.p2_wins >= self.max_score:
+			self.match_over = True
+
+	def next_tick_time(self):
+		"""Get the game time of the next tick on the simulated clock, in milliseconds."""
+		return (self.ticks + 1) * self.tick_time
+
+	def step(self, inputs=(None, None), current_time=None):
+		"""Advance the round by one tick.
+
+		Args:
+			inputs: (player 1 direction, player 2 direction), each a dirs value to turn to or None
+			current_time: Game time of this tick in milliseconds (defaults to the simulated clock,
+				see next_tick_time())
+
+		Returns:
+			True once the round is over (see winner)
+		"""
+		if self.game_over:
+			return True
+
+		self.player1.prev_pos = list(self.player1.pos)
+		self.player2.prev_pos = list(self.player2.pos)
+		self.ticks += 1
+		self.time = self.ticks * self.tick_time if current_time is None else current_time
+
+		if self.time - self.last_powerup_spawn > POWERUP_SPAWN_INTERVAL:
+			self.spawn_powerup()
+			self.last_powerup_spawn = self.time
+
+		for bike, direction in zip((self.player1, self.player2), inputs):
+			if direction is not None:
+				self.turn(bike, direction)
+
+		# Get effective speeds considering status effects
+		tick_speed = self.speed / self.tick_rate
+		effective_speed_p1 = self.player1.get_effective_speed(tick_speed, self.time)
+		effective_speed_p2 = self.player2.get_effective_speed(tick_speed, self.time)
+
+		# Bike-to-bike checks are only needed if the bikes can meet this frame
+		bikes_close = bikes_may_collide(self.player1, effective_speed_p1, self.player2, effective_speed_p2)
+
+		# Move both bikes
+		collided1, hit1 = self.move_bike(self.player1, self.player2, effective_speed_p1, bikes_close)
+		collided2, hit2 = self.move_bike(self.player2, self.player1, effective_speed_p2, bikes_close)
+
+		# Bike-to-bike collisions (while moving or after both have moved) are a draw,
+		# otherwise whoever crashed loses
+		if collided1 == 3 or collided2 == 3:
+			self.end_round(0, "bike")
+		elif collided1 == 1:
+			self.end_round(2, hit1)
+		elif collided2 == 2:
+			self.end_round(1, hit2)
+		elif bikes_close and check_mask_collision(self.player1, self.player2):
+			self.end_round(0, "bike")
+
+		# --- Power-up collisions ---
+		sprite_width = self.player1.sprite.get_width()
+		self.check_powerup_collision(self.player1.get_front_pos(sprite_width), self.player1)
+		self.check_powerup_collision(self.player2.get_front_pos(sprite_width), self.player2)
+		self.check_trail_powerup_collisions()
+
+		return self.game_over
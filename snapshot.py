@@ -0,0 +1,173 @@
+"""Game state snapshots for TRON Lightcycles game.
+
+A snapshot is a compact binary copy of everything a GameState needs to carry on exactly
+where it left off: the match (seed, random generator, scores), the round's clock,
+obstacles and power-ups, and each bike's position, direction, status timers and trail.
+Sprites are not included; snapshots are restored into a GameState whose bikes have
+already been built for the theme.
+
+Numbers are little-endian; variable-length parts are arrays prefixed with their length.
+"""
+import random
+import struct
+import sys
+from array import array
+
+from constants import *
+from obstacle import Obstacle
+from powerup import PowerUp
+
+MAGIC = b"TRSS"
+VERSION = 2
+
+# Direction codes, -1 for none
+DIRECTIONS = [dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]]
+
+# Crash cause codes, 0 for none
+CRASH_CAUSES = [None, "wall", "obstacle", "trail", "bike"]
+
+# seed, speed, tick rate, max score, p1 wins, p2 wins, match over, round number,
+# ticks, time, last power-up spawn, game over, winner (-1 for none), crash cause
+MATCH_FORMAT = struct.Struct("<QdHHHH?IIdd?bB")
+
+# pos x, pos y, direction, last turn direction, frozen/slow/fast until, last turn time, power-ups collected
+BIKE_FORMAT = struct.Struct("<ddbbddddH")
+
+COUNT_FORMAT = struct.Struct("<I")
+
+
+def pack_array(typecode, values):
+	"""Pack values as a length-prefixed little-endian array."""
+	data = array(typecode, values)
+	if sys.byteorder == "big":
+		data.byteswap()
+	return COUNT_FORMAT.pack(len(data)) + data.tobytes()
+
+
+def unpack_array(typecode, blob, offset):
+	"""Unpack a length-prefixed little-endian array from blob at offset.
+
+	Returns:
+		(array, offset after it)
+	"""
+	count, = COUNT_FORMAT.unpack_from(blob, offset)
+	offset += COUNT_FORMAT.size
+	data = array(typecode)
+	end = offset + count * data.itemsize
+	data.frombytes(blob[offset:end])
+	if sys.byteorder == "big":
+		data.byteswap()
+	return data, end
+
+
+def get_trail_corners(segments):
+	"""Get the fewest block positions that lay a SegmentTrail again, oldest first."""
+	corners = []
+	for segment in segments:
+		# A run continues from the end of the one before unless the trail jumped
+		for pos in (segment.start, segment.end):
+			if not corners or corners[-1] != pos:
+				corners.append(pos)
+	return corners
+
+
+def direction_code(direction):
+	"""Get the code of a direction (-1 for none)."""
+	return DIRECTIONS.index(direction) if direction in DIRECTIONS else -1
+
+
+def save_state(state):
+	"""Serialize a GameState.
+
+	Returns:
+		Snapshot bytes
+	"""
+	version, internal_state, gauss_next = state.rng.getstate()
+	parts = [
+		MAGIC + bytes([VERSION]),
+		MATCH_FORMAT.pack(state.seed, state.speed, state.tick_rate, state.max_score, state.p1_wins, state.p2_wins,
+		                  state.match_over, state.round_number, state.ticks, state.time,
+		                  state.last_powerup_spawn, state.game_over,
+		                  -1 if state.winner is None else state.winner,
+		                  CRASH_CAUSES.index(state.crash_cause)),
+		pack_array("B", state.theme.encode("ascii")),
+		pack_array("I", internal_state),
+		struct.pack("<?d", gauss_next is not None, gauss_next or 0.0),
+	]
+
+	for bike in (state.player1, state.player2):
+		parts.append(BIKE_FORMAT.pack(bike.pos[0], bike.pos[1], direction_code(bike.dir),
+		                              direction_code(bike.last_turn_direction), bike.frozen_until,
+		                              bike.slow_until, bike.fast_until, bike.last_turn_time,
+		                              bike.powerups_collected))
+		parts.append(pack_array("h", [coord for pos in get_trail_corners(bike.segments) for coord in pos]))
+
+	parts.append(pack_array("h", [value for obstacle in state.obstacles
+	                              for value in (obstacle.x, obstacle.y, obstacle.size)]))
+	parts.append(pack_array("h", [value for pu in state.powerups
+	                              for value in (pu.x, pu.y, pu.size, PowerUp.TYPES.index(pu.type))]))
+	return b"".join(parts)
+
+
+def get_snapshot_theme(blob):
+	"""Get the theme a snapshot was taken in, to build its bikes before calling load_state()."""
+	theme, _ = unpack_array("B", blob, len(MAGIC) + 1 + MATCH_FORMAT.size)
+	return theme.tobytes().decode("ascii")
+
+
+def load_state(state, blob):
+	"""Restore a GameState from a snapshot made by save_state().
+
+	The state's bikes must already be built for the snapshot's theme.
+	"""
+	if blob[:len(MAGIC)] != MAGIC:
+		raise ValueError("Not a game state snapshot")
+	if blob[len(MAGIC)] != VERSION:
+		raise ValueError(f"Unsupported snapshot version {blob[len(MAGIC)]}")
+	offset = len(MAGIC) + 1
+
+	(state.seed, state.speed, tick_rate, state.max_score, state.p1_wins, state.p2_wins, state.match_over,
+	 state.round_number, state.ticks, state.time, state.last_powerup_spawn, state.game_over,
+	 winner, crash_cause) = MATCH_FORMAT.unpack_from(blob, offset)
+	offset += MATCH_FORMAT.size
+	state.set_tick_rate(tick_rate)
+	state.set_trail_margins()
+	state.winner = None if winner < 0 else winner
+	state.crash_cause = CRASH_CAUSES[crash_cause]
+
+	theme, offset = unpack_array("B", blob, offset)
+	state.theme = theme.tobytes().decode("ascii")
+
+	internal_state, offset = unpack_array("I", blob, offset)
+	has_gauss, gauss_next = struct.unpack_from("<?d", blob, offset)
+	offset += struct.calcsize("<?d")
+	state.rng = random.Random()
+	state.rng.setstate((3, tuple(internal_state), gauss_next if has_gauss else None))
+
+	for bike in (state.player1, state.player2):
+		(x, y, direction, last_turn_direction, bike.frozen_until, bike.slow_until, bike.fast_until,
+		 bike.last_turn_time, bike.powerups_collected) = BIKE_FORMAT.unpack_from(blob, offset)
+		offset += BIKE_FORMAT.size
+		bike.pos = [x, y]
+		bike.prev_pos = [x, y]
+		bike.dir = DIRECTIONS[direction] if direction >= 0 else (0, 0)
+		bike.last_turn_direction = DIRECTIONS[last_turn_direction] if last_turn_direction >= 0 else None
+
+		# Laying the trail again through its corners rebuilds its segments and masks
+		trail, offset = unpack_array("h", blob, offset)
+		bike.reset_trail()
+		for index in range(0, len(trail), 2):
+			bike.add_trail_point((trail[index], trail[index + 1]))
+
+	obstacles, offset = unpack_array("h", blob, offset)
+	state.obstacles = []
+	state.arena.clear_obstacles()
+	for index in range(0, len(obstacles), 3):
+		obstacle = Obstacle(obstacles[index], obstacles[index + 1], obstacles[index + 2])
+		state.obstacles.append(obstacle)
+		state.arena.add_obstacle(obstacle)
+
+	powerups, offset = unpack_array("h", blob, offset)
+	state.powerups = [PowerUp(powerups[index], powerups[index + 1], powerups[index + 2],
+	                          PowerUp.TYPES[powerups[index + 3]], state.theme)
+	                  for index in range(0, len(powerups), 4)]
@@ -0,0 +1,101 @@
+"""Tests for Arena.cast against a per-pixel reference sweep."""
+import math
+import random
+
+import pygame
+import pytest
+
+from constants import *
+from simulation import GameState, load_bikes
+
+
+def reference_cast(arena, bike, pos, distance, other_bike, check_bike=True):
+	"""Sweep the bike one sample at a time, testing every sample against the whole arena."""
+	orientation = bike.get_orientation()
+	if orientation is None or distance <= 0:
+		return 0, None
+	steps = max(1, math.ceil(distance))
+	step_size = distance / steps
+	ux, uy = orientation.direction
+	other_orientation = other_bike.get_orientation()
+
+	for count in range(1, steps + 1):
+		sample = (pos[0] + ux * step_size * count, pos[1] + uy * step_size * count)
+		if orientation.leaves_arena(sample, arena.size):
+			return step_size * (count - 1), "wall"
+
+		rect = orientation.get_rect(sample)
+		contact_offset = (rect.left - orientation.contact_margin, rect.top - orientation.contact_margin)
+		for name, layer in [("obstacle", arena.obstacle_mask), ("trail", other_bike.trail_mask),
+		                    ("trail", bike.settled_trail_mask)]:
+			if layer.overlap(orientation.contact_mask, contact_offset) is not None:
+				return step_size * (count - 1), name
+
+		if check_bike and other_orientation is not None:
+			other_rect = other_orientation.get_rect(other_bike.pos)
+			offset = (other_rect.left - rect.left, other_rect.top - rect.top)
+			if orientation.mask.overlap(other_orientation.mask, offset) is not None:
+				return step_size * (count - 1), "bike"
+
+	return distance, None
+
+
+def same_mask(mask, expected):
+	"""Check that two masks have exactly the same bits set."""
+	return mask.count() == expected.count() == mask.overlap_area(expected, (0, 0))
+
+
+def rects_mask(size, rects):
+	"""Build a mask with every rectangle filled."""
+	mask = pygame.mask.Mask(size)
+	for rect in rects:
+		mask.draw(pygame.mask.Mask(rect.size, fill=True), rect.topleft)
+	return mask
+
+
+def test_masks_hold_obstacles_and_trails(play_ai):
+	player1, player2 = load_bikes("LEGACY")
+	state = GameState(player1, player2, "LEGACY", seed=3)
+	for _ in range(2):
+		state.reset_round()
+		obstacle_rects = [pygame.Rect(obstacle.x, obstacle.y, obstacle.size, obstacle.size) for obstacle in state.obstacles]
+		assert same_mask(state.arena.obstacle_mask, rects_mask(state.arena.size, obstacle_rects))
+		assert player1.trail_mask.count() == player1.settled_trail_mask.count() == 0
+
+		play_ai(state, 300)
+		for bike in (player1, player2):
+			trail = bike.segments
+			assert same_mask(bike.trail_mask, rects_mask(state.arena.size, trail.get_rects()))
+			settled_rects = trail.get_rects_between(-1, trail.length - bike.trail_safety_margin)
+			assert same_mask(bike.settled_trail_mask, rects_mask(state.arena.size, settled_rects))
+			assert 0 < bike.settled_trail_mask.count() < bike.trail_mask.count()
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY"])
+@pytest.mark.parametrize("seed", range(3))
+def test_cast_matches_reference(theme, seed, play_ai):
+	player1, player2 = load_bikes(theme)
+	state = GameState(player1, player2, theme, seed=seed)
+	state.reset_round()
+	play_ai(state, 600)
+	window_size = (player1.sprite.get_width() + 20, player1.sprite.get_height() + 20)
+
+	rng = random.Random(seed)
+	hits = set()
+	for _ in range(150):
+		bike, other_bike = rng.choice([(player1, player2), (player2, player1)])
+		bike.dir = rng.choice([dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]])
+		pos = (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+		if bike.get_orientation().leaves_arena(pos, state.arena.size):
+			continue  # Bikes never start a move already outside the arena
+		distance = rng.uniform(0.5, 120)
+		check_bike = rng.random() < 0.8
+
+		expected_distance, expected_hit = reference_cast(state.arena, bike, pos, distance, other_bike, check_bike)
+		safe_distance, hit = state.arena.cast(bike, pos, distance, other_bike, window_size, check_bike)
+		assert hit == expected_hit
+		assert safe_distance == pytest.approx(expected_distance)
+		hits.add(hit)
+
+	# The random sweeps should have run into more than just walls
+	assert {None, "wall", "trail"} <= hits
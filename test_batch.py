@@ -0,0 +1,27 @@
+"""Tests for the headless batch runner."""
+import pytest
+
+import batch
+from constants import SPEED
+
+
+@pytest.mark.parametrize("tick_rate", [60, 240])
+@pytest.mark.parametrize("controller", ["ai", "random"])
+def test_play_match(tick_rate, controller):
+	batch.init_worker("LEGACY")
+	job = (5, "LEGACY", SPEED, tick_rate, controller, 2, 120)
+	rows = batch.play_match(job)
+
+	assert rows
+	for number, row in enumerate(rows, 1):
+		result = dict(zip(batch.RESULT_FIELDS, row))
+		assert len(row) == len(batch.RESULT_FIELDS)
+		assert (result["seed"], result["round"]) == (5, number)
+		assert result["winner"] in (0, 1, 2)
+		assert result["cause"] in ("wall", "obstacle", "trail", "bike")
+		assert result["duration_ms"] == round(result["ticks"] * 1000 / tick_rate)
+		assert result["p1_trail"] > 0 and result["p2_trail"] > 0
+
+	# The match ran to the maximum score, and the same job plays out the same way again
+	assert max(rows[-1][-2:]) == 2
+	assert batch.play_match(job) == rows
@@ -0,0 +1,142 @@
+"""Tests for the game's rendering and screens, drawn on the dummy video driver."""
+import random
+
+import pygame
+import pytest
+
+
+@pytest.fixture
+def game():
+	"""The game module; importing it opens the window and loads the fonts, images and sounds."""
+	try:
+		import functions
+	except FileNotFoundError as error:
+		pytest.skip(f"The game's assets could not be loaded: {error}")
+	return functions
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY", "RECONFIGURED"])
+def test_background_is_rendered_once(game, monkeypatch, theme):
+	monkeypatch.setattr(game, "theme", theme)
+	monkeypatch.setattr(game, "grid_backgrounds", {})
+	rendered = []
+	render_tron_grid = game.render_tron_grid
+	monkeypatch.setattr(game, "render_tron_grid", lambda *args: rendered.append(args) or render_tron_grid(*args))
+
+	expected = pygame.Surface(game.WIN.get_size()).convert()
+	render_tron_grid(expected)
+	for _ in range(3):
+		game.WIN.fill(game.BLACK)
+		game.draw_tron_grid(game.WIN)
+		assert pygame.image.tobytes(game.WIN, "RGB") == pygame.image.tobytes(expected, "RGB")
+	assert len(rendered) == 1
+
+
+def test_bike_bounds_cover_the_bike_and_glow(game, monkeypatch):
+	monkeypatch.setattr(game, "theme", "LEGACY")
+	rng = random.Random(0)
+	for bike in game.load_bikes("LEGACY"):
+		for _ in range(100):
+			bike.dir = rng.choice([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)])
+			bike.prev_pos = [rng.uniform(100, 800), rng.uniform(100, 800)]
+			bike.pos = [bike.prev_pos[0] + bike.dir[0] * 6, bike.prev_pos[1] + bike.dir[1] * 6]
+			interpolation = rng.random()
+
+			# Everything drawn for the bike is inside the rectangle a dirty frame updates
+			game.WIN.fill(game.BLACK)
+			game.draw_bike_glow(bike, interpolation=interpolation)
+			bike.render(game.WIN, interpolation)
+			drawn = pygame.mask.from_threshold(game.WIN, game.BLACK, (1, 1, 1, 255))
+			drawn.invert()
+			bounds = game.get_bike_bounds(bike, interpolation)
+			assert drawn.count() > 0
+			assert bounds.contains(drawn.get_bounding_rects()[0].unionall(drawn.get_bounding_rects()))
+
+
+def test_bikes_draw_from_their_orientations(game, monkeypatch):
+	monkeypatch.setattr(game, "glow_surfaces", {})
+	bike = game.load_bikes("82")[1]
+	expected = pygame.Surface(game.WIN.get_size())
+	for direction in [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)]:
+		bike.dir = direction
+		bike.prev_pos, bike.pos = [400, 300], [400.5, 307.25]
+
+		# Drawn where the original blit put the rotated sprite
+		game.WIN.fill(game.BLACK)
+		bike.render(game.WIN, 0.5)
+		expected.fill(game.BLACK)
+		game.blit_bike_with_front_at(expected, bike.sprite, bike.get_render_pos(0.5), direction, back_margin=4)
+		assert pygame.image.tobytes(game.WIN, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+	# Glows are drawn once per color and shape until the theme changes
+	glow = game.get_glow_surface(bike.color, 27, 12, 80)
+	assert game.get_glow_surface(bike.color, 27, 12, 80) is glow
+	assert game.get_glow_surface(bike.color, 12, 27, 80) is not glow
+	game.clear_render_caches()
+	assert game.get_glow_surface(bike.color, 27, 12, 80) is not glow
+
+
+class LeaveMenu(Exception):
+	"""Raised by a test to get out of a menu's loop."""
+
+
+def test_menu_waits_for_events_and_redraws_when_exposed(game, monkeypatch):
+	monkeypatch.setattr(game, "theme", "82")
+	monkeypatch.setattr(game, "SPEED", game.SPEED)
+	monkeypatch.setattr(game, "difficulty", game.difficulty, raising=False)
+	game.set_theme_fonts()
+	frames = []
+
+	def wait_for_events(timeout=0):
+		"""Cover the window up, then pick NORMAL once it has been drawn again, then leave."""
+		frames.append(pygame.image.tobytes(game.WIN, "RGB"))
+		if len(frames) == 1:
+			game.WIN.fill(game.BLACK)
+			return [pygame.event.Event(pygame.WINDOWEXPOSED)]
+		if len(frames) == 2:
+			return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1)]
+		raise LeaveMenu
+
+	monkeypatch.setattr(game, "wait_for_events", wait_for_events)
+	with pytest.raises(LeaveMenu):
+		game.difficulty_menu()
+
+	# The menu slept on events the whole time, and came back exactly as it was drawn
+	assert frames[1] == frames[0]
+	assert game.SPEED == game.DIFFICULTY_SPEEDS["NORMAL"]
+	assert len(frames) == 3
+
+
+def test_countdown_runs_on_the_clock(game, monkeypatch):
+	monkeypatch.setattr(game, "theme", "82")
+	game.set_theme_fonts()
+	now = [1000]
+	monkeypatch.setattr(pygame.time, "get_ticks", lambda: now[0])
+	monkeypatch.setattr(game, "start_round_music", lambda: None)
+	labels = []
+	draw_countdown = game.draw_countdown
+
+	def record_countdown(state, label):
+		labels.append(label)
+		draw_countdown(state, label)
+
+	monkeypatch.setattr(game, "draw_countdown", record_countdown)
+
+	# A resumed match counts down over the trails already laid
+	state = game.GameState(*game.load_bikes("82"), "82", seed=8)
+	state.reset_round()
+	for _ in range(30):
+		state.step()
+	game.countdown(state)
+	assert game.round_phase == "countdown"
+
+	# Each label is drawn once, and each update says how long until the next one
+	while game.round_phase == "countdown":
+		wait = game.update_countdown(state)
+		if game.round_phase == "countdown":
+			assert wait > 0
+			assert tuple(game.WIN.get_at(state.player1.segments.get_rects()[0].center))[:3] == game.BLUE
+			now[0] += wait
+	assert labels == ["3", "2", "1", "GO!"]
+	assert now[0] - 1000 == 3 * game.COUNTDOWN_STEP + game.COUNTDOWN_GO_TIME
+	assert game.round_phase == "round"
@@ -0,0 +1,14 @@
+"""Tests for the shared solid masks."""
+from masks import solid_mask
+from obstacle import Obstacle
+
+
+def test_solid_masks_are_full_and_shared():
+	mask = solid_mask(7, 3)
+	assert mask.get_size() == (7, 3)
+	assert mask.count() == 21
+	assert solid_mask(7, 3) is mask
+	assert solid_mask(3, 7) is not mask
+
+	# Obstacles of a size share one mask
+	assert Obstacle(0, 0, 40).mask is Obstacle(100, 60, 40).mask is solid_mask(40, 40)
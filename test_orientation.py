@@ -0,0 +1,89 @@
+"""Tests for the precomputed sprite, masks and placement of each facing direction."""
+import random
+
+import pygame
+import pytest
+
+from orientation import Orientation
+from simulation import load_bikes
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY"])
+def test_masks_match_rotated_sprites(theme):
+	for bike in load_bikes(theme):
+		for direction in Orientation.DIRECTIONS:
+			orientation = bike.get_orientation(direction)
+			rotated = pygame.transform.rotate(bike.sprite, orientation.angle)
+			expected = pygame.mask.from_surface(rotated)
+
+			assert orientation.size == rotated.get_size() == orientation.mask.get_size()
+			assert orientation.mask.count() == expected.count() > 0
+			assert orientation.mask.overlap_area(expected, (0, 0)) == expected.count()
+			# Bikes facing along an axis lie along it too
+			long_side = 0 if direction[0] != 0 else 1
+			assert orientation.size[long_side] == bike.sprite.get_width()
+
+		# Facing the opposite way turns the bike half round
+		for direction in [(1, 0), (0, 1)]:
+			opposite = bike.get_orientation((-direction[0], -direction[1]))
+			turned = pygame.mask.from_surface(pygame.transform.flip(bike.get_orientation(direction).surface, True, True))
+			assert opposite.mask.overlap_area(turned, (0, 0)) == turned.count() == opposite.mask.count()
+		assert bike.get_orientation((0, 0)) is None
+
+
+def offset_sweep_hit(orientation, rect_mask, offset):
+	"""Test a solid rectangle against the plain mask at each nudged offset, as contact was found before."""
+	dx, dy = orientation.direction
+	if dx == 0:
+		# Facing up or down: every offset up to 6 pixels away
+		nudges = [(x, y) for x in range(-6, 7) for y in range(-6, 7)]
+	else:
+		# Facing left or right: the offset and the 4 adjacent ones
+		nudges = [(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)]
+	return any(orientation.mask.overlap(rect_mask, (offset[0] + x, offset[1] + y)) is not None for x, y in nudges)
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY"])
+def test_contact_mask_matches_offset_sweep(theme):
+	rng = random.Random(theme)
+	bike = load_bikes(theme)[0]
+	for direction in Orientation.DIRECTIONS:
+		orientation = bike.get_orientation(direction)
+		margin = orientation.contact_margin
+		width, height = orientation.size
+		hits = 0
+		for _ in range(400):
+			size = rng.choice([(5, 5), (5, 5), (rng.randint(30, 60),) * 2])
+			rect_mask = pygame.mask.Mask(size, fill=True)
+			# Rectangle offset from the top-left of the rotated sprite, anywhere near the sprite
+			offset = (rng.randint(-size[0] - 8, width + 8), rng.randint(-size[1] - 8, height + 8))
+			expected = offset_sweep_hit(orientation, rect_mask, offset)
+			hit = orientation.contact_mask.overlap(rect_mask, (offset[0] + margin, offset[1] + margin)) is not None
+			assert hit == expected
+			hits += hit
+		assert 0 < hits < 400
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY"])
+def test_wall_tests_match_mask_area(theme):
+	rng = random.Random(theme)
+	bike = load_bikes(theme)[0]
+	arena_size = (300, 200)
+	arena = pygame.mask.Mask(arena_size, fill=True)
+	for direction in Orientation.DIRECTIONS:
+		orientation = bike.get_orientation(direction)
+
+		def outside(pos):
+			"""Check by counting the mask's pixels inside the arena."""
+			return arena.overlap_area(orientation.mask, orientation.get_rect(pos).topleft) != orientation.mask.count()
+
+		for _ in range(300):
+			pos = (rng.uniform(-40, arena_size[0] + 40), rng.uniform(-40, arena_size[1] + 40))
+			assert orientation.leaves_arena(pos, arena_size) == outside(pos)
+
+			# Moving up to the wall distance stays inside, a pixel further does not
+			if not outside(pos):
+				distance = orientation.get_wall_distance(pos, arena_size)
+				dx, dy = direction
+				assert not outside((pos[0] + dx * (distance - 1), pos[1] + dy * (distance - 1)))
+				assert outside((pos[0] + dx * (distance + 1), pos[1] + dy * (distance + 1)))
@@ -0,0 +1,26 @@
+"""Tests for the least recently used cache of rendered surfaces."""
+from render_cache import RenderCache
+
+
+def test_keeps_the_most_recently_used():
+	cache = RenderCache(3)
+	built = []
+
+	def get(key):
+		"""Get key's surface (a stand-in string), noting when it has to be built."""
+		return cache.get(key, lambda: built.append(key) or f"surface {key}")
+
+	assert [get(key) for key in "abc"] == ["surface a", "surface b", "surface c"]
+	assert get("a") == "surface a"
+	assert built == ["a", "b", "c"]
+
+	# b is now the least recently used, so it makes room for d
+	get("d")
+	assert list(cache.surfaces) == ["c", "a", "d"]
+	get("b")
+	assert built == ["a", "b", "c", "d", "b"]
+	assert list(cache.surfaces) == ["a", "d", "b"]
+
+	cache.clear()
+	get("a")
+	assert built[-1] == "a" and len(cache.surfaces) == 1
@@ -0,0 +1,48 @@
+"""Tests for recording matches as replays and playing them back."""
+import pytest
+
+from replay import ReplayRecorder, play_replay, read_replay
+from simulation import GameState, load_bikes
+
+
+def record_match(play_ai, directory, seed, tick_rate, max_ticks=3000):
+	"""Play an AI-vs-AI match while recording it.
+
+	Returns:
+		(round number, tick, player 1 position, player 2 position, winner) after every tick
+	"""
+	player1, player2 = load_bikes("LEGACY")
+	state = GameState(player1, player2, "LEGACY", max_score=2, seed=seed, tick_rate=tick_rate)
+	recorder = ReplayRecorder(directory)
+
+	def record_tick(state):
+		"""Record the tick and note what it did."""
+		recorder.record_tick(state)
+		return state.round_number, state.ticks, tuple(player1.pos), tuple(player2.pos), state.winner
+
+	ticks = []
+	while not state.match_over:
+		state.reset_round()
+		recorder.start_round(state)
+		ticks += play_ai(state, max_ticks, record_tick)
+		if not state.game_over:
+			break
+	recorder.close()
+	return ticks
+
+
+@pytest.mark.parametrize("tick_rate", [60, 240])
+def test_playback_matches_recording(tmp_path, tick_rate, play_ai):
+	recorded = record_match(play_ai, tmp_path, 7, tick_rate)
+	paths = list(tmp_path.glob("*.trr"))
+	assert len(paths) == 1
+
+	replay = read_replay(paths[0])
+	assert (replay.seed, replay.theme, replay.tick_rate, replay.max_score) == (7, "LEGACY", tick_rate, 2)
+	player1, player2 = load_bikes(replay.theme)
+	played = [(state.round_number, state.ticks, tuple(state.player1.pos), tuple(state.player2.pos), state.winner)
+	          for state, _ in play_replay(replay, player1, player2)]
+	assert played == recorded
+	round_ends = [(tick, winner) for _, tick, _, _, winner in recorded if winner is not None]
+	assert [(replay_round.end_tick, replay_round.winner) for replay_round in replay.rounds] == round_ends
+	assert len(round_ends) >= 2
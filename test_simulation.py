@@ -0,0 +1,209 @@
+"""Tests for the headless game simulation."""
+import random
+import subprocess
+import sys
+
+import pygame
+import pytest
+
+from bike import Bike, get_trail_margin
+from constants import *
+from simulation import GameState, bikes_may_collide, check_mask_collision, load_bikes, time_of_impact
+
+
+def rects_overlap(rect1, offset1, rect2, offset2, touching=False):
+	"""Check if two rectangles moved by float offsets overlap (or touch)."""
+	for low1, high1, low2, high2 in [(rect1.left + offset1[0], rect1.right + offset1[0],
+	                                  rect2.left + offset2[0], rect2.right + offset2[0]),
+	                                 (rect1.top + offset1[1], rect1.bottom + offset1[1],
+	                                  rect2.top + offset2[1], rect2.bottom + offset2[1])]:
+		if touching:
+			if high1 < low2 - 1e-9 or high2 < low1 - 1e-9:
+				return False
+		elif high1 <= low2 or high2 <= low1:
+			return False
+	return True
+
+
+def test_time_of_impact_matches_stepping():
+	rng = random.Random(0)
+	found = 0
+	for _ in range(2000):
+		rect1 = pygame.Rect(rng.randint(0, 100), rng.randint(0, 100), rng.randint(1, 40), rng.randint(1, 40))
+		rect2 = pygame.Rect(rng.randint(0, 100), rng.randint(0, 100), rng.randint(1, 40), rng.randint(1, 40))
+		velocity1 = (rng.choice([0, rng.randint(-60, 60)]), rng.choice([0, rng.randint(-60, 60)]))
+		velocity2 = (rng.choice([0, rng.randint(-60, 60)]), rng.choice([0, rng.randint(-60, 60)]))
+		impact = time_of_impact(rect1, velocity1, rect2, velocity2)
+
+		def at(velocity, t):
+			"""Distance moved by time t."""
+			return velocity[0] * t, velocity[1] * t
+
+		# The rectangles touch at the time of impact
+		if impact is not None:
+			assert 0 <= impact <= 1
+			assert rects_overlap(rect1, at(velocity1, impact), rect2, at(velocity2, impact), touching=True)
+			found += 1
+		# Any overlap while stepping through the move is found, no later than it happens
+		for step in range(201):
+			t = step / 200
+			if rects_overlap(rect1, at(velocity1, t), rect2, at(velocity2, t)):
+				assert impact is not None and impact <= t + 1e-9
+				break
+	assert 0 < found < 2000
+
+
+def test_bikes_may_collide_whenever_masks_meet():
+	rng = random.Random(1)
+	player1, player2 = load_bikes("LEGACY")
+	directions = [dirs["UP"], dirs["DOWN"], dirs["LEFT"], dirs["RIGHT"]]
+	outcomes = set()
+	for _ in range(1000):
+		player1.dir, player2.dir = rng.choice(directions), rng.choice(directions)
+		player1.pos = [rng.uniform(200, 300), rng.uniform(200, 300)]
+		player2.pos = [rng.uniform(150, 350), rng.uniform(150, 350)]
+		speed1, speed2 = rng.uniform(0, 10), rng.uniform(0, 10)
+		may_collide = bikes_may_collide(player1, speed1, player2, speed2)
+		outcomes.add(may_collide)
+
+		for step in range(21):
+			t = step / 20
+			pos1 = (player1.pos[0] + player1.dir[0] * speed1 * t, player1.pos[1] + player1.dir[1] * speed1 * t)
+			pos2 = (player2.pos[0] + player2.dir[0] * speed2 * t, player2.pos[1] + player2.dir[1] * speed2 * t)
+			if check_mask_collision(player1, player2, pos1, pos2):
+				assert may_collide
+				break
+	assert outcomes == {True, False}
+
+
+HEADLESS_ROUND = """
+import sys
+import pygame
+from ai import ai_control
+from simulation import GameState, load_bikes
+
+state = GameState(*load_bikes("82"), "82", seed=4)
+state.reset_round()
+while not state.step() and state.ticks < 3000:
+	ai_control(state, state.player1, state.next_tick_time())
+	ai_control(state, state.player2, state.next_tick_time())
+assert state.game_over
+assert not pygame.display.get_init() and not pygame.font.get_init() and not pygame.mixer.get_init()
+assert "functions" not in sys.modules and "main" not in sys.modules
+"""
+
+
+def test_round_plays_without_a_display():
+	# A fresh interpreter, so nothing else in the test run has set pygame up
+	result = subprocess.run([sys.executable, "-c", HEADLESS_ROUND], capture_output=True, text=True)
+	assert result.returncode == 0, result.stderr
+
+
+def play_alone(theme, seed, ticks, play_ai):
+	"""Play a match's first round on its own.
+
+	Returns:
+		(tick, player 1 position, player 2 position, winner) after every tick
+	"""
+	state = GameState(*load_bikes(theme), theme, seed=seed)
+	state.reset_round()
+	return play_ai(state, ticks, tick_result)
+
+
+def tick_result(state):
+	"""What a tick did: (tick, player 1 position, player 2 position, winner)."""
+	return state.ticks, tuple(state.player1.pos), tuple(state.player2.pos), state.winner
+
+
+def test_matches_run_side_by_side(play_ai):
+	# Matches stepped in turn, one tick each, play as they do on their own
+	states = [GameState(*load_bikes(theme), theme, seed=seed) for theme, seed in [("82", 1), ("LEGACY", 2), ("82", 3)]]
+	played = [[] for _ in states]
+	for state in states:
+		state.reset_round()
+	for _ in range(3000):
+		for state, ticks in zip(states, played):
+			ticks += play_ai(state, 1, tick_result)
+
+	assert all(state.game_over for state in states)
+	assert played[0] == play_alone("82", 1, 3000, play_ai)
+	assert played[1] == play_alone("LEGACY", 2, 3000, play_ai)
+	assert played[2] == play_alone("82", 3, 3000, play_ai)
+
+
+def round_layout(state):
+	"""Start a new round and spawn a few power-ups.
+
+	Returns:
+		The bikes' starting directions and positions, the obstacles and the power-ups
+	"""
+	state.reset_round()
+	for _ in range(5):
+		state.spawn_powerup()
+	return ([(bike.dir, tuple(bike.pos)) for bike in (state.player1, state.player2)],
+	        [(obstacle.x, obstacle.y, obstacle.size) for obstacle in state.obstacles],
+	        [(pu.x, pu.y, pu.type) for pu in state.powerups])
+
+
+def test_seed_lays_out_the_same_rounds():
+	first = GameState(*load_bikes("82"), "82", seed=9)
+	second = GameState(*load_bikes("82"), "82", seed=9)
+	other = GameState(*load_bikes("82"), "82", seed=10)
+	for number in range(4):
+		# The global generator is left alone and makes no difference
+		random.seed(number)
+		layout = round_layout(first)
+		random.seed(number + 100)
+		assert round_layout(second) == layout
+		assert round_layout(other) != layout
+
+	# A new match with the same seed starts over
+	first.new_match(9)
+	again = GameState(*load_bikes("82"), "82", seed=9)
+	assert round_layout(first) == round_layout(again)
+
+
+def test_ticks_keep_the_clock_and_render_between_positions():
+	state = GameState(*load_bikes("82"), "82", seed=5, tick_rate=120)
+	state.reset_round()
+	bike = state.player1
+	for tick in range(1, 4):
+		assert state.next_tick_time() == pytest.approx(tick * 1000 / 120)
+		before = list(bike.pos)
+		state.step()
+		assert state.time == pytest.approx(tick * 1000 / 120)
+		assert bike.prev_pos == before
+
+		# Drawing eases from the last position to the new one
+		assert bike.get_render_pos(0) == pytest.approx(before)
+		assert bike.get_render_pos(1) == pytest.approx(bike.pos)
+		assert bike.get_render_pos(0.5) == pytest.approx([(before[0] + bike.pos[0]) / 2, (before[1] + bike.pos[1]) / 2])
+		assert bike.pos != before
+
+
+@pytest.mark.parametrize("speed", [SPEED, DIFFICULTY_SPEEDS["NORMAL"], DIFFICULTY_SPEEDS["CHALLENGE"]])
+def test_tick_rates_cover_the_same_ground(speed, monkeypatch):
+	laid = []
+	add_trail_point = Bike.add_trail_point
+	monkeypatch.setattr(Bike, "add_trail_point", lambda bike, pos: laid.append((bike, pos)) or add_trail_point(bike, pos))
+
+	for tick_rate in TICK_RATES:
+		state = GameState(*load_bikes("82"), "82", speed, seed=6, tick_rate=tick_rate)
+		state.reset_round()
+		state.obstacles = []
+		state.arena.clear_obstacles()
+		bike = state.player1
+		start = list(bike.pos)
+		laid.clear()
+		for _ in range(tick_rate):
+			state.step()
+		assert not state.game_over
+		assert abs(bike.pos[0] - start[0]) + abs(bike.pos[1] - start[1]) == pytest.approx(speed)
+
+		# The bike's own trail is safe for as long as its newest 50 blocks were at 60 Hz
+		assert bike.trail_safety_margin == get_trail_margin(Bike.TRAIL_SAFETY_BLOCKS, speed, BLOCK_SIZE)
+		assert bike.segments.length - bike.settled_length == pytest.approx(bike.trail_safety_margin)
+		if tick_rate == 60:
+			newest = [pos for laid_by, pos in laid if laid_by is bike][-Bike.TRAIL_SAFETY_BLOCKS - 1:]
+			assert sum(abs(x2 - x1) + abs(y2 - y1) for (x1, y1), (x2, y2) in zip(newest, newest[1:])) == \
+				pytest.approx(bike.trail_safety_margin)
@@ -0,0 +1,37 @@
+"""Tests for saving and loading game state snapshots."""
+import pytest
+
+from simulation import GameState, load_bikes
+from snapshot import get_snapshot_theme, load_state, save_state
+
+
+def tick_result(state):
+	"""What a tick did: (tick, player 1 position, player 2 position, winner)."""
+	return state.ticks, tuple(state.player1.pos), tuple(state.player2.pos), state.winner
+
+
+@pytest.mark.parametrize("theme", ["82", "LEGACY"])
+@pytest.mark.parametrize("tick_rate", [60, 240])
+def test_loaded_snapshot_plays_on_identically(theme, tick_rate, play_ai):
+	player1, player2 = load_bikes(theme)
+	state = GameState(player1, player2, theme, seed=3, tick_rate=tick_rate)
+	state.reset_round()
+	play_ai(state, 3 * tick_rate)
+	assert not state.game_over, "the round should still be going when the snapshot is taken"
+	blob = save_state(state)
+	assert get_snapshot_theme(blob) == theme
+
+	# A state built from scratch (other seed and tick rate) takes everything from the snapshot
+	loaded = GameState(*load_bikes(theme), theme, seed=99, tick_rate=120)
+	load_state(loaded, blob)
+	assert save_state(loaded) == blob
+	for bike, loaded_bike in [(state.player1, loaded.player1), (state.player2, loaded.player2)]:
+		assert loaded_bike.segments.get_rects() == bike.segments.get_rects()
+		assert loaded_bike.settled_length == bike.settled_length
+		for mask, loaded_mask in [(bike.trail_mask, loaded_bike.trail_mask),
+		                          (bike.settled_trail_mask, loaded_bike.settled_trail_mask)]:
+			assert loaded_mask.overlap_area(mask, (0, 0)) == mask.count() == loaded_mask.count()
+
+	expected = play_ai(state, 60 * tick_rate, tick_result)
+	assert play_ai(loaded, 60 * tick_rate, tick_result) == expected
+	assert save_state(loaded) == save_state(state)
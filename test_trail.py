@@ -0,0 +1,150 @@
+"""Tests for segment trails and their row/column index against brute-force scans."""
+import random
+
+import pygame
+import pytest
+
+from trail import SegmentTrail, TrailIndex
+
+BLOCK_SIZE = 5
+
+
+def random_points(rng, count=400):
+	"""Get block positions laid like a bike does: straight runs with a turn now and then."""
+	points = []
+	x, y = rng.randrange(100, 800), rng.randrange(100, 800)
+	dx, dy = 1, 0
+	for _ in range(count):
+		if rng.random() < 0.08:
+			dx, dy = rng.choice([(dy, dx), (-dy, -dx)])
+		step = rng.randint(1, BLOCK_SIZE)
+		x = min(max(x + dx * step, 0), 895)
+		y = min(max(y + dy * step, 0), 895)
+		points.append((x, y))
+	return points
+
+
+def random_trail(rng, points=400):
+	"""Lay a trail through random_points()."""
+	trail = SegmentTrail(BLOCK_SIZE)
+	for pos in random_points(rng, points):
+		trail.add_point(pos)
+	return trail
+
+
+def trail_pixels(points):
+	"""Get every position the blocks pass through on the way between points, with the trail length there.
+
+	Returns:
+		List of ((x, y), length) from the first point to the last
+	"""
+	pixels = [(points[0], 0)]
+	for x, y in points[1:]:
+		(last_x, last_y), length = pixels[-1]
+		dx, dy = (x > last_x) - (x < last_x), (y > last_y) - (y < last_y)
+		for step in range(1, abs(x - last_x) + abs(y - last_y) + 1):
+			pixels.append(((last_x + dx * step, last_y + dy * step), length + step))
+	return pixels
+
+
+def nearby_point(rng, trail):
+	"""Pick a point within a few blocks of a random segment end, where queries have something to find."""
+	x, y = rng.choice(list(trail)).end
+	return x + rng.randint(-40, 40), y + rng.randint(-40, 40)
+
+
+def rects_mask(rects):
+	"""Build an arena-sized mask with every rectangle filled."""
+	mask = pygame.mask.Mask((900, 900))
+	for rect in rects:
+		mask.draw(pygame.mask.Mask(rect.size, fill=True), rect.topleft)
+	return mask
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_query_rect_matches_linear_scan(seed):
+	rng = random.Random(seed)
+	trail = random_trail(rng)
+	for _ in range(500):
+		rect = pygame.Rect(nearby_point(rng, trail), (rng.randint(1, 40), rng.randint(1, 40)))
+		expected = [segment for segment in trail if segment.intersects_rect(rect)]
+		assert sorted(map(id, trail.query_rect(rect))) == sorted(map(id, expected))
+		assert trail.intersects_rect(rect) == bool(expected)
+
+
+def test_index_keeps_rows_and_columns_sorted():
+	rng = random.Random(0)
+	index = TrailIndex(BLOCK_SIZE)
+	for segment in random_trail(rng):
+		index.add(segment)
+	assert [run[:3] for run in index.rows] == sorted(run[:3] for run in index.rows)
+	assert [run[:3] for run in index.columns] == sorted(run[:3] for run in index.columns)
+	assert all(run[4].is_vertical() for run in index.columns)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_distance_matches_scan(seed):
+	rng = random.Random(seed)
+	points = random_points(rng)
+	trail = SegmentTrail(BLOCK_SIZE)
+	for pos in points:
+		trail.add_point(pos)
+	pixels = trail_pixels(points)
+
+	for _ in range(300):
+		x, y = nearby_point(rng, trail)
+		x, y = x + rng.random(), y + rng.random()
+		reach = rng.uniform(5, 30)
+		skip_length = rng.choice([0, rng.uniform(0, 100)])
+		rect = pygame.Rect(int(x - reach) - 1, int(y - reach) - 1, int(2 * reach) + 3, int(2 * reach) + 3)
+		expected = min(abs(x - pos[0]) + abs(y - pos[1]) for pos, length in pixels
+		               if length <= trail.length - skip_length)
+
+		# Anything closer than reach is found exactly, and nothing closer than the trail is made up
+		distance = trail.get_distance(x, y, rect, skip_length)
+		if expected < reach:
+			assert distance == pytest.approx(expected)
+		else:
+			assert distance is None or distance >= expected - 1e-9
+
+
+def test_segments_follow_turns_and_jumps():
+	trail = SegmentTrail(BLOCK_SIZE)
+	for pos in [(10, 10), (15, 10), (20, 10), (20, 10), (20, 30), (10, 30), (50, 60), (50, 70)]:
+		trail.add_point(pos)
+	# Turns start a run at the corner, a jump starts one at the new block
+	assert [(segment.start, segment.end, segment.start_length) for segment in trail] == [
+		((10, 10), (20, 10), 0), ((20, 10), (20, 30), 10), ((20, 30), (10, 30), 30), ((50, 60), (50, 70), 110)]
+	assert trail.length == 120
+
+	trail.clear()
+	assert len(trail) == 0 and trail.length == 0
+	assert trail.get_rects_between(-1, 100) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rects_between_cover_the_laid_blocks(seed):
+	rng = random.Random(seed)
+	points = random_points(rng)
+	trail = SegmentTrail(BLOCK_SIZE)
+	for pos in points:
+		trail.add_point(pos)
+	pixels = trail_pixels(points)
+	assert trail.length == pixels[-1][1]
+
+	# The runs cover exactly the blocks laid, which are never more than a block apart
+	laid = rects_mask(pygame.Rect(pos, (BLOCK_SIZE, BLOCK_SIZE)) for pos in points)
+	runs = rects_mask(trail.get_rects())
+	assert runs.count() == laid.count() == runs.overlap_area(laid, (0, 0))
+
+	for _ in range(50):
+		low = rng.randint(-1, trail.length)
+		high = rng.randint(low, trail.length)
+		covered = rects_mask(trail.get_rects_between(low, high))
+		# Everything after low up to high is covered, and at most the block at low besides
+		required = rects_mask(pygame.Rect(pos, (BLOCK_SIZE, BLOCK_SIZE)) for pos, length in pixels
+		                      if low < length <= high)
+		allowed = rects_mask(pygame.Rect(pos, (BLOCK_SIZE, BLOCK_SIZE)) for pos, length in pixels
+		                     if low <= length <= high)
+		assert covered.overlap_area(required, (0, 0)) == required.count()
+		assert allowed.overlap_area(covered, (0, 0)) == covered.count()
@@ -0,0 +1,49 @@
+"""Tests for drawing trails incrementally onto the persistent trail layer."""
+import pygame
+
+from constants import *
+from simulation import GameState, load_bikes
+from trail_layer import TrailLayer
+
+
+def draw_all(bikes, colors):
+	"""Draw every trail from scratch, the way the layer must look."""
+	surface = pygame.Surface((WIDTH, HEIGHT))
+	surface.fill(BLACK)
+	for bike, color in zip(bikes, colors):
+		for rect in bike.segments.get_rects():
+			pygame.draw.rect(surface, color, rect)
+	return surface
+
+
+def layer_image(layer):
+	"""Get what the layer puts on a black screen."""
+	screen = pygame.Surface((WIDTH, HEIGHT))
+	screen.fill(BLACK)
+	layer.draw(screen)
+	return pygame.image.tobytes(screen, "RGB")
+
+
+def test_layer_matches_full_redraw(play_ai):
+	state = GameState(*load_bikes("LEGACY"), "LEGACY", seed=1)
+	bikes = (state.player1, state.player2)
+	layer = TrailLayer((WIDTH, HEIGHT))
+	colors = (BLUE, ORANGE)
+	for _ in range(2):
+		state.reset_round()
+		drawn_lengths = [0, 0]
+		while not state.game_over:
+			drawn = layer.update(bikes, colors)
+			assert layer_image(layer) == pygame.image.tobytes(draw_all(bikes, colors), "RGB")
+
+			# Only the trail laid since the last update is drawn, plus the block it starts from
+			lengths = [bike.segments.length for bike in bikes]
+			new_length = sum(lengths) - sum(drawn_lengths)
+			assert sum(rect.width * rect.height for rect in drawn) <= (new_length + len(drawn) * BLOCK_SIZE) * BLOCK_SIZE
+			drawn_lengths = lengths
+			play_ai(state, 7)
+
+		# New colors draw everything again
+		colors = (GREEN, YELLOW)
+		layer.update(bikes, colors)
+		assert layer_image(layer) == pygame.image.tobytes(draw_all(bikes, colors), "RGB")
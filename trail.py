@@ -0,0 +1,224 @@
+"""Trail segment classes for TRON Lightcycles game."""
+import bisect
+import math
+import pygame
+
+
+class TrailSegment:
+	"""An axis-aligned run of trail blocks between two block positions (top-left corners)."""
+
+	def __init__(self, start, end, width, start_length=0):
+		self.start = start
+		self.end = end
+		self.width = width
+		self.start_length = start_length  # Length of the trail up to the start block, in pixels
+
+	def is_horizontal(self):
+		"""Check if the segment runs left/right (single blocks are neither horizontal nor vertical)."""
+		return self.start[1] == self.end[1] and self.start[0] != self.end[0]
+
+	def is_vertical(self):
+		"""Check if the segment runs up/down (single blocks are neither horizontal nor vertical)."""
+		return self.start[0] == self.end[0] and self.start[1] != self.end[1]
+
+	def can_extend(self, pos):
+		"""Check if a new block at pos continues this segment in the same direction."""
+		dx = pos[0] - self.end[0]
+		dy = pos[1] - self.end[1]
+		if dx != 0 and dy != 0:
+			return False
+		if self.start == self.end:
+			return True  # A single block can grow along either axis
+		if self.is_horizontal():
+			return dy == 0 and (dx > 0) == (self.end[0] > self.start[0])
+		return dx == 0 and (dy > 0) == (self.end[1] > self.start[1])
+
+	def get_rect(self):
+		"""Get the rectangle covered by every block in the segment."""
+		left = min(self.start[0], self.end[0])
+		top = min(self.start[1], self.end[1])
+		width = abs(self.end[0] - self.start[0]) + self.width
+		height = abs(self.end[1] - self.start[1]) + self.width
+		return pygame.Rect(left, top, width, height)
+
+	def get_length(self):
+		"""Get the distance from the start block to the end block."""
+		return abs(self.end[0] - self.start[0]) + abs(self.end[1] - self.start[1])
+
+	def point_at(self, length):
+		"""Get the block position length pixels along the segment from its start (clamped to the segment).
+
+		Blocks only sit whole pixels apart, so a fractional length is rounded down.
+		"""
+		length = max(0, min(math.floor(length), self.get_length()))
+		dx = (self.end[0] > self.start[0]) - (self.end[0] < self.start[0])
+		dy = (self.end[1] > self.start[1]) - (self.end[1] < self.start[1])
+		return (self.start[0] + dx * length, self.start[1] + dy * length)
+
+	def get_rect_between(self, low, high):
+		"""Get the rectangle covered by the blocks between trail lengths low and high (clamped to the segment)."""
+		return TrailSegment(self.point_at(low - self.start_length), self.point_at(high - self.start_length),
+		                    self.width).get_rect()
+
+	def get_distance(self, x, y, max_length=None):
+		"""Get the Manhattan distance from a point to the nearest block position (a whole pixel) of the segment.
+
+		Args:
+			max_length: Only the part of the segment up to this trail length counts (all of it if None)
+
+		Returns:
+			The distance, or None if no part of the segment counts
+		"""
+		end = self.end
+		if max_length is not None:
+			if max_length < self.start_length:
+				return None
+			end = self.point_at(max_length - self.start_length)
+		x0, x1 = sorted((self.start[0], end[0]))
+		y0, y1 = sorted((self.start[1], end[1]))
+		return abs(x - min(max(round(x), x0), x1)) + abs(y - min(max(round(y), y0), y1))
+
+	def intersects_rect(self, rect):
+		"""Check if this segment overlaps a rectangle."""
+		return self.get_rect().colliderect(rect)
+
+
+class TrailIndex:
+	"""Finished horizontal and vertical trail runs sorted by row and column.
+
+	Each run is stored as (coord, low, high, segment), where coord is the row (or column) of
+	its block corners and low..high the span of block corners along it. A lookup bisects to
+	the rows or columns a rectangle can reach and only tests the runs found there.
+	"""
+
+	def __init__(self, width):
+		self.width = width
+		self.rows = []     # Horizontal runs and single blocks, sorted by y
+		self.columns = []  # Vertical runs, sorted by x
+
+	def clear(self):
+		"""Remove all runs."""
+		self.rows = []
+		self.columns = []
+
+	def add(self, segment):
+		"""Index a segment that will no longer change."""
+		if segment.is_vertical():
+			low, high = sorted((segment.start[1], segment.end[1]))
+			bisect.insort(self.columns, (segment.start[0], low, high, id(segment), segment))
+		else:
+			low, high = sorted((segment.start[0], segment.end[0]))
+			bisect.insort(self.rows, (segment.start[1], low, high, id(segment), segment))
+
+	def _query(self, runs, coord_min, coord_max, span_min, span_max):
+		"""Get the segments of runs with coord and span both reaching the given corner ranges."""
+		start = bisect.bisect_left(runs, (coord_min,))
+		found = []
+		for index in range(start, len(runs)):
+			coord, low, high, _, segment = runs[index]
+			if coord > coord_max:
+				break
+			if low <= span_max and high >= span_min:
+				found.append(segment)
+		return found
+
+	def query_rect(self, rect):
+		"""Get the indexed segments whose blocks overlap rect."""
+		# A block with its corner at c covers c..c+width-1, so widen the corner ranges
+		x_min, x_max = rect.left - self.width + 1, rect.right - 1
+		y_min, y_max = rect.top - self.width + 1, rect.bottom - 1
+		return (self._query(self.rows, y_min, y_max, x_min, x_max) +
+		        self._query(self.columns, x_min, x_max, y_min, y_max))
+
+
+class SegmentTrail:
+	"""A bike trail stored as axis-aligned segments that only starts a new segment on a turn.
+
+	Every segment except the last (which is still growing) is kept in a TrailIndex.
+	"""
+
+	def __init__(self, width):
+		self.width = width
+		self.segments = []
+		self.index = TrailIndex(width)
+		self.length = 0  # Length of the whole trail in pixels, measured between block corners
+
+	def __iter__(self):
+		return iter(self.segments)
+
+	def __len__(self):
+		return len(self.segments)
+
+	def clear(self):
+		"""Remove all segments."""
+		self.segments = []
+		self.index.clear()
+		self.length = 0
+
+	def add_point(self, pos):
+		"""Add a trail block, extending the last segment unless the bike has turned."""
+		if not self.segments:
+			self.segments.append(TrailSegment(pos, pos, self.width))
+			return
+
+		last = self.segments[-1]
+		if pos == last.end:
+			return
+		start_length = self.length
+		self.length += abs(pos[0] - last.end[0]) + abs(pos[1] - last.end[1])
+		if last.can_extend(pos):
+			last.end = pos
+			return
+
+		self.index.add(last)
+		if pos[0] == last.end[0] or pos[1] == last.end[1]:
+			# Turned: the new segment starts at the corner block
+			self.segments.append(TrailSegment(last.end, pos, self.width, start_length))
+		else:
+			self.segments.append(TrailSegment(pos, pos, self.width, self.length))
+
+	def get_rects(self):
+		"""Get the rectangle covered by each segment, oldest first."""
+		return [segment.get_rect() for segment in self.segments]
+
+	def get_rects_between(self, low, high):
+		"""Get rectangles covering the trail blocks from just after trail length low up to high.
+
+		The block at low itself may be covered again, which never matters when filling.
+		"""
+		rects = []
+		for segment in reversed(self.segments):
+			if segment.start_length + segment.get_length() <= low:
+				break
+			if segment.start_length <= high:
+				rects.append(segment.get_rect_between(low, high))
+		rects.reverse()
+		return rects
+
+	def query_rect(self, rect):
+		"""Get the segments whose blocks overlap rect."""
+		if not self.segments:
+			return []
+		found = self.index.query_rect(rect)
+		if self.segments[-1].intersects_rect(rect):
+			found.append(self.segments[-1])
+		return found
+
+	def intersects_rect(self, rect):
+		"""Check if any segment of the trail overlaps a rectangle."""
+		return len(self.query_rect(rect)) > 0
+
+	def get_distance(self, x, y, rect, skip_length=0):
+		"""Get the Manhattan distance from a point to the nearest trail block position in reach of rect.
+
+		Args:
+			rect: Area to look in; only segments whose blocks overlap it are measured
+			skip_length: Leave out the newest skip_length pixels of the trail
+
+		Returns:
+			The distance, or None if no segment in reach counts
+		"""
+		max_length = self.length - skip_length if skip_length > 0 else None
+		distances = [distance for distance in (segment.get_distance(x, y, max_length)
+		                                       for segment in self.query_rect(rect)) if distance is not None]
+		return min(distances, default=None)
@@ -0,0 +1,59 @@
+"""Persistent trail surface for TRON Lightcycles game."""
+import pygame
+
+from constants import BLACK
+
+
+class TrailLayer:
+	"""A screen-sized surface that keeps every trail drawn so far.
+
+	Each bike has a cursor into its trail; updating draws only the trail laid since the
+	last update, so a frame costs the new blocks plus one blit however long the trails are.
+	A bike whose trail has been reset (a new round, a loaded snapshot) or a change of
+	colors clears the layer and draws the trails again from the start.
+	"""
+
+	def __init__(self, size):
+		self.surface = pygame.Surface(size)
+		self.surface.set_colorkey(BLACK)  # Trail colors are never black
+		self.surface.fill(BLACK)
+		self.trails = []  # Segment list each cursor points into
+		self.cursors = []  # Length of each trail already drawn (-1 before the first block)
+		self.colors = ()
+
+	def clear(self):
+		"""Erase every trail and forget the cursors."""
+		self.surface.fill(BLACK)
+		self.trails = []
+		self.cursors = []
+		self.colors = ()
+
+	def update(self, bikes, colors):
+		"""Draw the trail the bikes have laid since the last update.
+
+		Args:
+			bikes: Bikes whose trails are drawn, in drawing order
+			colors: Trail color of each bike
+
+		Returns:
+			List of the rectangles drawn
+		"""
+		# SegmentTrail.clear() starts a new list, so a different list means the trail was reset
+		if tuple(colors) != self.colors or len(bikes) != len(self.trails) or any(
+				bike.segments.segments is not trail for bike, trail in zip(bikes, self.trails)):
+			self.clear()
+			self.trails = [bike.segments.segments for bike in bikes]
+			self.cursors = [-1] * len(bikes)
+			self.colors = tuple(colors)
+
+		drawn = []
+		for index, (bike, color) in enumerate(zip(bikes, self.colors)):
+			length = bike.segments.length if bike.segments else -1
+			for rect in bike.segments.get_rects_between(self.cursors[index], length):
+				drawn.append(pygame.draw.rect(self.surface, color, rect))
+			self.cursors[index] = length
+		return drawn
+
+	def draw(self, screen):
+		"""Blit the layer onto the screen."""
+		screen.blit(self.surface, (0, 0))